@@ -0,0 +1,18 @@
+-- Migration: Notify listeners when a company's financial statements change
+-- Purpose: market-api-service LISTENs on this channel and purges the cached
+-- financials:{company}:* keys, so its long cache TTL never serves stale data.
+
+CREATE OR REPLACE FUNCTION financial_oltp.notify_financials_changed()
+RETURNS trigger AS $$
+BEGIN
+    -- Payload is the company_id; identical notifications within one
+    -- transaction are collapsed by Postgres, so bulk loads send one per company.
+    PERFORM pg_notify('financials_changed', COALESCE(NEW.company_id, OLD.company_id));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_financial_statement_notify ON financial_oltp.financial_statement;
+CREATE TRIGGER trg_financial_statement_notify
+AFTER INSERT OR UPDATE OR DELETE ON financial_oltp.financial_statement
+FOR EACH ROW EXECUTE FUNCTION financial_oltp.notify_financials_changed();
@@ -0,0 +1,21 @@
+-- Migration: Covering index for the *_recent statement views
+-- Purpose: The views join each selected statement to its line items and
+-- read item_name/item_value in display_order; including those columns lets
+-- the join run as an Index Only Scan. Statement selection by company and
+-- period is already served by idx_statement_lookup, and stock_ticker is
+-- already UNIQUE on market_data_oltp.stocks.
+-- CONCURRENTLY keeps the table writable while the index builds; run outside
+-- a transaction block.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_lineitem_statement_covering
+ON financial_oltp.financial_line_item (statement_id, display_order)
+INCLUDE (item_name, item_value);
+
+-- The covering index supersedes the plain one.
+DROP INDEX CONCURRENTLY IF EXISTS financial_oltp.idx_lineitem_statement_order;
+
+-- Verify (expect "Index Only Scan using idx_lineitem_statement_covering"):
+-- EXPLAIN (ANALYZE, BUFFERS)
+-- SELECT item_name, item_value, fiscal_year, fiscal_quarter
+-- FROM financial_oltp.vw_income_statement_recent
+-- WHERE company_id = 'IBM';
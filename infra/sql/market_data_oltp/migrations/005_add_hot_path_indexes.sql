@@ -0,0 +1,28 @@
+-- Migration: Covering indexes for the market-api hot-path lookups
+-- Purpose: Serve "latest row per stock" reads (quotes, previous closes,
+-- heatmap volumes) from the index alone instead of visiting the heap.
+-- CONCURRENTLY keeps the tables writable for the ETL while indexes build;
+-- run outside a transaction block.
+
+-- Previous-close / latest-EOD batch lookups: LATERAL ... ORDER BY trading_date DESC LIMIT 1
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_eod_stock_date_covering
+ON market_data_oltp.stock_eod_prices (stock_id, trading_date DESC)
+INCLUDE (close_price, pct_change, volume);
+
+-- Accumulated volumes: LATERAL ... ORDER BY ts DESC, trade_id DESC LIMIT 1
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_trade_stock_ts_id
+ON market_data_oltp.stock_trades_realtime (stock_id, ts DESC, trade_id DESC)
+INCLUDE (size);
+
+-- The covering index supersedes the plain one.
+DROP INDEX CONCURRENTLY IF EXISTS market_data_oltp.idx_eod_stock_date;
+
+-- Verify (expect "Index Only Scan using idx_eod_stock_date_covering"):
+-- EXPLAIN (ANALYZE, BUFFERS)
+-- SELECT s.stock_ticker, eod.close_price
+-- FROM market_data_oltp.stocks s
+-- LEFT JOIN LATERAL (
+--     SELECT close_price FROM market_data_oltp.stock_eod_prices
+--     WHERE stock_id = s.stock_id ORDER BY trading_date DESC LIMIT 1
+-- ) eod ON true
+-- WHERE s.stock_ticker = ANY(ARRAY['AAPL', 'MSFT']);
@@ -62,7 +62,7 @@ async def register(user: UserRegister, background_tasks: BackgroundTasks):
     return await auth_service.register_user(user.email, user.password, user.full_name, background_tasks)
 
 @router.post("/api/auth/login", response_model=Token, tags=["Authentication"])
-async def login(form_data: OAuth2PasswordRequestForm = Depends()):
+def login(form_data: OAuth2PasswordRequestForm = Depends()):
     """Login with email and password (multipart/form-data)."""
     return auth_service.login_user(form_data.username, form_data.password)
 
@@ -84,12 +84,12 @@ async def resend_otp(data: ResendOTPRequest, background_tasks: BackgroundTasks):
     return await auth_service.resend_verification_otp(data.email, background_tasks)
 
 @router.post("/api/auth/verify-otp", response_model=Token, tags=["Authentication"])
-async def verify_otp(data: VerifyOTPRequest):
+def verify_otp(data: VerifyOTPRequest):
     """Verify OTP and return Access Token (Auto Login)."""
     return auth_service.verify_user_otp(data.email, data.otp)
 
 @router.put("/api/auth/profile", tags=["Authentication"])
-async def update_profile(
+def update_profile(
     updates: UserUpdate,
     current_user_id: str = Depends(get_current_user)
 ):
@@ -127,6 +127,6 @@ async def forgot_password(data: PasswordResetRequest, background_tasks: Backgrou
     return await auth_service.request_password_reset(data.email, background_tasks)
 
 @router.post("/api/auth/reset-password", response_model=Token, tags=["Authentication"])
-async def reset_password(data: PasswordResetConfirm):
+def reset_password(data: PasswordResetConfirm):
     """Reset password with OTP and auto-login."""
     return auth_service.reset_password(data.email, data.otp, data.new_password)
@@ -7,7 +7,7 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 
 @router.get("/api/candles", tags=["Candlestick Charts"])
-async def get_candles(
+def get_candles(
     symbol: str = Query(..., description="Stock ticker symbol", example="IBM"),
     tf: str = Query("5m", description="Timeframe: 1m, 5m, 15m, 1h, 1d", example="5m"),
     limit: int = Query(300, description="Maximum number of candles to return", ge=1, le=1000, example=300),
@@ -39,17 +39,8 @@ async def get_candles(
         )
     
     service = CandlesService()
-    try:
-        logger.info(f"[CandlesRouter] GET /api/candles - symbol={resolved}, tf={tf}, limit={limit}")
-        data = service.get_candles(resolved, tf, limit)
-        logger.info(f"[CandlesRouter] Returning {len(data)} candles for {resolved}")
-        return {"success": True, "data": data}
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(
-            f"[CandlesRouter] Error fetching candles for {resolved}, tf={tf}: {e}",
-            exc_info=True
-        )
-        raise HTTPException(status_code=500, detail=str(e))
+    logger.info(f"[CandlesRouter] GET /api/candles - symbol={resolved}, tf={tf}, limit={limit}")
+    data = service.get_candles(resolved, tf, limit)
+    logger.info(f"[CandlesRouter] Returning {len(data)} candles for {resolved}")
+    return {"success": True, "data": data}
 
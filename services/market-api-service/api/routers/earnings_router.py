@@ -1,14 +1,11 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter
 from services.earnings_service import EarningsService
 
 router = APIRouter()
 
 @router.get("/earnings", tags=["Company Info"])
-async def get_earnings():
+def get_earnings():
     """Get earnings data"""
     service = EarningsService()
-    try:
-        data = service.get_earnings()
-        return {"success": True, "data": data}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    data = service.get_earnings()
+    return {"success": True, "data": data}
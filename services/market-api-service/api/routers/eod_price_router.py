@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Query, HTTPException
+from fastapi.responses import ORJSONResponse
 from services.eod_price_service import EODPriceService
 import logging
 
@@ -6,7 +7,7 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 
 @router.get("/api/price-history/eod", tags=["Price Charts"])
-async def get_eod_price_history(
+def get_eod_price_history(
     symbol: str = Query(..., description="Stock ticker symbol", example="IBM"),
     period: str = Query("3mo", description="Time period: 1d, 5d, 1mo, 3mo, 6mo, 1y, ytd, max", example="3mo"),
 ):
@@ -42,17 +43,10 @@ async def get_eod_price_history(
         )
     
     service = EODPriceService()
-    try:
-        logger.info(f"[EODPriceRouter] GET /api/price-history/eod - symbol={resolved}, period={period}")
-        data = service.get_price_history(resolved, period)
-        logger.info(f"[EODPriceRouter] Returning {len(data)} records for {resolved}")
-        return {"success": True, "data": data}
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(
-            f"[EODPriceRouter] Error fetching EOD price history for {resolved}, period={period}: {e}",
-            exc_info=True
-        )
-        raise HTTPException(status_code=500, detail=str(e))
+    logger.info(f"[EODPriceRouter] GET /api/price-history/eod - symbol={resolved}, period={period}")
+    data = service.get_price_history(resolved, period)
+    logger.info(f"[EODPriceRouter] Returning {len(data)} records for {resolved}")
+    # Rows are plain str/float/int: hand them straight to orjson instead of
+    # walking every record through jsonable_encoder first.
+    return ORJSONResponse({"success": True, "data": data})
 
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from services.financial_service import FinancialService
 from enum import Enum
 from pydantic import BaseModel, Field
@@ -25,13 +25,18 @@ class FinancialDataResponse(BaseModel):
     periods: List[str]
     data: Dict[str, Dict[str, float]]
 
-@router.get("/api/financials", response_model=FinancialDataResponse, tags=["Financial Data"])
-async def get_financials(
+@router.get(
+    "/api/financials",
+    response_model=None,
+    responses={200: {"model": FinancialDataResponse}},
+    tags=["Financial Data"],
+)
+def get_financials(
     symbol: str = Query(None, description="Stock ticker symbol (alias for company)", example="IBM"),
     company: str = Query(None, description="Company ticker symbol", example="IBM"),
     type: StatementType = Query(...),
     period: PeriodType = Query(...)
-):
+) -> Response:
     """
     Get financial statements (IS, BS, CF) for a company.
     
@@ -44,6 +49,9 @@ async def get_financials(
         company: Company ticker symbol (alias, for backward compatibility)
         type: Statement type (IS, BS, CF)
         period: Period type (annual, quarterly)
+
+    The body is pre-serialized JSON (straight from Redis on a cache hit), so
+    it bypasses response_model validation; the schema is still documented.
     """
     # Resolve symbol or company parameter
     resolved = (symbol or company or "").upper()
@@ -54,23 +62,43 @@ async def get_financials(
     service = FinancialService()
     try:
         # Use resolved symbol as company_id (ticker = company_id for US stocks)
-        result = service.get_financials(resolved, type.value, period.value)
-        # Return result even if empty (empty periods/data arrays)
-        # This allows frontend to handle "no data" gracefully instead of 404
-        if result is None:
-            logger.warning(f"[FinancialRouter] Service returned None for {resolved}")
-            result = {
-                "company": resolved,
-                "type": type.value,
-                "period": period.value,
-                "periods": [],
-                "data": {}
-            }
-        logger.info(f"[FinancialRouter] Returning result with {len(result.get('periods', []))} periods")
-        return result
+        payload = service.get_financials_json(resolved, type.value, period.value)
+        # Empty periods/data are returned as-is instead of a 404 so the
+        # frontend can handle "no data" gracefully.
+        return Response(content=payload, media_type="application/json")
     except ValueError as e:
         logger.error(f"[FinancialRouter] ValueError: {e}")
         raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        logger.error(f"[FinancialRouter] Unexpected error: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
+
+
+class FinancialBundleResponse(BaseModel):
+    company: str
+    period: str
+    IS: FinancialDataResponse
+    BS: FinancialDataResponse
+    CF: FinancialDataResponse
+
+@router.get(
+    "/api/financials/bundle",
+    response_model=None,
+    responses={200: {"model": FinancialBundleResponse}},
+    tags=["Financial Data"],
+)
+def get_financials_bundle(
+    symbol: str = Query(None, description="Stock ticker symbol (alias for company)", example="IBM"),
+    company: str = Query(None, description="Company ticker symbol", example="IBM"),
+    period: PeriodType = Query(...)
+) -> Response:
+    """
+    Get all three financial statements (IS, BS, CF) for a company at once.
+
+    Cache reads and writes for the three statements are batched into one
+    Redis round-trip each.
+    """
+    resolved = (symbol or company or "").upper()
+    if not resolved:
+        raise HTTPException(status_code=400, detail="symbol or company is required")
+
+    logger.info(f"[FinancialRouter] GET /api/financials/bundle - symbol={resolved}, period={period.value}")
+    payload = FinancialService().get_financials_bundle_json(resolved, period.value)
+    return Response(content=payload, media_type="application/json")
@@ -8,7 +8,7 @@ logger = logging.getLogger(__name__)
 
 
 @router.get("/api/market/stocks", tags=["Market"])
-async def get_market_stocks():
+def get_market_stocks():
     """
     📊 Get market metadata for all active stocks.
 
@@ -28,15 +28,12 @@ async def get_market_stocks():
     }
     """
     service = MarketMetadataService()
-    try:
-        result = service.get_stocks_for_heatmap()
-        return {"success": True, **result}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    result = service.get_stocks_for_heatmap()
+    return {"success": True, **result}
 
 
 @router.get("/api/market/volumes", tags=["Market"])
-async def get_accumulated_volumes(
+def get_accumulated_volumes(
     symbols: str = Query(..., description="Comma-separated list of ticker symbols", example="AAPL,MSFT,GOOGL")
 ):
     """
@@ -67,28 +64,19 @@ async def get_accumulated_volumes(
         return {"success": True, "volumes": volumes}
     except ValidationError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"[MarketRouter] Error fetching volumes: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/api/market/stocks/check", tags=["Market"])
-async def check_stock(
+def check_stock(
     ticker: str = Query(..., description="Ticker symbol to check", example="AAPL")
 ):
     """
     🔍 Check if a stock ticker exists in the database.
     Used for frontend validation in forms.
     """
-    try:
-        service = MarketMetadataService()
-        exists = service.check_stock_exists(ticker)
-        return {"success": True, "data": {"exists": exists, "symbol": ticker.upper()}}
-    except Exception as e:
-        logger.error(f"[MarketRouter] Error checking stock: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    service = MarketMetadataService()
+    exists = service.check_stock_exists(ticker)
+    return {"success": True, "data": {"exists": exists, "symbol": ticker.upper()}}
 
 
 
@@ -5,7 +5,7 @@ from shared.python.utils.validation import normalize_symbol, ValidationError
 router = APIRouter()
 
 @router.get("/news", tags=["Company Info"])
-async def get_news(
+def get_news(
     ticker: str = Query("IBM", description="Stock ticker symbol", example="IBM"),
     limit: int = Query(16, description="Number of news articles to return")
 ):
@@ -15,8 +15,5 @@ async def get_news(
     except ValidationError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
     service = NewsService()
-    try:
-        data = service.get_news(normalized, limit)
-        return {"success": True, "data": data}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    data = service.get_news(normalized, limit)
+    return {"success": True, "data": data}
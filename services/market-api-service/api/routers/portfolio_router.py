@@ -28,20 +28,16 @@ class PortfolioCreate(BaseModel):
 # --- Endpoints ---
 
 @router.get("/api/portfolio/holdings", tags=["Portfolio"])
-async def get_holdings(
+def get_holdings(
     portfolio_id: str = Query(..., description="Portfolio ID"),
     include_sold: bool = Query(False, description="Include sold out positions")
 ):
-    try:
-        service = PortfolioService()
-        holdings = service.get_holdings_with_market_data(portfolio_id, include_sold=include_sold)
-        return {"success": True, "data": holdings}
-    except Exception as e:
-        logger.error(f"Error fetching holdings: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    service = PortfolioService()
+    holdings = service.get_holdings_with_market_data(portfolio_id, include_sold=include_sold)
+    return {"success": True, "data": holdings}
 
 @router.post("/api/portfolio/transactions", tags=["Portfolio"])
-async def add_transaction(
+def add_transaction(
     transaction: TransactionCreate = Body(...)
 ):
     try:
@@ -58,37 +54,26 @@ async def add_transaction(
         return {"success": True, "data": {"transaction_id": tx_id}}
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
-    except Exception as e:
-        logger.error(f"Error adding transaction: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/api/portfolio/transactions", tags=["Portfolio"])
-async def get_transactions(
+def get_transactions(
     portfolio_id: str = Query(..., description="Portfolio ID"),
     ticker: Optional[str] = Query(None, description="Filter by ticker")
 ):
-    try:
-        service = PortfolioService()
-        transactions = service.get_transactions(portfolio_id, ticker)
-        return {"success": True, "data": transactions}
-    except Exception as e:
-        logger.error(f"Error fetching transactions: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    service = PortfolioService()
+    transactions = service.get_transactions(portfolio_id, ticker)
+    return {"success": True, "data": transactions}
 
 @router.get("/api/portfolio/portfolios", tags=["Portfolio"])
-async def get_user_portfolios(
+def get_user_portfolios(
     user_id: str = Query(..., description="User ID")
 ):
-    try:
-        service = PortfolioService()
-        result = service.get_portfolio_summary(user_id)
-        return {"success": True, "data": result}
-    except Exception as e:
-        logger.error(f"Error fetching portfolios: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    service = PortfolioService()
+    result = service.get_portfolio_summary(user_id)
+    return {"success": True, "data": result}
 
 @router.post("/api/portfolio/create", tags=["Portfolio"])
-async def create_portfolio(
+def create_portfolio(
     portfolio: PortfolioCreate = Body(...)
 ):
     try:
@@ -104,26 +89,17 @@ async def create_portfolio(
         return {"success": True, "data": {"portfolio_id": p_id}}
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
-    except Exception as e:
-        logger.error(f"Error creating portfolio: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/api/portfolio/{portfolio_id}/transactions/{transaction_id}", tags=["Portfolio"])
-async def delete_transaction(
+def delete_transaction(
     portfolio_id: str,
     transaction_id: str
 ):
-    try:
-        service = PortfolioService()
-        success = service.delete_transaction(transaction_id, portfolio_id)
-        if not success:
-             raise HTTPException(status_code=404, detail="Transaction not found")
-        return {"success": True, "message": "Transaction deleted"}
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error deleting transaction: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    service = PortfolioService()
+    success = service.delete_transaction(transaction_id, portfolio_id)
+    if not success:
+         raise HTTPException(status_code=404, detail="Transaction not found")
+    return {"success": True, "message": "Transaction deleted"}
 
 class TransactionUpdate(BaseModel):
     ticker: str
@@ -135,7 +111,7 @@ class TransactionUpdate(BaseModel):
     note: Optional[str] = None
 
 @router.put("/api/portfolio/{portfolio_id}/transactions/{transaction_id}", tags=["Portfolio"])
-async def update_transaction(
+def update_transaction(
     portfolio_id: str,
     transaction_id: str,
     transaction: TransactionUpdate = Body(...)
@@ -158,52 +134,35 @@ async def update_transaction(
         return {"success": True, "message": "Transaction updated"}
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error updating transaction: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/api/portfolio/{portfolio_id}/holdings/{ticker}", tags=["Portfolio"])
-async def delete_holding(
+def delete_holding(
     portfolio_id: str,
     ticker: str
 ):
-    try:
-        service = PortfolioService()
-        success = service.delete_holding(portfolio_id, ticker.upper())
-        if not success:
-             raise HTTPException(status_code=404, detail="Holding not found")
-        return {"success": True, "message": "Holding deleted"}
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error deleting holding: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    service = PortfolioService()
+    success = service.delete_holding(portfolio_id, ticker.upper())
+    if not success:
+         raise HTTPException(status_code=404, detail="Holding not found")
+    return {"success": True, "message": "Holding deleted"}
 
 @router.delete("/api/portfolio/{portfolio_id}", tags=["Portfolio"])
-async def delete_portfolio(
+def delete_portfolio(
     portfolio_id: str,
     user_id: str = Query(..., description="User ID") 
 ):
-    try:
-        service = PortfolioService()
-        success = service.delete_portfolio(portfolio_id, user_id)
-        if not success:
-             raise HTTPException(status_code=404, detail="Portfolio not found or access denied")
-        return {"success": True, "message": "Portfolio deleted"}
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error deleting portfolio: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    service = PortfolioService()
+    success = service.delete_portfolio(portfolio_id, user_id)
+    if not success:
+         raise HTTPException(status_code=404, detail="Portfolio not found or access denied")
+    return {"success": True, "message": "Portfolio deleted"}
 
 class HoldingAdjustment(BaseModel):
     target_shares: float
     target_avg_price: float
 
 @router.post("/api/portfolio/{portfolio_id}/holdings/{ticker}/adjust", tags=["Portfolio"])
-async def adjust_holding(
+def adjust_holding(
     portfolio_id: str,
     ticker: str,
     adjustment: HoldingAdjustment = Body(...)
@@ -219,6 +178,3 @@ async def adjust_holding(
         return {"success": True, "data": {"transaction_id": tx_id}}
     except ValueError as ve:
          raise HTTPException(status_code=400, detail=str(ve))
-    except Exception as e:
-        logger.error(f"Error adjusting holding: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Query, HTTPException
+from fastapi.responses import ORJSONResponse
 from services.price_history_service import PriceHistoryService
 import logging
 from shared.python.utils.validation import normalize_symbol, ValidationError
@@ -8,7 +9,7 @@ logger = logging.getLogger(__name__)
 
 @router.get("/price-history", tags=["Real-Time Data"])
 @router.get("/api/price-history", tags=["Real-Time Data"])
-async def get_price_history(
+def get_price_history(
     ticker: str | None = Query(None, description="Stock ticker symbol", example="IBM"),
     symbol: str | None = Query(None, description="Alias for ticker", example="IBM"),
     period: str = Query("3m", description="Time period: 1d, 5d, 1m, 3m, 6m, 1y, 5y, max", example="3m"),
@@ -47,18 +48,20 @@ async def get_price_history(
         # Always return success with data (even if empty)
         # Only return 404 if ticker is invalid (handled by service returning empty array)
         logger.info(f"[PriceHistoryRouter] Returning {len(data)} records for {resolved}")
-        return {
+        # Rows are plain str/float/int: hand them straight to orjson instead
+        # of walking every record through jsonable_encoder first.
+        return ORJSONResponse({
             "success": True,
             "symbol": resolved,
             "period": period,
             "data": data
-        }
+        })
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(
+        logger.warning(
             f"[PriceHistoryRouter] Unexpected error fetching price history for {resolved}, period={period}: {e}",
-            exc_info=True
+            exc_info=logger.isEnabledFor(logging.DEBUG)
         )
         # Return empty data instead of 500 error
         return {
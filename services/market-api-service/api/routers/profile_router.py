@@ -7,7 +7,7 @@ logger = logging.getLogger(__name__)
 
 @router.get("/profile", tags=["Company Info"])
 @router.get("/api/profile", tags=["Company Info"])
-async def get_profile(
+def get_profile(
     ticker: str | None = Query(None, example="IBM"),
     symbol: str | None = Query(None, example="IBM"),
 ):
@@ -17,10 +17,6 @@ async def get_profile(
         raise HTTPException(status_code=400, detail="ticker or symbol is required")
 
     service = ProfileService()
-    try:
-        logger.info(f"[profile_router] Fetching profile for {resolved}")
-        data = service.get_profile(resolved)
-        return {"success": True, "data": data}
-    except Exception as e:
-        logger.error(f"[profile_router] Error fetching profile for {resolved}: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    logger.info(f"[profile_router] Fetching profile for {resolved}")
+    data = service.get_profile(resolved)
+    return {"success": True, "data": data}
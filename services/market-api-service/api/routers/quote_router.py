@@ -12,7 +12,7 @@ logger = logging.getLogger(__name__)
 
 @router.get("/quote", tags=["Real-Time Data"])
 @router.get("/api/quote", tags=["Real-Time Data"])
-async def get_quote(
+def get_quote(
     ticker: str | None = Query(None, description="Stock ticker symbol", example="IBM"),
     symbol: str | None = Query(None, description="Alias for ticker", example="IBM"),
 ):
@@ -22,17 +22,13 @@ async def get_quote(
         raise HTTPException(status_code=400, detail=str(exc))
 
     service = QuoteService()
-    try:
-        logger.info(f"[quote_router] Fetching quote for {resolved}")
-        data = service.get_quote(resolved)
-        return {"success": True, "data": data}
-    except Exception as e:
-        logger.error(f"[quote_router] Error fetching quote for {resolved}: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    logger.info(f"[quote_router] Fetching quote for {resolved}")
+    data = service.get_quote(resolved)
+    return {"success": True, "data": data}
 
 
 @router.get("/api/quote/previous-closes", tags=["Real-Time Data"])
-async def get_previous_closes_batch(
+def get_previous_closes_batch(
     symbols: str = Query(..., description="Comma-separated list of ticker symbols", example="AAPL,MSFT,GOOGL")
 ):
     """
@@ -62,15 +58,10 @@ async def get_previous_closes_batch(
         return {"success": True, "previousCloses": previous_closes}
     except ValidationError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"[quote_router] Error fetching previousCloses: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/api/quote/latest-eod", tags=["Real-Time Data"])
-async def get_latest_eod_batch(
+def get_latest_eod_batch(
     symbols: str = Query(..., description="Comma-separated list of ticker symbols", example="AAPL,MSFT,GOOGL"),
     auto_fetch: bool = Query(True, description="Automatically fetch and insert EOD if missing")
 ):
@@ -106,8 +97,3 @@ async def get_latest_eod_batch(
         return {"success": True, "data": eod_data}
     except ValidationError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"[quote_router] Error fetching latest EOD data: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
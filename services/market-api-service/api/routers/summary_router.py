@@ -1,14 +1,11 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter
 from services.summary_service import SummaryService
 
 router = APIRouter()
 
 @router.get("/summary", tags=["System"])
-async def get_summary():
+def get_summary():
     """Get data summary and status"""
     service = SummaryService()
-    try:
-        data = service.get_summary()
-        return {"success": True, "data": data}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    data = service.get_summary()
+    return {"success": True, "data": data}
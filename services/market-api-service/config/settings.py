@@ -1,3 +1,4 @@
+import os
 import sys
 from pathlib import Path
 from pydantic_settings import BaseSettings
@@ -9,6 +10,13 @@ if str(ROOT_PATH) not in sys.path:
 from shared.python.utils.env import load_env
 
 
+def _default_pool_max() -> int:
+    """Per-worker share of DB_MAX_CONNECTIONS, less the worker's LISTEN connection."""
+    budget = int(load_env("DB_MAX_CONNECTIONS", "80"))
+    workers = int(load_env("WEB_CONCURRENCY", str(2 * (os.cpu_count() or 1) + 1)))
+    return max(1, budget // max(1, workers) - 1)
+
+
 class Settings(BaseSettings):
     # Database
     DB_HOST: str = load_env("DB_HOST", "postgres")
@@ -18,6 +26,10 @@ class Settings(BaseSettings):
     DB_PASSWORD: str
     DB_SSL_MODE: str = load_env("DB_SSL_MODE", "require")
     DB_SSL_MODE: str = load_env("DB_SSL_MODE", "disable")
+    # Per-process pool bounds; by default DB_MAX_CONNECTIONS is split across
+    # the gunicorn workers so the whole deployment stays under max_connections
+    DB_POOL_MAX: int = int(load_env("DB_POOL_MAX", str(_default_pool_max())))
+    DB_POOL_MIN: int = int(load_env("DB_POOL_MIN", str(min(4, DB_POOL_MAX))))
 
     # Redis
     REDIS_HOST: str = load_env("REDIS_HOST", "redis")
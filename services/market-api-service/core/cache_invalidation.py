@@ -0,0 +1,68 @@
+"""
+Purge cached financials when statements change in Postgres.
+
+A trigger on financial_oltp.financial_statement sends pg_notify on the
+financials_changed channel with the company_id (see
+infra/sql/financial_oltp/migrations/). Each API process keeps one dedicated
+LISTEN connection in a daemon thread and drops that company's cached
+financials as soon as the ingesting transaction commits.
+"""
+
+import logging
+import select
+import threading
+import time
+
+import psycopg2
+
+from db.base_repo import DB_CONFIG
+from services.financial_service import invalidate_financials
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "financials_changed"
+POLL_SECONDS = 5
+RECONNECT_SECONDS = 10
+
+_stop = threading.Event()
+_thread = None
+
+
+def _listen_forever():
+    while not _stop.is_set():
+        conn = None
+        try:
+            # LISTEN needs a long-lived session, so this stays outside the pool.
+            conn = psycopg2.connect(**DB_CONFIG)
+            conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {CHANNEL}")
+            logger.info(f"[CacheInvalidation] Listening on {CHANNEL}")
+
+            while not _stop.is_set():
+                if select.select([conn], [], [], POLL_SECONDS) == ([], [], []):
+                    continue
+                conn.poll()
+                companies = {n.payload for n in conn.notifies if n.payload}
+                conn.notifies.clear()
+                for company in companies:
+                    invalidate_financials(company)
+        except Exception as e:
+            logger.warning(f"[CacheInvalidation] Listener error, reconnecting in {RECONNECT_SECONDS}s: {e}")
+            time.sleep(RECONNECT_SECONDS)
+        finally:
+            if conn is not None:
+                conn.close()
+
+
+def start_listener():
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_listen_forever, name="financials-cache-invalidation", daemon=True)
+    _thread.start()
+
+
+def stop_listener():
+    _stop.set()
@@ -0,0 +1,32 @@
+"""
+Redis key layout and TTL policy for the API caches.
+
+Keys follow {domain}:{id}:{sub}. TTLs track how often the underlying data
+changes: quotes move intraday, profiles and financials change rarely (and
+financials are also purged on ingest, see core/cache_invalidation.py).
+"""
+
+QUOTE_TTL = 15
+PROFILE_TTL = 24 * 60 * 60
+FINANCIALS_TTL = 24 * 60 * 60
+COMPANIES_TTL = 60 * 60
+
+COMPANIES_LIST_KEY = "companies:list"
+QUOTE_PATTERN = "quote:*"
+PROFILE_PATTERN = "profile:*"
+
+
+def quote_key(ticker: str) -> str:
+    return f"quote:{ticker.upper()}"
+
+
+def profile_key(ticker: str) -> str:
+    return f"profile:{ticker.upper()}"
+
+
+def financials_key(company: str, statement_type: str, period_type: str) -> str:
+    return f"financials:{company.upper()}:{statement_type}:{period_type}"
+
+
+def financials_pattern(company: str) -> str:
+    return f"financials:{company.upper()}:*"
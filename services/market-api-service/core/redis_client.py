@@ -1,7 +1,7 @@
 import redis
 from config.settings import settings
 import logging
-import json
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +14,13 @@ if str(ROOT_PATH) not in sys.path:
     sys.path.insert(0, str(ROOT_PATH))
 from shared.python.redis.client import get_redis_connection
 
+
+def dumps(value) -> bytes:
+    # orjson rejects non-str keys by default; stdlib json stringified them.
+    # Loader-backed payloads (profile, quote) can carry numpy scalars.
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
 class RedisClient:
     _instance = None
 
@@ -32,7 +39,8 @@ class RedisClient:
                     host=settings.REDIS_HOST,
                     port=settings.REDIS_PORT,
                     db=0,
-                    decode_responses=True,
+                    # Values are orjson bytes; get_raw hands them out untouched.
+                    decode_responses=False,
                 )
                 self.client.ping()
                 self.enabled = True
@@ -48,16 +56,57 @@ class RedisClient:
             return None
         try:
             data = self.client.get(key)
-            return json.loads(data) if data else None
+            return orjson.loads(data) if data else None
+        except Exception as e:
+            logger.error(f"Redis get error: {e}")
+            return None
+
+    def get_raw(self, key: str):
+        """Return the cached JSON bytes for key without decoding them."""
+        if not self.enabled:
+            return None
+        try:
+            return self.client.get(key)
         except Exception as e:
             logger.error(f"Redis get error: {e}")
             return None
 
+    def set_raw(self, key: str, data: bytes, ttl: int = 1800):
+        """Store already-serialized JSON bytes under key."""
+        if not self.enabled:
+            return
+        try:
+            self.client.setex(key, ttl, data)
+        except Exception as e:
+            logger.error(f"Redis set error: {e}")
+
+    def get_raw_many(self, keys: list) -> list:
+        """MGET: cached bytes (or None) for each key, in one round-trip."""
+        if not self.enabled or not keys:
+            return [None] * len(keys)
+        try:
+            return self.client.mget(keys)
+        except Exception as e:
+            logger.error(f"Redis mget error: {e}")
+            return [None] * len(keys)
+
+    def set_raw_many(self, items: dict, ttl: int = 1800):
+        """SETEX every key -> bytes pair in one pipelined round-trip."""
+        if not self.enabled or not items:
+            return
+        try:
+            with self.client.pipeline(transaction=False) as pipe:
+                for key, data in items.items():
+                    pipe.setex(key, ttl, data)
+                pipe.execute()
+        except Exception as e:
+            logger.error(f"Redis pipeline set error: {e}")
+
     def set(self, key: str, value: any, ttl: int = 1800):
         if not self.enabled:
             return
         try:
-            self.client.setex(key, ttl, json.dumps(value))
+            self.client.setex(key, ttl, dumps(value))
         except Exception as e:
             logger.error(f"Redis set error: {e}")
 
@@ -66,6 +115,42 @@ class RedisClient:
         if not self.enabled:
             return
         try:
-            self.client.setex(key, ttl, json.dumps(value) if not isinstance(value, str) else value)
+            self.client.setex(key, ttl, dumps(value) if not isinstance(value, str) else value)
+        except Exception as e:
+            logger.error(f"Redis setex error: {e}")
+
+    def acquire_lock(self, key: str, ttl: int = 10) -> bool:
+        """SET NX EX lock. Without Redis there is nothing to coordinate, so it always succeeds."""
+        if not self.enabled:
+            return True
+        try:
+            return bool(self.client.set(key, b"1", nx=True, ex=ttl))
+        except Exception as e:
+            logger.error(f"Redis lock error: {e}")
+            return True
+
+    def delete(self, *keys: str):
+        if not self.enabled or not keys:
+            return
+        try:
+            self.client.delete(*keys)
+        except Exception as e:
+            logger.error(f"Redis delete error: {e}")
+
+    def delete_pattern(self, pattern: str) -> int:
+        """Delete every key matching pattern, walking the keyspace with SCAN."""
+        if not self.enabled:
+            return 0
+        deleted = 0
+        try:
+            batch = []
+            for key in self.client.scan_iter(match=pattern, count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    deleted += self.client.delete(*batch)
+                    batch = []
+            if batch:
+                deleted += self.client.delete(*batch)
         except Exception as e:
-            logger.error(f"Redis setex error: {e}")
\ No newline at end of file
+            logger.error(f"Redis delete_pattern error: {e}")
+        return deleted
@@ -8,20 +8,23 @@ NOTE:
 """
 
 import pandas as pd
-import json
+import functools
+import importlib.util
+import re
 import subprocess
+import sys
+import threading
 from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional
 import numpy as np
-import psycopg2
 from psycopg2.extras import RealDictCursor
 import os
 from pathlib import Path
 from dotenv import load_dotenv
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+from db.base_repo import db_connector
+
 logger = logging.getLogger(__name__)
 
 CURRENT_FILE_PATH = Path(__file__).resolve()
@@ -29,6 +32,65 @@ ENV_PATH = CURRENT_FILE_PATH.parents[2] / ".env"
 if ENV_PATH.exists():
     load_dotenv(ENV_PATH)
 
+TICKER_PATTERN = re.compile(r'^[A-Z0-9\-\^\.]+$')
+
+# Date formats accepted in the CSVs, and the naive-UTC ISO form they are served in
+DATE_FORMATS = ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%m/%d/%Y")
+ISO_UTC_FORMAT = "%Y-%m-%dT%H:%M:%S+00:00"
+
+# The bulk numeric files go through pyarrow's multithreaded CSV reader when
+# it is installed. The small profile/quote files stay on the default parser,
+# since pyarrow would infer timestamp columns where callers expect strings.
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+CSV_ENGINE = "pyarrow" if HAS_PYARROW else None
+ARROW_CSV_FILES = {"stock_candles.csv", "financials_reported.csv"}
+
+# Parsed CSVs shared by every loader, keyed by path and invalidated by mtime
+# (refresh_data rewrites the files). Callers get a copy since several
+# methods modify the frame they read.
+_csv_cache: Dict[str, tuple] = {}
+_csv_cache_lock = threading.Lock()
+
+
+def _newest_source(csv_path: str) -> Optional[tuple]:
+    """
+    (path, mtime_ns) of a data file, or None if it is missing.
+
+    The fetch script may export a Parquet twin (same name, .parquet) next to
+    or instead of the CSV; it keeps its dtypes and skips text parsing, so it
+    is read whenever it is the newer of the two and pyarrow is available.
+    """
+    candidates = [csv_path]
+    if HAS_PYARROW:
+        candidates.append(os.path.splitext(csv_path)[0] + ".parquet")
+    newest = None
+    for path in candidates:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            continue
+        if newest is None or mtime > newest[1]:
+            newest = (path, mtime)
+    return newest
+
+
+def _prepare_frame(filename: str, df: pd.DataFrame) -> pd.DataFrame:
+    """One-time cleanup of a freshly parsed CSV before it is cached"""
+    # Low-cardinality text columns become categoricals, so per-request
+    # filters compare small integer codes instead of Python strings.
+    # is_string_dtype covers both object columns and pandas 3's StringDtype,
+    # and is false for a categorical already prepared (e.g. from Parquet).
+    if (
+        filename == "financials_reported.csv"
+        and "report_type" in df.columns
+        and pd.api.types.is_string_dtype(df["report_type"].dtype)
+    ):
+        df["report_type"] = df["report_type"].str.upper().astype("category")
+    if filename == "dividends.csv" and "currency" in df.columns:
+        df["currency"] = df["currency"].astype("category")
+    return df
+
+
 class StockDataLoader:
     """Load real stock data from CSV files"""
 
@@ -39,21 +101,11 @@ class StockDataLoader:
             raise ValueError(f"Invalid ticker format: {ticker}")
         
         # Check for valid characters (alphanumeric + special chars)
-        import re
-        if not re.match(r'^[A-Z0-9\-\^\.]+$', ticker):
+        if not TICKER_PATTERN.match(ticker):
             raise ValueError(f"Ticker contains invalid characters: {ticker}")
         self.ticker = ticker
         self.data_dir = data_dir
 
-        # Database configuration
-        self.DB_CONFIG = {
-            "host": os.getenv("DB_HOST"),
-            "port": os.getenv("DB_PORT"),
-            "dbname": os.getenv("DB_NAME"),
-            "user": os.getenv("DB_USER"),
-            "password": os.getenv("DB_PASSWORD")
-        }
-
     def _file_exists(self, filename: str) -> bool:
         """Check if CSV file exists"""
         return os.path.exists(os.path.join(self.data_dir, filename))
@@ -61,11 +113,24 @@ class StockDataLoader:
     def _safe_read_csv(self, filename: str) -> Optional[pd.DataFrame]:
         """Safely read CSV file, return None if not found or empty"""
         try:
-            file_path = os.path.join(self.data_dir, filename)
-            if not os.path.exists(file_path):
+            # The stat both checks existence and yields the cache key
+            source = _newest_source(os.path.join(self.data_dir, filename))
+            if source is None:
                 return None
-            df = pd.read_csv(file_path)
-            return df if not df.empty else None
+            file_path, mtime = source
+            with _csv_cache_lock:
+                cached = _csv_cache.get(file_path)
+            if cached is None or cached[0] != mtime:
+                if file_path.endswith(".parquet"):
+                    df = pd.read_parquet(file_path, engine="pyarrow")
+                else:
+                    engine = CSV_ENGINE if filename in ARROW_CSV_FILES else None
+                    df = pd.read_csv(file_path, engine=engine)
+                df = _prepare_frame(filename, df)
+                cached = (mtime, df if not df.empty else None)
+                with _csv_cache_lock:
+                    _csv_cache[file_path] = cached
+            return cached[1].copy() if cached[1] is not None else None
         except Exception as e:
             return None
 
@@ -78,25 +143,24 @@ class StockDataLoader:
         except (ValueError, TypeError):
             return 0.0
 
-    def _format_date_iso(self, date_str: str) -> str:
-        """Convert date string to ISO 8601 format with timezone"""
-        try:
-            if pd.isna(date_str) or not date_str:
-                return datetime.now(timezone.utc).isoformat()
-
-            # Try different date formats
-            formats = ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%m/%d/%Y"]
-            for fmt in formats:
-                try:
-                    dt = datetime.strptime(str(date_str), fmt)
-                    return dt.replace(tzinfo=timezone.utc).isoformat()
-                except ValueError:
-                    continue
-
-            # If no format matches, return current time
-            return datetime.now(timezone.utc).isoformat()
-        except Exception:
-            return datetime.now(timezone.utc).isoformat()
+    def _format_numbers(self, df: pd.DataFrame, column: str, decimals: int = 2) -> pd.Series:
+        """Column-wise _format_number: missing column or unparsable values become 0.0"""
+        if column not in df.columns:
+            return pd.Series(0.0, index=df.index)
+        return pd.to_numeric(df[column], errors="coerce").fillna(0.0).round(decimals)
+
+    def _format_dates_iso(self, df: pd.DataFrame, column: str) -> pd.Series:
+        """Convert a date column to ISO 8601 UTC strings, falling back to now"""
+        now_iso = datetime.now(timezone.utc).isoformat()
+        if column not in df.columns:
+            return pd.Series(now_iso, index=df.index)
+
+        # Try each accepted format over the whole column; earlier formats win
+        values = df[column].astype(str)
+        parsed = pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
+        for fmt in DATE_FORMATS:
+            parsed = parsed.fillna(pd.to_datetime(values, format=fmt, errors="coerce"))
+        return parsed.dt.strftime(ISO_UTC_FORMAT).fillna(now_iso)
 
     def get_quote(self) -> Dict[str, Any]:
         """Load quote data and format for API response"""
@@ -111,25 +175,22 @@ class StockDataLoader:
             pass
 
         try:
-            conn = psycopg2.connect(**self.DB_CONFIG)
-            cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-            # Query company data from database
-            cursor.execute("""
-                SELECT 
-                    company_id as ticker,
-                    company_name as name,
-                    exchange,
-                    currency,
-                    market_cap,
-                    dividend_yield
-                FROM company
-                WHERE company_id = %s
-            """, (self.ticker,))
-
-            result = cursor.fetchone()
-            cursor.close()
-            conn.close()
+            with db_connector.connection() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                    # Query company data from database
+                    cursor.execute("""
+                        SELECT 
+                            company_id as ticker,
+                            company_name as name,
+                            exchange,
+                            currency,
+                            market_cap,
+                            dividend_yield
+                        FROM company
+                        WHERE company_id = %s
+                    """, (self.ticker,))
+
+                    result = cursor.fetchone()
 
             if result:
                 # Handle 0.0 values correctly by checking for None
@@ -354,20 +415,18 @@ class StockDataLoader:
 
         if df is None or df.empty:
             # Generate mock data for 3 months if no real data available
-            dates = []
-            prices = []
+            days = 60  # 60 trading days ≈ 3 months
             base_price = 600.0
 
-            for i in range(60):  # 60 trading days ≈ 3 months
-                date = datetime.now() - pd.Timedelta(days=i)
-                dates.append(date.strftime("%Y-%m-%dT09:30:00+00:00"))
-                # Generate realistic price variation
-                price_change = np.random.normal(0, 0.02) * base_price
-                base_price = max(base_price + price_change, base_price * 0.8)
-                prices.append(self._format_number(base_price))
+            # Each step moves by N(0, 2%) of the current price but never drops
+            # below 80% of it, i.e. price *= max(1 + z, 0.8): one cumprod
+            # instead of a per-day loop.
+            steps = np.maximum(1 + np.random.default_rng().normal(0, 0.02, size=days), 0.8)
+            path = base_price * np.cumprod(steps)
 
-            dates.reverse()
-            prices.reverse()
+            # The walk runs backwards from today, so the last step is the oldest day
+            dates = pd.date_range(end=datetime.now(), periods=days, freq="D").strftime("%Y-%m-%dT09:30:00+00:00").tolist()
+            prices = np.round(path[::-1], 2).tolist()
 
             return {
                 "dates": dates,
@@ -378,8 +437,9 @@ class StockDataLoader:
         df['date'] = pd.to_datetime(df['date'])
         df = df.sort_values('date')
 
-        dates = [self._format_date_iso(date.strftime("%Y-%m-%d")) for date in df['date']]
-        prices = [self._format_number(price) for price in df['close']]
+        # Whole-column formatting; candles are served at midnight UTC
+        dates = df['date'].dt.strftime("%Y-%m-%dT00:00:00+00:00").tolist()
+        prices = self._format_numbers(df, 'close').tolist()
 
         return {
             "dates": dates,
@@ -393,19 +453,17 @@ class StockDataLoader:
         if df is None or df.empty:
             return []
 
-        dividends = []
-        for _, row in df.iterrows():
-            dividends.append({
-                "date": self._format_date_iso(row.get('date', '')),
-                "amount": self._format_number(row.get('amount', 0), 4),
-                "adjustedAmount": self._format_number(row.get('adjusted_amount', 0), 4),
-                "currency": str(row.get('currency', 'USD')),
-                "declaredDate": self._format_date_iso(row.get('declared_date', '')),
-                "payDate": self._format_date_iso(row.get('pay_date', '')),
-                "recordDate": self._format_date_iso(row.get('record_date', ''))
-            })
+        dividends = pd.DataFrame({
+            "date": self._format_dates_iso(df, 'date'),
+            "amount": self._format_numbers(df, 'amount', 4),
+            "adjustedAmount": self._format_numbers(df, 'adjusted_amount', 4),
+            "currency": df['currency'].astype(str) if 'currency' in df.columns else "USD",
+            "declaredDate": self._format_dates_iso(df, 'declared_date'),
+            "payDate": self._format_dates_iso(df, 'pay_date'),
+            "recordDate": self._format_dates_iso(df, 'record_date')
+        }, index=df.index)
 
-        return dividends
+        return dividends.to_dict(orient="records")
 
     def get_news(self, limit: int = 16) -> Dict[str, Any]:
         """Load news articles"""
@@ -420,21 +478,22 @@ class StockDataLoader:
         # Limit the number of articles
         df_limited = df.head(limit)
 
-        news_articles = []
-        for _, row in df_limited.iterrows():
-            # Convert datetime to ISO format
-            datetime_str = str(row.get('datetime', ''))
-            if datetime_str and datetime_str != 'nan':
-                try:
-                    # Parse the datetime string and convert to ISO format
-                    dt = pd.to_datetime(datetime_str)
-                    iso_datetime = dt.isoformat() + 'Z'
-                except:
-                    iso_datetime = datetime.now(timezone.utc).isoformat()
-            else:
-                iso_datetime = datetime.now(timezone.utc).isoformat()
-
-            news_articles.append({
+        # Parse the datetime column once; unparsable or empty values fall back to now
+        now_iso = datetime.now(timezone.utc).isoformat()
+        if 'datetime' in df_limited.columns:
+            raw = df_limited['datetime'].astype(str)
+            values = raw.where(raw != 'nan', '')
+            try:
+                parsed = pd.to_datetime(values, errors='coerce', format='mixed')
+            except (ValueError, TypeError):
+                # Mixed naive/aware values cannot share one column
+                parsed = [pd.to_datetime(value, errors='coerce') for value in values]
+        else:
+            parsed = [pd.NaT] * len(df_limited)
+        iso_datetimes = [now_iso if pd.isna(dt) else dt.isoformat() + 'Z' for dt in parsed]
+
+        news_articles = [
+            {
                 "id": str(row.get('id', '')),
                 "headline": str(row.get('headline', '')),
                 "summary": str(row.get('summary', '')),
@@ -444,7 +503,9 @@ class StockDataLoader:
                 "category": str(row.get('category', 'general')),
                 "image": str(row.get('image', '')),
                 "assetInfoIds": [self.ticker]  # Mock asset info IDs
-            })
+            }
+            for row, iso_datetime in zip(df_limited.to_dict(orient="records"), iso_datetimes)
+        ]
 
         return {
             "newsTotalCount": len(df),
@@ -480,47 +541,38 @@ class StockDataLoader:
 
     def _process_financial_statements(self, df: pd.DataFrame, report_type: str) -> List[Dict[str, Any]]:
         """Process financial statements for a specific report type"""
-        # Handle both uppercase and lowercase report types
-        filtered_df = df[df['report_type'].str.upper() == report_type.upper()].copy()
+        # report_type is upper-cased once when the CSV is parsed
+        filtered_df = df[df['report_type'] == report_type.upper()].copy()
 
         if filtered_df.empty:
             return []
 
-        # Group by line item and create periods
-        statements = []
-        line_items = filtered_df['line_item_name'].unique()
-
-        for line_item in line_items:
-            if pd.isna(line_item) or line_item == '':
-                continue
-
-            item_data = filtered_df[filtered_df['line_item_name'] == line_item]
-
-            # Create period columns
-            periods = {}
-            for _, row in item_data.iterrows():
-                period = str(row.get('period', ''))
-                value = self._format_number(row.get('value', 0))
-                if period and value != 0:  # Only include non-zero values
-                    periods[period] = value
-
-            # Skip items with no meaningful data
-            if not periods:
-                continue
-
-            # Convert line item name to camelCase-like format
-            camel_case_name = self._to_camel_case(str(line_item))
-
-            # Clean up display name
-            display_name = str(line_item).replace('us-gaap_', '').replace('_', ' ').title()
+        # Keep only named items with a period and a non-zero value; a later
+        # row for the same (item, period) overrides an earlier one
+        values = self._format_numbers(filtered_df, 'value')
+        periods = filtered_df['period'].astype(str) if 'period' in filtered_df.columns else pd.Series('', index=filtered_df.index)
+        names = filtered_df['line_item_name']
+        keep = names.notna() & (names != '') & (periods != '') & (values != 0)
+        if not keep.any():
+            return []
 
-            statement_item = {
-                "name": camel_case_name,
-                "displayName": display_name,
-                **periods
-            }
+        # Items come out in order of first appearance in the file
+        item_order = names.groupby(names, sort=False).ngroup()
+        long = pd.DataFrame({
+            "order": item_order[keep],
+            "item": names[keep],
+            "period": periods[keep],
+            "value": values[keep],
+        }).sort_values("order", kind="stable")
+        by_item = long.groupby(["item", "period"], sort=False)["value"].last()
 
-            statements.append(statement_item)
+        statements = []
+        for line_item, item_periods in by_item.groupby(level=0, sort=False):
+            statements.append({
+                "name": self._to_camel_case(str(line_item)),
+                "displayName": str(line_item).replace('us-gaap_', '').replace('_', ' ').title(),
+                **item_periods.droplevel(0).to_dict()
+            })
 
         return statements
 
@@ -602,25 +654,22 @@ class StockDataLoader:
         if df is None or df.empty:
             return []
 
-        earnings = []
-        for _, row in df.iterrows():
-            actual_eps = self._format_number(row.get('actual_eps', 0), 4)
-            estimate_eps = self._format_number(row.get('estimate_eps', 0), 4)
-            actual_revenue = self._format_number(row.get('actual_revenue', 0))
-            estimate_revenue = self._format_number(row.get('estimate_revenue', 0))
-
-            earnings.append({
-                "period": str(row.get('period', '')),
-                "actualEps": actual_eps,
-                "estimateEps": estimate_eps,
-                "surprise": self._format_number(row.get('surprise', 0), 4),
-                "surprisePercent": self._format_number(row.get('surprise_percent', 0), 2),
-                "actualRevenue": actual_revenue,
-                "estimateRevenue": estimate_revenue,
-                "revenueSurprise": actual_revenue - estimate_revenue if actual_revenue and estimate_revenue else 0.0
-            })
+        actual_revenue = self._format_numbers(df, 'actual_revenue')
+        estimate_revenue = self._format_numbers(df, 'estimate_revenue')
+        both_reported = (actual_revenue != 0) & (estimate_revenue != 0)
 
-        return earnings
+        earnings = pd.DataFrame({
+            "period": df['period'].astype(str) if 'period' in df.columns else "",
+            "actualEps": self._format_numbers(df, 'actual_eps', 4),
+            "estimateEps": self._format_numbers(df, 'estimate_eps', 4),
+            "surprise": self._format_numbers(df, 'surprise', 4),
+            "surprisePercent": self._format_numbers(df, 'surprise_percent', 2),
+            "actualRevenue": actual_revenue,
+            "estimateRevenue": estimate_revenue,
+            "revenueSurprise": (actual_revenue - estimate_revenue).where(both_reported, 0.0)
+        }, index=df.index)
+
+        return earnings.to_dict(orient="records")
 
     def refresh_data(self) -> bool:
         """Re-run the fetch script to get latest data"""
@@ -629,14 +678,26 @@ class StockDataLoader:
             if not os.path.exists(script_path):
                 return False
 
-            result = subprocess.run(
-                ["python", script_path],
+            # The script writes its CSVs relative to its cwd, so it keeps its
+            # own process rather than chdir-ing this (threaded) server. Its
+            # output is streamed to the log line by line instead of being
+            # buffered whole in memory.
+            with subprocess.Popen(
+                [sys.executable, os.path.abspath(script_path)],
                 cwd=self.data_dir,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
                 text=True
-            )
+            ) as proc:
+                for line in proc.stdout:
+                    logger.info(f"[fetch_finnhub_data] {line.rstrip()}")
+            returncode = proc.wait()
+
+            # Rewrites can land within the mtime granularity; don't trust it
+            with _csv_cache_lock:
+                _csv_cache.clear()
 
-            return result.returncode == 0
+            return returncode == 0
 
         except Exception:
             return False
@@ -661,14 +722,20 @@ class StockDataLoader:
             "totalRows": 0
         }
 
+        # One directory listing supplies existence and mtime for every file
+        try:
+            with os.scandir(self.data_dir) as entries:
+                stats = {entry.name: entry.stat() for entry in entries if entry.name in files}
+        except OSError:
+            stats = {}
+
         for file in files:
-            df = self._safe_read_csv(file)
-            if df is not None:
-                row_count = len(df)
+            row_count = self._count_csv_rows(file) if file in stats else 0
+            if row_count:
                 summary["files"][file] = {
                     "exists": True,
                     "rows": row_count,
-                    "lastModified": self._get_file_modified_time(file)
+                    "lastModified": datetime.fromtimestamp(stats[file].st_mtime).isoformat()
                 }
                 summary["totalRows"] += row_count
             else:
@@ -680,15 +747,16 @@ class StockDataLoader:
 
         return summary
 
-    def _get_file_modified_time(self, filename: str) -> Optional[str]:
-        """Get file last modified time"""
+    def _count_csv_rows(self, filename: str) -> int:
+        """Count non-blank data rows (header excluded) without parsing the CSV"""
         try:
-            file_path = os.path.join(self.data_dir, filename)
-            if os.path.exists(file_path):
-                mtime = os.path.getmtime(file_path)
-                return datetime.fromtimestamp(mtime).isoformat()
-        except Exception:
-            pass
-        return None
+            with open(os.path.join(self.data_dir, filename), "rb") as f:
+                return max(sum(1 for line in f if line.strip()) - 1, 0)
+        except OSError:
+            return 0
 
 
+@functools.lru_cache(maxsize=256)
+def get_loader(ticker: str) -> StockDataLoader:
+    """Shared StockDataLoader per ticker (loaders hold no per-request state)."""
+    return StockDataLoader(ticker.upper())
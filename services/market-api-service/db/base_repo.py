@@ -1,43 +1,123 @@
-import psycopg2
+import weakref
+from contextlib import contextmanager
+
+import psycopg2.extensions
 from psycopg2.extras import RealDictCursor
 from config.settings import settings
+from shared.python.db.connector import PostgresConnector
 import logging
 
 logger = logging.getLogger(__name__)
 
+DB_CONFIG = {
+    "host": settings.DB_HOST,
+    "port": settings.DB_PORT,
+    "dbname": settings.DB_NAME,
+    "user": settings.DB_USER,
+    "password": settings.DB_PASSWORD,
+    "sslmode": settings.DB_SSL_MODE
+}
+
+# Read NUMERIC columns straight into float while parsing results, instead of
+# building a Decimal per value that callers then float() anyway. The API only
+# reports prices and statement values, where float precision is enough.
+NUMERIC_AS_FLOAT = psycopg2.extensions.new_type(
+    psycopg2.extensions.DECIMAL.values,
+    "NUMERIC_AS_FLOAT",
+    lambda value, cur: float(value) if value is not None else None,
+)
+psycopg2.extensions.register_type(NUMERIC_AS_FLOAT)
+
+# One process-wide pool shared by every repository/service, so requests reuse
+# open connections instead of paying a TCP/auth handshake per query.
+db_connector = PostgresConnector(
+    DB_CONFIG,
+    min_conn=settings.DB_POOL_MIN,
+    max_conn=settings.DB_POOL_MAX,
+)
+
+
+class PreparedQuery:
+    """
+    A hot query run as a server-side prepared statement.
+
+    `sql` uses $1..$n placeholders typed by `arg_types`. Each pooled
+    connection PREPAREs it once, and later calls only send EXECUTE, so
+    Postgres skips parse and plan.
+    """
+
+    __slots__ = ("name", "prepare_sql", "execute_sql")
+
+    def __init__(self, name: str, arg_types: tuple, sql: str):
+        self.name = name
+        self.prepare_sql = f"PREPARE {name}({', '.join(arg_types)}) AS {sql}"
+        self.execute_sql = f"EXECUTE {name}({', '.join(['%s'] * len(arg_types))})"
+
+
+# Statement names already prepared on each pooled connection.
+_prepared_names = weakref.WeakKeyDictionary()
+
+
+def _ensure_prepared(conn, cur, query: PreparedQuery):
+    names = _prepared_names.setdefault(conn, set())
+    if query.name in names:
+        return
+    cur.execute("SELECT 1 FROM pg_prepared_statements WHERE name = %s", (query.name,))
+    if cur.fetchone() is None:
+        cur.execute(query.prepare_sql)
+    names.add(query.name)
+
+
 class BaseRepository:
     def __init__(self):
-        self.db_config = {
-            "host": settings.DB_HOST,
-            "port": settings.DB_PORT,
-            "dbname": settings.DB_NAME,
-            "user": settings.DB_USER,
-            "password": settings.DB_PASSWORD,
-            "sslmode": settings.DB_SSL_MODE
-        }
+        self.db_config = DB_CONFIG
 
     def get_connection(self):
-        return psycopg2.connect(**self.db_config)
+        """Borrow a pooled connection; hand it back with release_connection()."""
+        return db_connector.get_connection()
+
+    def release_connection(self, conn):
+        db_connector.return_connection(conn)
+
+    @contextmanager
+    def connection(self):
+        with db_connector.connection() as conn:
+            yield conn
 
     def execute_query(self, query, params=None, fetch_one=False, fetch_all=False):
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(query, params)
-                if fetch_one:
-                    result = cur.fetchone()
+        with self.connection() as conn:
+            try:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    cur.execute(query, params)
+                    if fetch_one:
+                        result = cur.fetchone()
+                        conn.commit()
+                        return result
+                    if fetch_all:
+                        result = cur.fetchall()
+                        conn.commit()
+                        return result
                     conn.commit()
-                    return result
-                if fetch_all:
-                    result = cur.fetchall()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Database error: {e}")
+                raise
+
+    def execute_prepared(self, query: PreparedQuery, params=(), fetch_one=False, fetch_all=False):
+        with self.connection() as conn:
+            try:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    _ensure_prepared(conn, cur, query)
+                    cur.execute(query.execute_sql, params)
+                    result = cur.fetchone() if fetch_one else cur.fetchall() if fetch_all else None
                     conn.commit()
                     return result
-                conn.commit()
-        except Exception as e:
-            logger.error(f"Database error: {e}")
-            raise
-        finally:
-            conn.close()
+            except Exception as e:
+                conn.rollback()
+                # Re-check against pg_prepared_statements on next use.
+                _prepared_names.pop(conn, None)
+                logger.error(f"Database error: {e}")
+                raise
 
     def fetch_one(self, query, params=None):
         return self.execute_query(query, params, fetch_one=True)
@@ -3,6 +3,46 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Pivots line items into {item_name: {period_key: value}} and lists the period
+# keys newest first, so the service does no per-row Python work. Rows are
+# aggregated in the views' own order (newest quarter first) and jsonb keeps the
+# last value for a repeated key, so when several quarters collapse into one
+# annual key the earliest quarter's value wins, as it did before.
+PIVOT_QUERY = """
+    WITH src AS (
+        {source}
+    ),
+    keyed AS (
+        SELECT
+            item_name,
+            COALESCE(item_value, 0)::float8 AS item_value,
+            display_order,
+            fiscal_year,
+            substring(fiscal_quarter from 2)::int AS quarter_ord,
+            CASE WHEN %(annual)s THEN 0
+                 ELSE substring(fiscal_quarter from 2)::int END AS quarter_num,
+            CASE WHEN %(annual)s THEN fiscal_year::text
+                 ELSE fiscal_year || '-' || fiscal_quarter END AS period_key
+        FROM src
+    ),
+    periods AS (
+        SELECT array_agg(period_key ORDER BY fiscal_year DESC, quarter_num DESC) AS periods
+        FROM (SELECT DISTINCT period_key, fiscal_year, quarter_num FROM keyed) p
+    )
+    SELECT
+        k.item_name,
+        jsonb_object_agg(
+            k.period_key,
+            k.item_value
+            ORDER BY k.fiscal_year DESC, k.quarter_ord DESC, k.display_order
+        ) AS period_values,
+        periods.periods
+    FROM keyed k
+    CROSS JOIN periods
+    GROUP BY k.item_name, periods.periods
+"""
+
+
 class FinancialRepository(BaseRepository):
     """
     Repository for financial statement data.
@@ -12,50 +52,63 @@ class FinancialRepository(BaseRepository):
     - company.company_id is used directly (no need to join with stocks table)
     """
     
-    def get_financials(self, company_id: str, view_name: str):
+    def get_financials(self, company_id: str, view_name: str, period_type: str):
         """
-        Get financials from a view.
+        Get pivoted financials from a view.
         
         Args:
             company_id: Company ID (ticker symbol, e.g., "IBM")
             view_name: View name (e.g., "financial_oltp.vw_income_statement_recent")
+            period_type: "annual" or "quarterly"
+        """
+        source = f"""
+            SELECT item_name, item_value, display_order, fiscal_year, fiscal_quarter
+            FROM {view_name}
+            WHERE company_id = %(company_id)s
         """
-        query = f"SELECT * FROM {view_name} WHERE company_id = %s"
-        logger.info(f"[FinancialRepository] Executing query: {query} with params: ({company_id},)")
-        rows = self.execute_query(query, (company_id.upper(),), fetch_all=True)
-        logger.info(f"[FinancialRepository] Query returned {len(rows) if rows else 0} rows")
+        query = PIVOT_QUERY.format(source=source)
+        logger.info(f"[FinancialRepository] Querying {view_name} for company_id={company_id}, period_type={period_type}")
+        rows = self.execute_query(
+            query,
+            {"company_id": company_id.upper(), "annual": period_type == "annual"},
+            fetch_all=True,
+        )
+        logger.info(f"[FinancialRepository] Query returned {len(rows) if rows else 0} items")
         return rows
     
-    def get_financials_from_tables(self, company_id: str, statement_code: str):
+    def get_financials_from_tables(self, company_id: str, statement_code: str, period_type: str):
         """
         Fallback: Query raw tables directly if view returns empty.
         
         Uses company_id directly (ticker = company_id for US stocks).
         No need to join with stocks table - financial_oltp.company is independent.
         """
-        query = """
+        source = """
             SELECT 
-                fs.statement_id,
-                c.company_id,
-                c.company_name,
-                fs.fiscal_year,
-                fs.fiscal_quarter,
-                (fs.fiscal_year || '-' || fs.fiscal_quarter) AS fiscal_period,
                 li.item_name,
                 li.item_value,
-                li.unit,
                 li.display_order,
-                fs.report_date
+                fs.fiscal_year,
+                fs.fiscal_quarter
             FROM financial_oltp.financial_statement fs
             JOIN financial_oltp.company c ON fs.company_id = c.company_id
             JOIN financial_oltp.statement_type st ON fs.statement_type_id = st.statement_type_id
             JOIN financial_oltp.financial_line_item li ON fs.statement_id = li.statement_id
-            WHERE c.company_id = %s 
-              AND st.statement_code = %s
+            WHERE c.company_id = %(company_id)s 
+              AND st.statement_code = %(statement_code)s
             ORDER BY fs.fiscal_year DESC, fs.fiscal_quarter DESC, li.display_order
             LIMIT 1000
         """
+        query = PIVOT_QUERY.format(source=source)
         logger.info(f"[FinancialRepository] Fallback query for company_id={company_id}, statement_code={statement_code}")
-        rows = self.execute_query(query, (company_id.upper(), statement_code), fetch_all=True)
-        logger.info(f"[FinancialRepository] Fallback query returned {len(rows) if rows else 0} rows")
+        rows = self.execute_query(
+            query,
+            {
+                "company_id": company_id.upper(),
+                "statement_code": statement_code,
+                "annual": period_type == "annual",
+            },
+            fetch_all=True,
+        )
+        logger.info(f"[FinancialRepository] Fallback query returned {len(rows) if rows else 0} items")
         return rows
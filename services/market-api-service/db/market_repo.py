@@ -1,8 +1,25 @@
-from .base_repo import BaseRepository
+from .base_repo import BaseRepository, PreparedQuery
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Ticker list is bound as one text[] so the statement text never varies.
+ACCUMULATED_VOLUMES_QUERY = PreparedQuery("market_accumulated_volumes", ("text[]",), """
+    SELECT
+        s.stock_ticker AS symbol,
+        COALESCE(t.size, 0) AS volume
+    FROM market_data_oltp.stocks AS s
+    LEFT JOIN LATERAL (
+        SELECT size
+        FROM market_data_oltp.stock_trades_realtime
+        WHERE stock_id = s.stock_id
+        ORDER BY ts DESC, trade_id DESC
+        LIMIT 1
+    ) AS t ON true
+    WHERE s.stock_ticker = ANY($1)
+        AND s.delisted IS FALSE
+""")
+
 
 class MarketMetadataRepository(BaseRepository):
     """Repository for market metadata (stocks list for heatmap, quotes, etc.)."""
@@ -44,26 +61,8 @@ class MarketMetadataRepository(BaseRepository):
         
         # Batch query: lấy volume mới nhất cho tất cả symbols trong 1 query
         # Sử dụng LATERAL JOIN để lấy record mới nhất cho mỗi stock
-        placeholders = ','.join(['%s'] * len(symbols))
-        query = f"""
-            SELECT 
-                s.stock_ticker AS symbol,
-                COALESCE(t.size, 0) AS volume
-            FROM market_data_oltp.stocks AS s
-            LEFT JOIN LATERAL (
-                SELECT size
-                FROM market_data_oltp.stock_trades_realtime
-                WHERE stock_id = s.stock_id
-                ORDER BY ts DESC, trade_id DESC
-                LIMIT 1
-            ) AS t ON true
-            WHERE s.stock_ticker IN ({placeholders})
-                AND s.delisted IS FALSE
-
-        """
-        
         logger.info(f"[MarketMetadataRepository] Fetching accumulated volumes for {len(symbols)} symbols")
-        rows = self.execute_query(query, [s.upper() for s in symbols], fetch_all=True)
+        rows = self.execute_prepared(ACCUMULATED_VOLUMES_QUERY, ([s.upper() for s in symbols],), fetch_all=True)
         
         # Convert to dict {symbol: volume}
         result = {}
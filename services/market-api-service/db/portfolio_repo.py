@@ -84,7 +84,7 @@ class PortfolioRepo(BaseRepository):
             logger.error(f"Error adding transaction (atomic rollback): {e}")
             raise e
         finally:
-            conn.close()
+            self.release_connection(conn)
             
         return transaction_id
 
@@ -268,7 +268,7 @@ class PortfolioRepo(BaseRepository):
             logger.error(f"Error updating transaction: {e}")
             raise e
         finally:
-            conn.close()
+            self.release_connection(conn)
     def delete_transaction(self, transaction_id: str, portfolio_id: str) -> bool:
         """
         Delete a specific transaction and update the holdings cache.
@@ -295,7 +295,7 @@ class PortfolioRepo(BaseRepository):
             logger.error(f"Error deleting transaction: {e}")
             raise e
         finally:
-            conn.close()
+            self.release_connection(conn)
 
     def delete_holding(self, portfolio_id: str, ticker: str) -> bool:
         """
@@ -316,7 +316,7 @@ class PortfolioRepo(BaseRepository):
             logger.error(f"Error deleting holding: {e}")
             raise e
         finally:
-            conn.close()
+            self.release_connection(conn)
 
     def delete_portfolio(self, portfolio_id: str, user_id: str) -> bool:
         """
@@ -346,4 +346,4 @@ class PortfolioRepo(BaseRepository):
             logger.error(f"Error deleting portfolio: {e}")
             raise e
         finally:
-            conn.close()
+            self.release_connection(conn)
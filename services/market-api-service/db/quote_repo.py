@@ -1,31 +1,98 @@
-from .base_repo import BaseRepository
+from .base_repo import BaseRepository, PreparedQuery
 from typing import List, Dict
 
+STOCK_BY_TICKER = PreparedQuery("stock_by_ticker", ("text",), """
+    SELECT stock_id
+    FROM market_data_oltp.stocks
+    WHERE stock_ticker = $1
+""")
+
+LATEST_PRICES = PreparedQuery("quote_latest_prices", ("text", "int"), """
+    SELECT
+        eod.close_price as current_price,
+        eod.open_price,
+        eod.high_price,
+        eod.low_price,
+        eod.volume,
+        eod.pct_change as percent_change,
+        eod.trading_date
+    FROM market_data_oltp.stocks AS s
+    CROSS JOIN LATERAL (
+        SELECT close_price, open_price, high_price, low_price,
+               volume, pct_change, trading_date
+        FROM market_data_oltp.stock_eod_prices
+        WHERE stock_id = s.stock_id
+        ORDER BY trading_date DESC
+        LIMIT $2
+    ) AS eod
+    WHERE s.stock_ticker = $1
+    ORDER BY eod.trading_date DESC
+""")
+
+PREVIOUS_CLOSE = PreparedQuery("quote_previous_close", ("int",), """
+    SELECT close_price
+    FROM market_data_oltp.stock_eod_prices
+    WHERE stock_id = $1
+    ORDER BY trading_date DESC
+    LIMIT 1
+""")
+
+# Batch lookups bind the ticker list as one text[] so the statement text is
+# the same for any number of symbols.
+PREVIOUS_CLOSES_BATCH = PreparedQuery("quote_previous_closes_batch", ("text[]",), """
+    SELECT
+        s.stock_ticker AS ticker,
+        eod.close_price AS previous_close
+    FROM market_data_oltp.stocks AS s
+    LEFT JOIN LATERAL (
+        SELECT close_price
+        FROM market_data_oltp.stock_eod_prices
+        WHERE stock_id = s.stock_id
+        ORDER BY trading_date DESC
+        LIMIT 1
+    ) AS eod ON true
+    WHERE s.stock_ticker = ANY($1)
+        AND s.delisted IS FALSE
+""")
+
+LATEST_EOD_BATCH = PreparedQuery("quote_latest_eod_batch", ("text[]",), """
+    SELECT
+        s.stock_ticker AS ticker,
+        eod.close_price AS price,
+        eod.volume,
+        eod.pct_change AS change_percent,
+        eod.close_price AS previous_close,
+        eod.trading_date
+    FROM market_data_oltp.stocks AS s
+    LEFT JOIN LATERAL (
+        SELECT
+            close_price,
+            volume,
+            pct_change,
+            trading_date
+        FROM market_data_oltp.stock_eod_prices
+        WHERE stock_id = s.stock_id
+        ORDER BY trading_date DESC
+        LIMIT 1
+    ) AS eod ON true
+    WHERE s.stock_ticker = ANY($1)
+        AND s.delisted IS FALSE
+        AND eod.close_price IS NOT NULL
+""")
+
 class QuoteRepository(BaseRepository):
     def get_stock_id(self, ticker):
-        query = """
-            SELECT stock_id 
-            FROM market_data_oltp.stocks 
-            WHERE stock_ticker = %s
-        """
-        result = self.execute_query(query, (ticker.upper(),), fetch_one=True)
+        result = self.execute_prepared(STOCK_BY_TICKER, (ticker.upper(),), fetch_one=True)
         return result['stock_id'] if result else None
 
-    def get_latest_price(self, stock_id):
-        query = """
-            SELECT 
-                close_price as current_price,
-                open_price,
-                high_price,
-                low_price,
-                volume,
-                pct_change as percent_change
-            FROM market_data_oltp.stock_eod_prices 
-            WHERE stock_id = %s 
-            ORDER BY trading_date DESC 
-            LIMIT 1
+    def get_latest_prices(self, ticker, limit=2):
         """
-        return self.execute_query(query, (stock_id,), fetch_one=True)
+        Latest EOD rows for a ticker (newest first) in a single round-trip.
+
+        Resolves stock_id and reads the last `limit` trading days together,
+        so callers get the latest bar and the previous close from one query.
+        """
+        return self.execute_prepared(LATEST_PRICES, (ticker.upper(), limit), fetch_all=True) or []
 
     def get_previous_close(self, stock_id):
         """
@@ -36,14 +103,7 @@ class QuoteRepository(BaseRepository):
         2. Lấy record đầu tiên (LIMIT 1) = ngày mới nhất
         3. Đây là previousClose để tính change so với giá realtime hiện tại
         """
-        query = """
-            SELECT close_price
-            FROM market_data_oltp.stock_eod_prices 
-            WHERE stock_id = %s 
-            ORDER BY trading_date DESC 
-            LIMIT 1
-        """
-        result = self.execute_query(query, (stock_id,), fetch_one=True)
+        result = self.execute_prepared(PREVIOUS_CLOSE, (stock_id,), fetch_one=True)
         return float(result['close_price']) if result else None
 
     def get_previous_closes_batch(self, tickers: List[str]) -> Dict[str, float]:
@@ -57,24 +117,7 @@ class QuoteRepository(BaseRepository):
             return {}
         
         # Batch query: lấy previousClose cho tất cả symbols trong 1 query
-        placeholders = ','.join(['%s'] * len(tickers))
-        query = f"""
-            SELECT 
-                s.stock_ticker AS ticker,
-                eod.close_price AS previous_close
-            FROM market_data_oltp.stocks AS s
-            LEFT JOIN LATERAL (
-                SELECT close_price
-                FROM market_data_oltp.stock_eod_prices
-                WHERE stock_id = s.stock_id
-                ORDER BY trading_date DESC
-                LIMIT 1
-            ) AS eod ON true
-            WHERE s.stock_ticker IN ({placeholders})
-                AND s.delisted IS FALSE
-        """
-        
-        rows = self.execute_query(query, [t.upper() for t in tickers], fetch_all=True)
+        rows = self.execute_prepared(PREVIOUS_CLOSES_BATCH, ([t.upper() for t in tickers],), fetch_all=True)
         
         # Convert to dict {ticker: previousClose}
         result: Dict[str, float] = {}
@@ -98,33 +141,7 @@ class QuoteRepository(BaseRepository):
             return {}
         
         # Batch query: lấy latest EOD data cho tất cả symbols trong 1 query
-        placeholders = ','.join(['%s'] * len(tickers))
-        query = f"""
-            SELECT 
-                s.stock_ticker AS ticker,
-                eod.close_price AS price,
-                eod.volume,
-                eod.pct_change AS change_percent,
-                eod.close_price AS previous_close,
-                eod.trading_date
-            FROM market_data_oltp.stocks AS s
-            LEFT JOIN LATERAL (
-                SELECT 
-                    close_price,
-                    volume,
-                    pct_change,
-                    trading_date
-                FROM market_data_oltp.stock_eod_prices
-                WHERE stock_id = s.stock_id
-                ORDER BY trading_date DESC
-                LIMIT 1
-            ) AS eod ON true
-            WHERE s.stock_ticker IN ({placeholders})
-                AND s.delisted IS FALSE
-                AND eod.close_price IS NOT NULL
-        """
-        
-        rows = self.execute_query(query, [t.upper() for t in tickers], fetch_all=True)
+        rows = self.execute_prepared(LATEST_EOD_BATCH, ([t.upper() for t in tickers],), fetch_all=True)
         
         # Convert to dict {ticker: {price, volume, changePercent, previousClose, tradingDate}}
         result: Dict[str, Dict] = {}
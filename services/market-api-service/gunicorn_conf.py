@@ -0,0 +1,39 @@
+"""
+Gunicorn settings for running the API with Uvicorn workers.
+
+Usage:
+    gunicorn main:app -c gunicorn_conf.py
+
+Worker count comes from WEB_CONCURRENCY (default 2 * cores + 1). Each worker
+keeps its own DB pool (see db/base_repo.py) plus a LISTEN connection; the pool
+size defaults to an even share of DB_MAX_CONNECTIONS (see config/settings.py).
+"""
+
+import multiprocessing
+import os
+
+from uvicorn.workers import UvicornWorker
+
+
+class LimitedUvicornWorker(UvicornWorker):
+    # Shed load with 503s past this many in-flight requests per worker rather
+    # than letting the accept queue grow without bound under bursts.
+    CONFIG_KWARGS = {
+        **UvicornWorker.CONFIG_KWARGS,
+        "limit_concurrency": int(os.getenv("UVICORN_LIMIT_CONCURRENCY", "200")),
+        "loop": "uvloop",
+        "http": "httptools",
+    }
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", 2 * multiprocessing.cpu_count() + 1))
+worker_class = "gunicorn_conf.LimitedUvicornWorker"
+worker_connections = 1000
+timeout = 60
+graceful_timeout = 30
+
+# Recycle workers periodically (Uvicorn's --limit-max-requests); jitter keeps
+# them from restarting all at once.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "10000"))
+max_requests_jitter = 500
@@ -1,8 +1,13 @@
 # SERVICE BOUNDARY: This service must NOT read Kafka or Redis Streams.
 # It can access Postgres and Redis Cache only.
 
-from fastapi import FastAPI, Request as FastAPIRequest
+import logging
+
+import orjson
+import psycopg2
+from fastapi import FastAPI, Request as FastAPIRequest, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from api.routers import (
     quote_router,
     financial_router,
@@ -20,7 +25,10 @@ from api.routers import (
     portfolio_router,
     auth_router,
 )
+from db.base_repo import db_connector
+from core.cache_invalidation import start_listener, stop_listener
 from db.portfolio_repo import PortfolioRepo
+from services.auth_service import close_oauth_client
 from config.settings import settings
 from shared.python.utils.logging_config import get_logger
 from shared.python.utils.env import validate_env
@@ -37,9 +45,31 @@ print(f"DEBUG SMTP: SERVER={settings.MAIL_SERVER}, PORT={settings.MAIL_PORT}, US
 app = FastAPI(
     title="Market Data API",
     description="Market and Financial Data API Service",
-    version="3.0.0"
+    version="3.0.0",
+    default_response_class=ORJSONResponse,
 )
 
+# Error bodies are built once; failure storms (e.g. DB down) should not pay
+# for per-request serialization or traceback formatting.
+DB_UNAVAILABLE_BODY = orjson.dumps({"detail": "Database unavailable"})
+INTERNAL_ERROR_BODY = orjson.dumps({"detail": "Internal server error"})
+
+# Registered before CORSMiddleware so CORS wraps it and these error responses
+# still carry CORS headers for browser clients.
+@app.middleware("http")
+async def handle_errors(request: FastAPIRequest, call_next):
+    """Turn unhandled endpoint errors into 503/500 JSON responses."""
+    try:
+        return await call_next(request)
+    except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+        logger.warning("%s %s failed, database unavailable: %s", request.method, request.url.path, e,
+                       exc_info=logger.isEnabledFor(logging.DEBUG))
+        return Response(DB_UNAVAILABLE_BODY, status_code=503, media_type="application/json")
+    except Exception as e:
+        logger.warning("%s %s failed: %r", request.method, request.url.path, e,
+                       exc_info=logger.isEnabledFor(logging.DEBUG))
+        return Response(INTERNAL_ERROR_BODY, status_code=500, media_type="application/json")
+
 # Enable CORS
 allowed_origins = [o.strip() for o in settings.ALLOWED_ORIGINS.split(",") if o.strip()]
 app.add_middleware(
@@ -53,6 +83,13 @@ app.add_middleware(
 @app.on_event("startup")
 async def startup_event():
     logger.info("Starting up...")
+    try:
+        # Open the shared DB pool up front so the first requests skip the handshake.
+        db_connector.create_pool()
+    except Exception as e:
+        logger.error(f"DB pool warm-up failed, will retry on first request: {e}")
+    # Purge cached financials whenever the ETL writes new statements.
+    start_listener()
     try:
         # Run DB Migrations
         # PortfolioRepo().migrate_read_only_column()
@@ -60,12 +97,18 @@ async def startup_event():
     except Exception as e:
         logger.error(f"Startup migration failed: {e}")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    stop_listener()
+    db_connector.close_pool()
+    await close_oauth_client()
+
 @app.middleware("http")
 async def log_requests(request: FastAPIRequest, call_next):
-    logger.info(f"Incoming Request: {request.method} {request.url}")
+    logger.info("Incoming Request: %s %s", request.method, request.url)
     auth = request.headers.get("Authorization")
     if auth:
-        logger.info(f"Authorization Header: {auth[:20]}...") # Log start of token
+        logger.info("Authorization Header: %s...", auth[:20]) # Log start of token
     else:
         logger.info("Authorization Header: MISSING")
     
@@ -109,5 +152,6 @@ async def health():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    # "auto" picks uvloop/httptools when installed (uvloop has no Windows build).
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True, loop="auto", http="auto")
 
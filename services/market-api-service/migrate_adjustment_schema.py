@@ -70,7 +70,7 @@ def migrate():
         logger.error(f"Migration failed: {e}")
         raise e
     finally:
-        conn.close()
+        repo.release_connection(conn)
 
 if __name__ == "__main__":
     migrate()
@@ -2,10 +2,14 @@
 Service to fetch EOD (End-of-Day) data from external APIs (Alpaca or yfinance)
 and insert into database when needed.
 """
+from concurrent.futures import ThreadPoolExecutor
+import threading
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Optional
 import requests
+from requests.adapters import HTTPAdapter
 import logging
+import orjson
 import pandas as pd
 import yfinance as yf
 from psycopg2.extras import execute_values
@@ -14,6 +18,16 @@ from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Alpaca bars are fetched one symbol per request (so one bad symbol cannot
+# fail the batch), fanned out over a few threads on a shared keep-alive session.
+ALPACA_MAX_WORKERS = 8
+_alpaca_session = requests.Session()
+_alpaca_session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=ALPACA_MAX_WORKERS))
+# (connect, read) seconds; an unreachable Alpaca should hand over to the
+# yfinance fallback quickly rather than hold the request for the full read timeout.
+ALPACA_TIMEOUT = (3, 10)
+_yf_download_lock = threading.Lock()
+
 
 class EODFetchService:
     """Service to fetch EOD data from external APIs and insert into DB"""
@@ -35,116 +49,139 @@ class EODFetchService:
     
     def _fetch_from_alpaca(self, symbols: List[str], target_date: date) -> Dict[str, Dict]:
         """Fetch EOD from Alpaca REST API"""
-        if not self.api_key or not self.secret_key:
+        if not self.api_key or not self.secret_key or not symbols:
             return {}
         
         result = {}
-        date_str = target_date.isoformat()
         
         try:
-            url = f"{self.base_url}/v2/stocks/bars"
-            
-            for symbol in symbols:
-                try:
-                    params = {
-                        "symbols": symbol,
-                        "start": date_str,
-                        "end": date_str,
-                        "timeframe": "1Day",
-                        "limit": 1,
-                    }
-                    
-                    response = requests.get(
-                        url,
-                        headers=self._get_alpaca_headers(),
-                        params=params,
-                        timeout=10
-                    )
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        bars = data.get("bars", {}).get(symbol, [])
-                        
-                        if bars and len(bars) > 0:
-                            bar = bars[0]
-                            result[symbol.upper()] = {
-                                "open": float(bar.get("o", 0)),
-                                "high": float(bar.get("h", 0)),
-                                "low": float(bar.get("l", 0)),
-                                "close": float(bar.get("c", 0)),
-                                "volume": int(bar.get("v", 0)),
-                                "date": target_date,
-                            }
-                            logger.info(f"[EODFetchService] Fetched from Alpaca: {symbol} on {date_str}")
-                except Exception as e:
-                    logger.warning(f"[EODFetchService] Alpaca fetch failed for {symbol}: {e}")
-                    continue
+            with ThreadPoolExecutor(max_workers=min(ALPACA_MAX_WORKERS, len(symbols))) as pool:
+                bars = pool.map(lambda symbol: self._fetch_alpaca_bar(symbol, target_date), symbols)
+                for symbol, bar in zip(symbols, bars):
+                    if bar:
+                        result[symbol.upper()] = bar
         except Exception as e:
             logger.warning(f"[EODFetchService] Alpaca API error: {e}")
         
         return result
     
+    def _fetch_alpaca_bar(self, symbol: str, target_date: date) -> Optional[Dict]:
+        """Fetch one symbol's daily bar from Alpaca; None if unavailable"""
+        date_str = target_date.isoformat()
+        try:
+            params = {
+                "symbols": symbol,
+                "start": date_str,
+                "end": date_str,
+                "timeframe": "1Day",
+                "limit": 1,
+            }
+            
+            response = _alpaca_session.get(
+                f"{self.base_url}/v2/stocks/bars",
+                headers=self._get_alpaca_headers(),
+                params=params,
+                timeout=ALPACA_TIMEOUT
+            )
+            
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                bars = data.get("bars", {}).get(symbol, [])
+                
+                if bars and len(bars) > 0:
+                    bar = bars[0]
+                    logger.info(f"[EODFetchService] Fetched from Alpaca: {symbol} on {date_str}")
+                    return {
+                        "open": float(bar.get("o", 0)),
+                        "high": float(bar.get("h", 0)),
+                        "low": float(bar.get("l", 0)),
+                        "close": float(bar.get("c", 0)),
+                        "volume": int(bar.get("v", 0)),
+                        "date": target_date,
+                    }
+        except Exception as e:
+            logger.warning(f"[EODFetchService] Alpaca fetch failed for {symbol}: {e}")
+        return None
+    
     def _fetch_from_yfinance(self, symbols: List[str], target_date: date) -> Dict[str, Dict]:
         """Fetch EOD from yfinance (Yahoo Finance)"""
         result = {}
+        tickers = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        if not tickers:
+            return result
         
         try:
             # yfinance needs date range (fetch a few days around target_date)
             start_date = target_date - timedelta(days=5)
             end_date = target_date + timedelta(days=1)
             
-            # Process each symbol individually for better reliability
-            for symbol in symbols:
-                try:
-                    # Download for single symbol
-                    ticker = yf.Ticker(symbol.upper())
-                    df = ticker.history(
-                        start=start_date.isoformat(),
-                        end=end_date.isoformat(),
-                        auto_adjust=False,
-                    )
-                    
-                    if df.empty:
+            # One batched download for every symbol instead of a request per
+            # symbol. yf.download keeps its results in module-level state, so
+            # concurrent API requests take turns.
+            with _yf_download_lock:
+                frames = yf.download(
+                    tickers,
+                    start=start_date.isoformat(),
+                    end=end_date.isoformat(),
+                    auto_adjust=False,
+                    group_by="ticker",
+                    threads=True,
+                    progress=False,
+                )
+        except Exception as e:
+            logger.error(f"[EODFetchService] yfinance API error: {e}", exc_info=True)
+            return result
+        
+        for symbol in tickers:
+            try:
+                if isinstance(frames.columns, pd.MultiIndex):
+                    if symbol not in frames.columns.get_level_values(0):
                         logger.warning(f"[EODFetchService] No yfinance data for {symbol} on {target_date}")
                         continue
-                    
-                    # Reset index to get Date as column
-                    df = df.reset_index()
-                    if "Date" not in df.columns and len(df.columns) > 0:
-                        df = df.rename(columns={df.columns[0]: "Date"})
-                    
-                    # Convert Date to date object
-                    df["Date"] = pd.to_datetime(df["Date"]).dt.date
-                    df = df.sort_values("Date")
-                    
-                    # Find row for target_date or closest before
-                    target_row = df[df["Date"] <= target_date]
-                    if target_row.empty:
-                        logger.warning(f"[EODFetchService] No data for {symbol} on or before {target_date}. Available dates: {df['Date'].tolist() if not df.empty else 'N/A'}")
-                        continue
-                    
-                    row = target_row.iloc[-1]  # Latest row <= target_date
-                    
-                    # Log if we're using a date different from target_date
-                    if row["Date"] < target_date:
-                        logger.warning(f"[EODFetchService] Using closest available date {row['Date']} for {symbol} (target was {target_date})")
-                    
-                    result[symbol.upper()] = {
-                        "open": float(row.get("Open", 0)),
-                        "high": float(row.get("High", 0)),
-                        "low": float(row.get("Low", 0)),
-                        "close": float(row.get("Close", 0)),
-                        "volume": int(row.get("Volume", 0)),
-                        "date": row["Date"],
-                    }
-                    logger.info(f"[EODFetchService] Fetched from yfinance: {symbol} on {row['Date']}")
-                    
-                except Exception as e:
-                    logger.warning(f"[EODFetchService] yfinance fetch failed for {symbol}: {e}", exc_info=True)
+                    df = frames[symbol]
+                else:
+                    df = frames
+                
+                # Days another symbol traded but this one did not come back as NaN rows
+                df = df.dropna(how="all")
+                if df.empty:
+                    logger.warning(f"[EODFetchService] No yfinance data for {symbol} on {target_date}")
                     continue
-                    
-        except Exception as e:
-            logger.error(f"[EODFetchService] yfinance API error: {e}", exc_info=True)
+                
+                # Reset index to get Date as column
+                df = df.reset_index()
+                if "Date" not in df.columns and len(df.columns) > 0:
+                    df = df.rename(columns={df.columns[0]: "Date"})
+                
+                # Convert Date to date object
+                df["Date"] = pd.to_datetime(df["Date"]).dt.date
+                df = df.sort_values("Date")
+                
+                # Find row for target_date or closest before
+                target_row = df[df["Date"] <= target_date]
+                if target_row.empty:
+                    logger.warning(f"[EODFetchService] No data for {symbol} on or before {target_date}. Available dates: {df['Date'].tolist() if not df.empty else 'N/A'}")
+                    continue
+                
+                row = target_row.iloc[-1]  # Latest row <= target_date
+                
+                # Log if we're using a date different from target_date
+                if row["Date"] < target_date:
+                    logger.warning(f"[EODFetchService] Using closest available date {row['Date']} for {symbol} (target was {target_date})")
+                
+                result[symbol] = {
+                    "open": float(row.get("Open", 0)),
+                    "high": float(row.get("High", 0)),
+                    "low": float(row.get("Low", 0)),
+                    "close": float(row.get("Close", 0)),
+                    "volume": int(row.get("Volume", 0)),
+                    "date": row["Date"],
+                }
+                logger.info(f"[EODFetchService] Fetched from yfinance: {symbol} on {row['Date']}")
+                
+            except Exception as e:
+                logger.warning(f"[EODFetchService] yfinance fetch failed for {symbol}: {e}", exc_info=True)
+                continue
         
         return result
     
@@ -187,33 +224,40 @@ class EODFetchService:
         
         conn = None
         try:
-            conn = repo._get_connection()
+            conn = repo.get_connection()
             cursor = conn.cursor()
             
+            # Resolve every stock_id and its latest stored close in one query
+            # instead of two round-trips per ticker.
+            cursor.execute(
+                """
+                SELECT s.stock_ticker, s.stock_id, prev.close_price
+                FROM market_data_oltp.stocks s
+                LEFT JOIN LATERAL (
+                    SELECT close_price
+                    FROM market_data_oltp.stock_eod_prices p
+                    WHERE p.stock_id = s.stock_id
+                    ORDER BY trading_date DESC
+                    LIMIT 1
+                ) prev ON TRUE
+                WHERE s.stock_ticker = ANY(%s)
+                """,
+                ([ticker.upper() for ticker in eod_data],),
+            )
+            stocks = {ticker: (stock_id, prev_close) for ticker, stock_id, prev_close in cursor.fetchall()}
+            
             records = []
             for ticker, data in eod_data.items():
-                # Get stock_id
-                stock_id_query = "SELECT stock_id FROM market_data_oltp.stocks WHERE stock_ticker = %s"
-                stock_result = repo.execute_query(stock_id_query, (ticker.upper(),), fetch_one=True)
-                
-                if not stock_result:
+                stock = stocks.get(ticker.upper())
+                if not stock:
                     logger.warning(f"[EODFetchService] Stock {ticker} not found in database")
                     continue
-                
-                stock_id = stock_result['stock_id'] if isinstance(stock_result, dict) else stock_result[0]
+                stock_id, prev_close = stock
                 
                 # Calculate pct_change (need previous close)
                 pct_change = None
-                prev_close_query = """
-                    SELECT close_price 
-                    FROM market_data_oltp.stock_eod_prices 
-                    WHERE stock_id = %s 
-                    ORDER BY trading_date DESC 
-                    LIMIT 1
-                """
-                prev_result = repo.execute_query(prev_close_query, (stock_id,), fetch_one=True)
-                if prev_result:
-                    prev_close = float(prev_result['close_price'] if isinstance(prev_result, dict) else prev_result[0])
+                if prev_close is not None:
+                    prev_close = float(prev_close)
                     if prev_close > 0:
                         pct_change = round(((data['close'] - prev_close) / prev_close) * 100, 2)
                 
@@ -254,8 +298,6 @@ class EODFetchService:
                 return len(records)
             
             cursor.close()
-            if conn:
-                conn.close()
             return 0
             
         except Exception as e:
@@ -263,4 +305,7 @@ class EODFetchService:
             if conn:
                 conn.rollback()
             raise
+        finally:
+            if conn:
+                repo.release_connection(conn)
 
@@ -14,6 +14,16 @@ logger = logging.getLogger(__name__)
 
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
+# Shared keep-alive client for OAuth provider lookups, so logins reuse open
+# TLS connections to Google/Facebook instead of handshaking every time.
+_oauth_client = httpx.AsyncClient(
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=8),
+)
+
+
+async def close_oauth_client():
+    await _oauth_client.aclose()
+
 # Email Config
 # Email Config
 try:
@@ -235,18 +245,16 @@ class AuthService:
         }
 
     async def verify_google_token(self, token: str) -> Dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"https://www.googleapis.com/oauth2/v3/userinfo?access_token={token}")
-            if response.status_code != 200:
-                raise HTTPException(status_code=400, detail="Invalid Google token")
-            return response.json()
+        response = await _oauth_client.get(f"https://www.googleapis.com/oauth2/v3/userinfo?access_token={token}")
+        if response.status_code != 200:
+            raise HTTPException(status_code=400, detail="Invalid Google token")
+        return response.json()
 
     async def verify_facebook_token(self, token: str) -> Dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"https://graph.facebook.com/me?fields=id,name,email,picture&access_token={token}")
-            if response.status_code != 200:
-                raise HTTPException(status_code=400, detail="Invalid Facebook token")
-            return response.json()
+        response = await _oauth_client.get(f"https://graph.facebook.com/me?fields=id,name,email,picture&access_token={token}")
+        if response.status_code != 200:
+            raise HTTPException(status_code=400, detail="Invalid Facebook token")
+        return response.json()
 
     async def login_with_oauth(self, provider: str, token: str) -> Dict[str, Any]:
         if provider == "google":
@@ -1,72 +1,84 @@
-import psycopg2
+import itertools
+from typing import Iterator
+
+import orjson
 from psycopg2.extras import RealDictCursor
-from config.settings import settings
+from db.base_repo import db_connector
+from core.redis_client import RedisClient
+from core.cache_keys import COMPANIES_LIST_KEY, COMPANIES_TTL
 import logging
 
 logger = logging.getLogger(__name__)
 
+COMPANIES_QUERY = """
+    SELECT DISTINCT
+        company_id as ticker,
+        company_name as name,
+        sector,
+        exchange
+    FROM financial_oltp.company
+    ORDER BY company_name
+"""
+
 class CompaniesService:
     """Service for companies data"""
 
-    def get_companies(self):
-        """Retrieve list of all companies available in the database"""
+    def get_companies(self) -> Iterator[bytes]:
+        """
+        Retrieve list of all companies available in the database.
+
+        Returns the JSON body of /api/companies as byte chunks. Rows come from
+        a server-side cursor and are encoded as they arrive, so the first bytes
+        go out before the whole list is read. The assembled body is cached.
+        """
+        redis = RedisClient()
+        cached = redis.get_raw(COMPANIES_LIST_KEY)
+        if cached:
+            return iter((cached,))
+
+        logger.info("Streaming list of companies from database")
+        # Borrow the connection and run the query up front so DB errors still
+        # surface as a 500 before the response starts.
+        conn = db_connector.get_connection()
         try:
-            logger.info("Fetching list of companies from database")
-
-            DB_CONFIG = {
-                "host": settings.DB_HOST,
-                "port": settings.DB_PORT,
-                "dbname": settings.DB_NAME,
-                "user": settings.DB_USER,
-                "password": settings.DB_PASSWORD
-            }
-
-            conn = psycopg2.connect(**DB_CONFIG)
-            cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-            query = """
-                SELECT DISTINCT
-                    company_id as ticker,
-                    company_name as name,
-                    sector,
-                    exchange
-                FROM financial_oltp.company
-                ORDER BY company_name
-            """
-
-            cursor.execute(query)
-            companies = cursor.fetchall()
-
-            cursor.close()
-            conn.close()
-
-            logger.info(f"Found {len(companies)} companies in database")
-
-            return {
-                "count": len(companies),
-                "companies": companies
-            }
-
+            cursor = conn.cursor(name="companies_stream", cursor_factory=RealDictCursor)
+            cursor.itersize = 1000
+            cursor.execute(COMPANIES_QUERY)
         except Exception as e:
+            conn.rollback()
+            db_connector.return_connection(conn)
             logger.error(f"Error fetching companies: {e}")
             raise
+        # Start the generator so its finally (which returns the connection)
+        # runs even if the client goes away before the body is read.
+        stream = self._stream_companies(conn, cursor, redis)
+        return itertools.chain((next(stream),), stream)
+
+    def _stream_companies(self, conn, cursor, redis: RedisClient) -> Iterator[bytes]:
+        chunks = [b'{"success":true,"data":[']
+        count = 0
+        try:
+            yield chunks[0]
+            for row in cursor:
+                chunk = orjson.dumps(row) if count == 0 else b"," + orjson.dumps(row)
+                chunks.append(chunk)
+                count += 1
+                yield chunk
+            chunks.append(b"]}")
+            yield chunks[-1]
+            cursor.close()
+            conn.commit()
+        finally:
+            db_connector.return_connection(conn)
+
+        logger.info(f"Streamed {count} companies from database")
+        redis.set_raw(COMPANIES_LIST_KEY, b"".join(chunks), ttl=COMPANIES_TTL)
 
     def search_companies(self, query_str: str):
         """Search companies by ticker or name"""
         try:
             logger.info(f"Searching companies with query: {query_str}")
 
-            DB_CONFIG = {
-                "host": settings.DB_HOST,
-                "port": settings.DB_PORT,
-                "dbname": settings.DB_NAME,
-                "user": settings.DB_USER,
-                "password": settings.DB_PASSWORD
-            }
-
-            conn = psycopg2.connect(**DB_CONFIG)
-            cursor = conn.cursor(cursor_factory=RealDictCursor)
-
             query = """
                 SELECT DISTINCT
                     company_id as ticker,
@@ -82,11 +94,10 @@ class CompaniesService:
             """
             
             search_pattern = f"%{query_str}%"
-            cursor.execute(query, (search_pattern, search_pattern))
-            companies = cursor.fetchall()
-
-            cursor.close()
-            conn.close()
+            with db_connector.connection() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                    cursor.execute(query, (search_pattern, search_pattern))
+                    companies = cursor.fetchall()
 
             # Enrich with real-time price if possible (simplified here, just return basic info)
             # In a real scenario, you might join with quotes table or fetch price separately.
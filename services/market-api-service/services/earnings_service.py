@@ -1,4 +1,4 @@
-from data_loaders.data_loader import StockDataLoader
+from data_loaders.data_loader import get_loader
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,7 +13,7 @@ class EarningsService:
         """Get earnings data"""
         try:
             logger.info(f"Fetching earnings for {self.ticker}")
-            loader = StockDataLoader(self.ticker.upper())
+            loader = get_loader(self.ticker)
             data = loader.get_earnings()
             return data
         except Exception as e:
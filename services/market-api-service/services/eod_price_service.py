@@ -24,17 +24,12 @@ class EODPriceService:
         """
         logger.info(f"[EODPriceService] get_price_history: ticker={ticker}, period={period}")
         
-        # Resolve ticker to stock_id using market_data_oltp.stocks
-        stock_id = self.repo.get_stock_id(ticker)
-        if not stock_id:
-            logger.warning(f"[EODPriceService] Stock ticker {ticker} not found in market_data_oltp.stocks")
+        # Ticker lookup and price history from stock_eod_prices in one query
+        rows = self.repo.get_price_history(ticker, period)
+        if not rows:
+            logger.warning(f"[EODPriceService] No EOD prices for {ticker} (unknown ticker or no history)")
             return []
         
-        logger.info(f"[EODPriceService] Resolved {ticker} to stock_id={stock_id}")
-        
-        # Get price history from stock_eod_prices
-        rows = self.repo.get_price_history(stock_id, period)
-        
         # Transform to response format (full OHLCV)
         price_history = []
         for row in rows:
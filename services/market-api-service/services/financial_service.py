@@ -1,96 +1,210 @@
 from db.financial_repo import FinancialRepository
-from core.redis_client import RedisClient
-from collections import defaultdict
-from typing import List, Dict, Any
+from core.redis_client import RedisClient, dumps
+from core.cache_keys import FINANCIALS_TTL, financials_key, financials_pattern
+from cachetools import TTLCache
+from concurrent.futures import Future
+from typing import Callable, Dict
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# Per-process L1 in front of Redis for hot tickers. Handlers run in the
+# threadpool, so access goes through a lock.
+_local_cache = TTLCache(maxsize=512, ttl=300)
+_local_cache_lock = threading.Lock()
+
+# Cache misses being rebuilt in this process, keyed by cache key, so
+# concurrent requests for the same key share one DB query.
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+# Cross-worker rebuild lock: followers poll Redis for the leader's result.
+REBUILD_LOCK_TTL = 10
+REBUILD_POLL_SECONDS = 0.05
+
+VIEW_MAPPING = {
+    "IS": "financial_oltp.vw_income_statement_recent",
+    "BS": "financial_oltp.vw_balance_sheet_recent",
+    "CF": "financial_oltp.vw_cashflow_statement_recent"
+}
+
+
+def _single_flight(key: str, load: Callable[[], tuple]) -> tuple:
+    """Run load() once per key at a time; concurrent callers get its result."""
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = Future()
+    if not leader:
+        return future.result()
+    try:
+        future.set_result(load())
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+    return future.result()
+
+
+def invalidate_financials(company: str):
+    """Drop every cached statement for company (this process's L1 and Redis)."""
+    company = company.upper()
+    with _local_cache_lock:
+        for key in [k for k in _local_cache if k[0] == company]:
+            _local_cache.pop(key, None)
+    deleted = RedisClient().delete_pattern(financials_pattern(company))
+    logger.info(f"[FinancialService] Invalidated financials cache for {company} ({deleted} Redis keys)")
+
 class FinancialService:
     def __init__(self):
         self.repo = FinancialRepository()
         self.redis = RedisClient()
 
-    def get_financials(self, company: str, statement_type: str, period_type: str):
+    def get_financials_json(self, company: str, statement_type: str, period_type: str) -> bytes:
+        """
+        Return the financials payload as serialized JSON.
+
+        Redis stores the encoded bytes, so a cache hit is handed back as-is
+        without being decoded and re-encoded.
+        """
         logger.info(f"[FinancialService] get_financials called: company={company}, statement_type={statement_type}, period_type={period_type}")
         
-        # Check cache
-        cache_key = f"bctc:{company}:{statement_type}:{period_type}"
-        cached = self.redis.get(cache_key)
+        # Check the in-process cache, then Redis
+        local_key = (company, statement_type, period_type)
+        with _local_cache_lock:
+            cached = _local_cache.get(local_key)
+        if cached:
+            return cached
+
+        cache_key = financials_key(company, statement_type, period_type)
+        cached = self.redis.get_raw(cache_key)
         if cached:
             logger.info(f"Cache hit for {cache_key}")
+            with _local_cache_lock:
+                _local_cache[local_key] = cached
             return cached
 
         # Map statement type to view name
-        view_mapping = {
-            "IS": "financial_oltp.vw_income_statement_recent",
-            "BS": "financial_oltp.vw_balance_sheet_recent",
-            "CF": "financial_oltp.vw_cashflow_statement_recent"
-        }
-        view_name = view_mapping.get(statement_type)
+        view_name = VIEW_MAPPING.get(statement_type)
         if not view_name:
             raise ValueError(f"Invalid statement type: {statement_type}")
 
+        payload, cacheable = _single_flight(
+            cache_key,
+            lambda: self._rebuild(cache_key, company, statement_type, period_type, view_name),
+        )
+        if cacheable:
+            with _local_cache_lock:
+                _local_cache[local_key] = payload
+        return payload
+
+    def _rebuild(self, cache_key: str, company: str, statement_type: str, period_type: str, view_name: str):
+        """
+        Build the payload on a cache miss, at most once across workers.
+
+        Returns (payload, cacheable). Another worker holding the rebuild lock
+        is waited on until its result lands in Redis or the lock goes away.
+        """
+        lock_key = f"lock:{cache_key}"
+        deadline = time.monotonic() + REBUILD_LOCK_TTL
+        locked = self.redis.acquire_lock(lock_key, ttl=REBUILD_LOCK_TTL)
+        while not locked and time.monotonic() < deadline:
+            time.sleep(REBUILD_POLL_SECONDS)
+            cached = self.redis.get_raw(cache_key)
+            if cached:
+                return cached, True
+            locked = self.redis.acquire_lock(lock_key, ttl=REBUILD_LOCK_TTL)
+
+        try:
+            payload, cacheable = self._build_payload(company, statement_type, period_type, view_name)
+            if cacheable:
+                self.redis.set_raw(cache_key, payload, ttl=FINANCIALS_TTL)
+            return payload, cacheable
+        finally:
+            if locked:
+                self.redis.delete(lock_key)
+
+    def _build_payload(self, company: str, statement_type: str, period_type: str, view_name: str):
+        """Query and serialize one statement. Returns (payload, cacheable)."""
         # Query view first
-        rows = self.repo.get_financials(company, view_name)
+        rows = self.repo.get_financials(company, view_name, period_type)
         
         # If view returns empty, try querying raw tables directly (fallback)
         if not rows:
             logger.warning(f"[FinancialService] View {view_name} returned no rows for {company}, trying fallback query")
-            rows = self.repo.get_financials_from_tables(company, statement_type)
+            rows = self.repo.get_financials_from_tables(company, statement_type, period_type)
         
         # If still no rows, return empty structure instead of None
         if not rows:
             logger.warning(f"[FinancialService] No financial data found for company={company}, statement_type={statement_type}")
-            return {
+            return dumps({
                 "company": company,
                 "type": statement_type,
                 "period": period_type,
                 "periods": [],
                 "data": {}
-            }
+            }), False
             
-        result = self._transform_data(rows, company, statement_type, period_type)
-        
-        # Cache result (even if empty)
-        self.redis.set(cache_key, result)
-        
-        logger.info(f"[FinancialService] Returning result with {len(result.get('periods', []))} periods")
-        return result
-
-    def _transform_data(self, rows: List[Dict[str, Any]], company: str, statement_type: str, period_type: str) -> Dict[str, Any]:
-        # Reuse transformation logic from original server.py
-        data_dict = defaultdict(dict)
-        periods_set = set()
-        
-        for row in rows:
-            item_name = row['item_name']
-            item_value = float(row['item_value']) if row['item_value'] is not None else 0
-            fiscal_year = row['fiscal_year']
-            fiscal_quarter = row['fiscal_quarter']
-            
-            if period_type == "annual":
-                period_key = str(fiscal_year)
-            else:
-                period_key = f"{fiscal_year}-{fiscal_quarter}"
-            
-            data_dict[item_name][period_key] = item_value
-            periods_set.add(period_key)
-        
-        if period_type == "annual":
-            periods_sorted = sorted(list(periods_set), key=lambda x: int(x), reverse=True)
-        else:
-            def sort_key(period_str):
-                year_str, quarter_str = period_str.split('-')
-                year = int(year_str)
-                quarter_num = int(quarter_str[1])
-                return (year, quarter_num)
-            periods_sorted = sorted(list(periods_set), key=sort_key, reverse=True)
-        
-        return {
+        # Rows arrive already pivoted and period-sorted from SQL.
+        result = {
             "company": company,
             "type": statement_type,
             "period": period_type,
-            "periods": periods_sorted[:10],
-            "data": dict(data_dict)
+            "periods": rows[0]['periods'][:10],
+            "data": {row['item_name']: row['period_values'] for row in rows},
         }
+        
+        payload = dumps(result)
+        
+        logger.info(f"[FinancialService] Returning result with {len(result['periods'])} periods")
+        return payload, True
+
+    def get_financials_bundle_json(self, company: str, period_type: str) -> bytes:
+        """
+        Return IS, BS and CF for one company as {"company", "period", "IS", "BS", "CF"}.
+
+        Reads all three cache entries with one MGET and writes any rebuilt
+        ones back with one pipelined SETEX. The cached statement bytes are
+        spliced into the response as-is.
+        """
+        statement_types = list(VIEW_MAPPING)
+        local_keys = [(company, t, period_type) for t in statement_types]
+        payloads = {}
+        with _local_cache_lock:
+            for statement_type, local_key in zip(statement_types, local_keys):
+                cached = _local_cache.get(local_key)
+                if cached:
+                    payloads[statement_type] = cached
+
+        missing = [t for t in statement_types if t not in payloads]
+        cache_keys = {t: financials_key(company, t, period_type) for t in missing}
+        for statement_type, cached in zip(missing, self.redis.get_raw_many([cache_keys[t] for t in missing])):
+            if cached:
+                payloads[statement_type] = cached
+
+        to_cache = {}
+        uncacheable = set()
+        for statement_type in statement_types:
+            if statement_type in payloads:
+                continue
+            payload, cacheable = self._build_payload(company, statement_type, period_type, VIEW_MAPPING[statement_type])
+            payloads[statement_type] = payload
+            if cacheable:
+                to_cache[cache_keys[statement_type]] = payload
+            else:
+                uncacheable.add(statement_type)
+        self.redis.set_raw_many(to_cache, ttl=FINANCIALS_TTL)
+
+        with _local_cache_lock:
+            for statement_type, local_key in zip(statement_types, local_keys):
+                if statement_type in missing and statement_type not in uncacheable:
+                    _local_cache[local_key] = payloads[statement_type]
+
+        header = dumps({"company": company, "period": period_type})[:-1]
+        body = b",".join(b'"%s":%s' % (t.encode(), payloads[t]) for t in statement_types)
+        return header + b"," + body + b"}"
@@ -2,7 +2,6 @@ import logging
 from db.market_repo import MarketMetadataRepository
 from core.redis_client import RedisClient
 from typing import List
-import json
 
 logger = logging.getLogger(__name__)
 
@@ -52,8 +51,8 @@ class MarketMetadataService:
           cached = self.redis_client.get(cache_key)
           if cached:
               logger.info(f"[MarketMetadataService] Cache hit for volumes: {len(normalized_symbols)} symbols")
-              # get() already returns parsed JSON (dict), no need to json.loads
-              return cached if isinstance(cached, dict) else json.loads(cached)
+              # get() hands back the orjson-decoded dict
+              return cached
       except Exception as e:
           logger.warning(f"[MarketMetadataService] Redis cache read error: {e}")
       
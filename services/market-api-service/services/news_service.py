@@ -1,4 +1,4 @@
-from data_loaders.data_loader import StockDataLoader
+from data_loaders.data_loader import get_loader
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,7 +10,7 @@ class NewsService:
         """Get company news for a given ticker"""
         try:
             logger.info(f"Fetching news for {ticker}, limit: {limit}")
-            loader = StockDataLoader(ticker.upper())
+            loader = get_loader(ticker)
             data = loader.get_news(limit)
             return data
         except Exception as e:
@@ -1,18 +1,48 @@
-from data_loaders.data_loader import StockDataLoader
+from data_loaders.data_loader import get_loader
+from core.redis_client import RedisClient
+from core.cache_keys import PROFILE_PATTERN, PROFILE_TTL, profile_key
+from cachetools import TTLCache
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Per-process L1 in front of Redis: a hit skips the round-trip and the
+# JSON decode. The TTL bounds staleness in workers that did not serve the
+# refresh that invalidated a ticker.
+_local_cache = TTLCache(maxsize=512, ttl=300)
+_local_cache_lock = threading.Lock()
+
+
+def invalidate_profiles():
+    """Drop every cached profile from this process's L1 and Redis."""
+    with _local_cache_lock:
+        _local_cache.clear()
+    RedisClient().delete_pattern(PROFILE_PATTERN)
+
+
 class ProfileService:
     """Service for company profile data"""
 
     def get_profile(self, ticker: str):
         """Get company profile for a given ticker"""
         try:
-            logger.info(f"Fetching profile for {ticker}")
-            loader = StockDataLoader(ticker.upper())
-            data = loader.get_company_profile()
-            logger.info(f"[ProfileService] Data for {ticker}: keys={list(data.keys())}, pe={data.get('pe')}, eps={data.get('eps')}")
+            with _local_cache_lock:
+                cached = _local_cache.get(ticker)
+            if cached:
+                return cached
+
+            redis = RedisClient()
+            data = redis.get(profile_key(ticker))
+            if not data:
+                logger.info(f"Fetching profile for {ticker}")
+                loader = get_loader(ticker)
+                data = loader.get_company_profile()
+                logger.info(f"[ProfileService] Data for {ticker}: keys={list(data.keys())}, pe={data.get('pe')}, eps={data.get('eps')}")
+                redis.set(profile_key(ticker), data, ttl=PROFILE_TTL)
+
+            with _local_cache_lock:
+                _local_cache[ticker] = data
             return data
         except Exception as e:
             logger.error(f"Error fetching profile: {e}")
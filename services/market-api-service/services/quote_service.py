@@ -1,7 +1,9 @@
 from db.quote_repo import QuoteRepository
-from data_loaders.data_loader import StockDataLoader  # Keep data loader for fallback
+from data_loaders.data_loader import get_loader  # Keep data loader for fallback
 from services.alpaca_eod_service import EODFetchService
 from utils.market_hours import get_latest_trading_date
+from core.redis_client import RedisClient
+from core.cache_keys import QUOTE_TTL, quote_key
 from typing import List, Dict
 from datetime import date, datetime
 import logging
@@ -14,28 +16,32 @@ class QuoteService:
         self.eod_fetch_service = EODFetchService()
 
     def get_quote(self, ticker: str):
+        redis = RedisClient()
+        cached = redis.get(quote_key(ticker))
+        if cached:
+            return cached
+        quote = self._build_quote(ticker)
+        redis.set(quote_key(ticker), quote, ttl=QUOTE_TTL)
+        return quote
+
+    def _build_quote(self, ticker: str):
         try:
-            stock_id = self.repo.get_stock_id(ticker)
-            if not stock_id:
-                # Fallback
+            # Latest bar plus the one before it, resolved in a single query.
+            rows = self.repo.get_latest_prices(ticker)
+            if not rows:
+                # Fallback (unknown ticker or no EOD history yet)
                 return self._get_fallback_quote(ticker)
 
-            latest = self.repo.get_latest_price(stock_id)
-            if not latest:
-                return self._get_fallback_quote(ticker)
+            latest = rows[0]
+            prior = rows[1] if len(rows) > 1 else None
 
-            # Fix: get_previous_close fetches the LATEST close, which creates 0 change if we overlap.
-            # Ideally we should fetch the record before this one.
-            # But for now, let's trust the 'change' or 'percent_change' in the DB record if available,
-            # or infer it.
-            
             curr_price = float(latest['current_price'])
             percent_change = float(latest['percent_change'] or 0)
             
             # Get profile data for additional fields (Beta, Growth, etc.)
             try:
                 # Use data loader to get profile data (csv based)
-                loader = StockDataLoader(ticker.upper())
+                loader = get_loader(ticker)
                 profile_data = loader.get_company_profile()
             except Exception as e:
                 logger.warning(f"Could not load profile data for {ticker}: {e}")
@@ -61,8 +67,11 @@ class QuoteService:
                  # Last resort fallback if CSV missing: calculate from price if EPS known, or leave 0
                  pass
 
-            # Calculate change if needed (same logic as before)
-            if percent_change != 0:
+            # Prefer the stored previous close; infer it from pct_change otherwise.
+            if prior and prior['current_price'] is not None:
+                previous_close = float(prior['current_price'])
+                change = curr_price - previous_close
+            elif percent_change != 0:
                 prev_close_inferred = curr_price / (1 + percent_change / 100)
                 change = curr_price - prev_close_inferred
                 previous_close = prev_close_inferred
@@ -198,7 +207,7 @@ class QuoteService:
         return result
 
     def _get_fallback_quote(self, ticker: str):
-        temp_loader = StockDataLoader(ticker.upper())
+        temp_loader = get_loader(ticker)
         quote = temp_loader.get_quote()
         
         # Also enrich fallback with profile data
@@ -1,4 +1,7 @@
-from data_loaders.data_loader import StockDataLoader
+from data_loaders.data_loader import get_loader
+from core.redis_client import RedisClient
+from core.cache_keys import QUOTE_PATTERN
+from services.profile_service import invalidate_profiles
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,8 +16,13 @@ class RefreshService:
         """Refresh data from Finnhub API"""
         try:
             logger.info("Refreshing data from Finnhub API...")
-            loader = StockDataLoader(self.ticker.upper())
+            loader = get_loader(self.ticker)
             success = loader.refresh_data()
+            if success:
+                # A refresh can touch any ticker, so drop every cached
+                # profile and quote rather than just self.ticker's.
+                invalidate_profiles()
+                RedisClient().delete_pattern(QUOTE_PATTERN)
             return success
         except Exception as e:
             logger.error(f"Error refreshing data: {e}")
@@ -3,6 +3,7 @@
 
 import websocket
 import json
+import orjson
 import threading
 import time
 import sys
@@ -22,6 +23,12 @@ class AlpacaWebSocketClient:
         self.ws = None
         self.is_authenticated = False
         self.should_run = True
+        # Per-message dispatch on the Alpaca "T" field; data messages are the
+        # hot path, so they resolve with one dict probe.
+        self._handlers = {
+            't': self.handle_trade,
+            'b': self.handle_bar,
+        }
         
         # Initialize Kafka Producer
         try:
@@ -50,13 +57,17 @@ class AlpacaWebSocketClient:
 
     def on_message(self, ws, message):
         try:
-            data_list = json.loads(message)
+            data_list = orjson.loads(message)
             if not isinstance(data_list, list): 
                 return
 
+            handlers = self._handlers
             for data in data_list:
                 msg_type = data.get('T')
-                if msg_type == 'success' and data.get('msg') == 'authenticated':
+                handler = handlers.get(msg_type)
+                if handler is not None:
+                    handler(data)
+                elif msg_type == 'success' and data.get('msg') == 'authenticated':
                     self.is_authenticated = True
                     subscribe_message = {
                         "action": "subscribe",
@@ -65,10 +76,6 @@ class AlpacaWebSocketClient:
                     }
                     ws.send(json.dumps(subscribe_message))
                     logger.info(f"Subscribed to trades and bars for {settings.SUBSCRIBE_SYMBOLS}")
-                elif msg_type == 't':
-                    self.handle_trade(data)
-                elif msg_type == 'b':
-                    self.handle_bar(data)
         except Exception as e:
             logger.error(f"Error processing message: {e}")
 
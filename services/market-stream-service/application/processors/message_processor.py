@@ -7,7 +7,7 @@ Processes messages from Kafka and writes to PostgreSQL
 """
 
 from db.writer import DatabaseWriter
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Tuple
 
 # Import shared Kafka topic constants
 import sys
@@ -36,7 +36,7 @@ class MessageProcessor:
             
             # Write to stock_trades_realtime table
             self.db_writer.write_trade(symbol, price, size, timestamp)
-            logger.info(f"[Processor] Processed trade for {symbol}: price={price}, size={size}")
+            logger.debug(f"[Processor] Processed trade for {symbol}: price={price}, size={size}")
         except Exception as e:
             logger.error(f"Error processing trade: {e}")
     
@@ -53,7 +53,7 @@ class MessageProcessor:
             
             # Write to stock_bars_staging table
             self.db_writer.write_bar(symbol, open_price, high, low, close, volume, timestamp)
-            logger.info(f"[Processor] Processed bar for {symbol}: close={close}, volume={volume}")
+            logger.debug(f"[Processor] Processed bar for {symbol}: close={close}, volume={volume}")
         except Exception as e:
             logger.error(f"Error processing bar: {e}")
     
@@ -66,3 +66,42 @@ class MessageProcessor:
         else:
             logger.warning(f"Unknown topic: {topic}")
 
+
+    def process_batch(self, messages: Iterable[Tuple[str, Dict[str, Any]]]):
+        """
+        Write a batch of (topic, value) messages: all trades in one statement
+        and all bars in another.
+
+        Raises DatabaseWriteError when either write fails, so the caller does
+        not acknowledge the batch; its `transient` flag says whether the same
+        batch may succeed on retry. Rewriting a batch is safe: trades already
+        stored are skipped and bars are upserted.
+        """
+        trades = []
+        bars = []
+        for topic, message in messages:
+            if topic == STOCK_TRADES_TOPIC:
+                trades.append((
+                    message.get('symbol'),
+                    message.get('price'),
+                    message.get('size'),
+                    message.get('timestamp'),
+                ))
+            elif topic == STOCK_BARS_TOPIC:
+                bars.append((
+                    message.get('symbol'),
+                    message.get('open'),
+                    message.get('high'),
+                    message.get('low'),
+                    message.get('close'),
+                    message.get('volume'),
+                    message.get('timestamp'),
+                ))
+            else:
+                logger.warning(f"Unknown topic: {topic}")
+
+        if trades:
+            self.db_writer.write_trades(trades)
+        if bars:
+            self.db_writer.write_bars(bars)
+        logger.debug(f"[Processor] Processed batch: {len(trades)} trades, {len(bars)} bars")
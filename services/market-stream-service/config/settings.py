@@ -16,6 +16,10 @@ class Settings(BaseSettings):
     DB_NAME: str = load_env("DB_NAME", "Web_quan_li_danh_muc")
     DB_USER: str = load_env("DB_USER", "postgres")
     DB_PASSWORD: str
+    # Realtime writer: rows per multi-row INSERT, and the longest a consumed
+    # message may wait for its batch to fill before it is written anyway.
+    DB_INSERT_BATCH_SIZE: int = int(load_env("DB_INSERT_BATCH_SIZE", "1000"))
+    DB_FLUSH_INTERVAL_SECONDS: float = float(load_env("DB_FLUSH_INTERVAL_SECONDS", "1.0"))
 
     # Redis
     REDIS_HOST: str = load_env("REDIS_HOST", "redis")
@@ -23,7 +27,6 @@ class Settings(BaseSettings):
 
     # Kafka
     KAFKA_BOOTSTRAP_SERVERS: str = load_env("KAFKA_BOOTSTRAP_SERVERS", "kafka:9092")
-    KAFKA_ENABLE_AUTO_COMMIT: bool = load_env("KAFKA_ENABLE_AUTO_COMMIT", "false").lower() == "true"
 
     # API Keys
     ALPHA_VANTAGE_API_KEY: str = load_env("ALPHA_VANTAGE_API_KEY", "demo")
@@ -6,10 +6,14 @@ Database Writer
 Writes processed messages to PostgreSQL
 """
 
+import psycopg2
 from psycopg2.extras import execute_values
+from psycopg2.pool import PoolError
 from config.settings import settings
-from datetime import datetime
-from dateutil import parser as date_parser
+from typing import Any, Dict, Optional, Sequence, Set, Tuple
+import calendar
+import math
+import re
 import sys
 from pathlib import Path
 
@@ -22,6 +26,109 @@ from shared.python.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Alpaca's websocket `t` field arrives as an RFC 3339 string
+# ("2025-01-27T15:41:00.123456789Z") or an integer nanosecond epoch. Both are
+# bound as text and converted by Postgres, instead of building a Python
+# datetime per row. _raw_timestamp screens values with ASCII-only regexes
+# (plus a day-of-month check), binding NULL for anything Postgres could not
+# parse so that one bad row falls back to now() instead of failing the whole
+# statement.
+_EPOCH_NS = re.compile(r"[0-9]{1,19}", re.ASCII)
+_RFC3339 = re.compile(
+    r"(?P<year>(?!0000)[0-9]{4})-(?P<month>0[1-9]|1[0-2])-(?P<day>0[1-9]|[12][0-9]|3[01])"
+    r"[Tt ]([01][0-9]|2[0-3]):[0-5][0-9]:[0-5][0-9](\.[0-9]+)?"
+    r"([Zz]|[+-]([01][0-9]|2[0-3]):?[0-5][0-9])",
+    re.ASCII,
+)
+
+# Connection-level failures that may clear up on their own; anything else
+# (bad data, constraint violations) fails the same way on every attempt.
+TRANSIENT_DB_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError, PoolError)
+
+
+class DatabaseWriteError(RuntimeError):
+    """A batch write failed and was rolled back."""
+
+    def __init__(self, message: str, transient: bool):
+        super().__init__(message)
+        self.transient = transient
+
+TS_FROM_RAW = (
+    "COALESCE(CASE WHEN v.ts_raw ~ '^[0-9]+$' THEN to_timestamp(v.ts_raw::numeric / 1e9)"
+    " ELSE v.ts_raw::timestamptz END, now())"
+)
+
+# Each trade's running volume is the stock's latest stored volume plus the
+# sizes of the batch's trades up to and including it (in arrival order).
+# Only rows that will really be inserted enter the running sum: repeats of a
+# (stock_id, ts) within the batch keep their first trade, and trades already
+# stored (e.g. redelivered by Kafka) are dropped before the window runs.
+TRADES_INSERT_SQL = """
+    WITH batch AS (
+        SELECT DISTINCT ON (v.stock_id, t.ts) v.seq, v.stock_id, t.ts, v.price, v.size
+        FROM (VALUES %s) AS v (seq, stock_id, ts_raw, price, size)
+        CROSS JOIN LATERAL (SELECT {ts} AS ts) t
+        ORDER BY v.stock_id, t.ts, v.seq
+    ),
+    new_trades AS (
+        SELECT b.*
+        FROM batch b
+        WHERE NOT EXISTS (
+            SELECT 1
+            FROM market_data_oltp.stock_trades_realtime s
+            WHERE s.stock_id = b.stock_id AND s.ts = b.ts
+        )
+    )
+    INSERT INTO market_data_oltp.stock_trades_realtime
+    (stock_id, ts, price, size, volume)
+    SELECT
+        n.stock_id, n.ts, n.price, n.size,
+        COALESCE(prev.volume, 0) + SUM(COALESCE(n.size, 0)) OVER (PARTITION BY n.stock_id ORDER BY n.seq)
+    FROM new_trades n
+    LEFT JOIN LATERAL (
+        SELECT s.volume
+        FROM market_data_oltp.stock_trades_realtime s
+        WHERE s.stock_id = n.stock_id
+        ORDER BY s.ts DESC, s.trade_id DESC
+        LIMIT 1
+    ) prev ON TRUE
+    ON CONFLICT (stock_id, ts) DO NOTHING
+""".format(ts=TS_FROM_RAW)
+# VALUES outside an INSERT target list needs explicit types for NULLs.
+TRADES_TEMPLATE = "(%s, %s, %s::text, %s::numeric, %s::numeric)"
+
+BARS_UPSERT_SQL = """
+    INSERT INTO market_data_oltp.stock_bars_staging
+    (stock_id, timeframe, ts, open_price, high_price, low_price, close_price, volume)
+    SELECT v.stock_id, '1m', {ts}, v.open_price, v.high_price, v.low_price, v.close_price, v.volume
+    FROM (VALUES %s) AS v (stock_id, ts_raw, open_price, high_price, low_price, close_price, volume)
+    ON CONFLICT (stock_id, ts, timeframe) DO UPDATE SET
+        open_price = EXCLUDED.open_price,
+        high_price = EXCLUDED.high_price,
+        low_price = EXCLUDED.low_price,
+        close_price = EXCLUDED.close_price,
+        volume = EXCLUDED.volume
+""".format(ts=TS_FROM_RAW)
+BARS_TEMPLATE = "(%s, %s::text, %s::numeric, %s::numeric, %s::numeric, %s::numeric, %s::bigint)"
+
+
+def _raw_timestamp(ts_raw: Any) -> Optional[str]:
+    """Return ts_raw as text TS_FROM_RAW can convert, or None to use now()."""
+    if isinstance(ts_raw, float) and math.isfinite(ts_raw):
+        ts_raw = int(ts_raw)
+    if isinstance(ts_raw, int) and not isinstance(ts_raw, bool):
+        ts_raw = str(ts_raw)
+    if isinstance(ts_raw, str):
+        if _EPOCH_NS.fullmatch(ts_raw):
+            return ts_raw
+        match = _RFC3339.fullmatch(ts_raw)
+        if match:
+            year, month, day = int(match["year"]), int(match["month"]), int(match["day"])
+            if day <= 28 or day <= calendar.monthrange(year, month)[1]:
+                return ts_raw
+    logger.warning("Unparseable timestamp %r; using now()", ts_raw)
+    return None
+
 
 class DatabaseWriter:
     def __init__(self):
@@ -33,6 +140,55 @@ class DatabaseWriter:
             "password": settings.DB_PASSWORD,
         }
         self._connector = PostgresConnector(self.db_config)
+        # ticker -> stock_id. Stocks are never re-keyed, so after warm-up a
+        # message needs no lookup query. Tickers created in the open
+        # transaction are tracked so a rollback can drop their ids.
+        self._stock_ids: Dict[str, int] = {}
+        self._created_tickers: Set[str] = set()
+        self._load_stock_ids()
+
+    def _load_stock_ids(self) -> None:
+        """Pre-warm the stock_id cache with every known ticker in one query."""
+        conn = self._get_connection()
+        if not conn:
+            return
+        try:
+            def _load() -> Dict[str, int]:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT stock_ticker, stock_id FROM market_data_oltp.stocks")
+                    return dict(cursor.fetchall())
+
+            stock_ids = safe_db_call(
+                _load,
+                context="load_stock_ids",
+                on_error=lambda exc: logger.warning("Could not pre-load stock ids: %s", exc),
+            )
+            conn.rollback()
+            if stock_ids:
+                self._stock_ids.update(stock_ids)
+                logger.info("Pre-loaded %s stock ids", len(stock_ids))
+        finally:
+            self._connector.return_connection(conn)
+
+    def _end_transaction(self, conn, committed: bool) -> None:
+        commit_error = None
+        if committed:
+            try:
+                conn.commit()
+            except TRANSIENT_DB_ERRORS as exc:
+                commit_error = exc
+            else:
+                self._created_tickers.clear()
+                return
+        # A dropped connection has nothing left to roll back.
+        if not conn.closed:
+            conn.rollback()
+        # Stocks inserted by the rolled-back transaction no longer exist.
+        for ticker in self._created_tickers:
+            self._stock_ids.pop(ticker, None)
+        self._created_tickers.clear()
+        if commit_error is not None:
+            raise DatabaseWriteError(f"Commit failed: {commit_error}", transient=True)
     
     def _get_connection(self):
         """Get database connection"""
@@ -42,33 +198,28 @@ class DatabaseWriter:
             on_error=lambda exc: logger.error("Failed to obtain DB connection: %s", exc),
         )
 
-    def _normalize_timestamp(self, ts_raw):
-        """
-        Normalize incoming Alpaca timestamp to Python datetime.
+    @staticmethod
+    def _has_symbol(row: Tuple) -> bool:
+        # A message without a symbol cannot be keyed to a stock; dropping it
+        # keeps it from failing the rest of its batch.
+        if row[0]:
+            return True
+        logger.warning("Skipping message without symbol: %r", row)
+        return False
 
-        Alpaca's websocket `t` field may be either:
-        - An ISO8601 string (e.g. "2025-01-27T15:41:00.123456789Z")
-        - An integer nanosecond epoch.
-
-        We handle both to avoid DB write failures while keeping nanosecond
-        precision when possible.
-        """
-        try:
-            if isinstance(ts_raw, str):
-                # Parse ISO8601 string
-                return date_parser.isoparse(ts_raw)
-            # Assume integer nanoseconds
-            return datetime.fromtimestamp(ts_raw / 1e9)
-        except Exception as exc:
-            logger.error("Failed to normalize timestamp %r: %s", ts_raw, exc)
-            # Fallback to "now" to avoid breaking the pipeline
-            return datetime.utcnow()
-    
     def _get_stock_id(self, ticker: str, cursor) -> int:
         """Get stock_id from ticker symbol"""
+        ticker = ticker.upper()
+        stock_id = self._stock_ids.get(ticker)
+        if stock_id is None:
+            stock_id = self._lookup_stock_id(ticker, cursor)
+            self._stock_ids[ticker] = stock_id
+        return stock_id
+
+    def _lookup_stock_id(self, ticker: str, cursor) -> int:
         cursor.execute(
             "SELECT stock_id FROM market_data_oltp.stocks WHERE stock_ticker = %s",
-            (ticker.upper(),)
+            (ticker,)
         )
         result = cursor.fetchone()
         if result:
@@ -76,123 +227,114 @@ class DatabaseWriter:
         # If not found, create stock entry (simplified - should use proper service)
         cursor.execute(
             "INSERT INTO market_data_oltp.stocks (stock_ticker) VALUES (%s) ON CONFLICT DO NOTHING RETURNING stock_id",
-            (ticker.upper(),)
+            (ticker,)
         )
         result = cursor.fetchone()
         if result:
+            self._created_tickers.add(ticker)
             return result[0]
         # Try again
         cursor.execute(
             "SELECT stock_id FROM market_data_oltp.stocks WHERE stock_ticker = %s",
-            (ticker.upper(),)
+            (ticker,)
         )
         return cursor.fetchone()[0]
     
     def write_trade(self, symbol: str, price: float, size: float, timestamp: int):
+        """Write a single trade; see write_trades."""
+        self.write_trades([(symbol, price, size, timestamp)])
+
+    def write_trades(self, trades: Sequence[Tuple[str, float, float, Any]]) -> bool:
         """
-        Write trade to stock_trades_realtime table with accumulated volume.
-        
-        Volume được cộng dồn: lấy volume từ record mới nhất của stock đó,
-        cộng với size của trade mới, rồi lưu vào cột volume.
+        Write (symbol, price, size, timestamp) trades to stock_trades_realtime
+        with accumulated volume, in one INSERT statement.
+
+        Volume được cộng dồn: mỗi trade lấy volume của record mới nhất của
+        stock đó, cộng với size của các trade trong batch tính đến trade đó.
+
+        Raises DatabaseWriteError when the write fails.
         """
+        trades = [trade for trade in trades if self._has_symbol(trade)]
+        if not trades:
+            return True
         conn = self._get_connection()
         if not conn:
-            return
+            raise DatabaseWriteError("No database connection for trades", transient=True)
         try:
-            def _write_trade() -> bool:
+            def _write_trades() -> bool:
                 with conn.cursor() as cursor:
-                    stock_id = self._get_stock_id(symbol, cursor)
-                    ts = self._normalize_timestamp(timestamp)
-                    
-                    # Lấy volume tích lũy từ record mới nhất của stock này
-                    cursor.execute(
-                        """
-                        SELECT COALESCE(volume, 0) 
-                        FROM market_data_oltp.stock_trades_realtime 
-                        WHERE stock_id = %s 
-                        ORDER BY ts DESC, trade_id DESC 
-                        LIMIT 1
-                        """,
-                        (stock_id,)
-                    )
-                    result = cursor.fetchone()
-                    previous_volume = float(result[0]) if result and result[0] is not None else 0.0
-                    
-                    # Cộng dồn: volume mới = volume cũ + size của trade mới
-                    accumulated_volume = previous_volume + size
-                    
-                    # Log để debug
-                    logger.info(
-                        f"[DB Writer] Writing trade for {symbol}: "
-                        f"size={size}, previous_volume={previous_volume}, "
-                        f"accumulated_volume={accumulated_volume}"
-                    )
-                    
-                    # Insert trade mới với volume tích lũy
-                    cursor.execute(
-                        """
-                        INSERT INTO market_data_oltp.stock_trades_realtime 
-                        (stock_id, ts, price, size, volume)
-                        VALUES (%s, %s, %s, %s, %s)
-                        ON CONFLICT (stock_id, ts) DO NOTHING
-                        """,
-                        (stock_id, ts, price, size, accumulated_volume),
-                    )
-                    
-                    logger.info(
-                        f"[DB Writer] ✅ Successfully inserted trade for {symbol} "
-                        f"with accumulated_volume={accumulated_volume}"
+                    rows = [
+                        (seq, self._get_stock_id(symbol, cursor), _raw_timestamp(timestamp), price, size)
+                        for seq, (symbol, price, size, timestamp) in enumerate(trades)
+                    ]
+                    execute_values(
+                        cursor,
+                        TRADES_INSERT_SQL,
+                        rows,
+                        template=TRADES_TEMPLATE,
+                        page_size=len(rows),
                     )
+                    logger.debug("[DB Writer] Inserted %s trades", len(rows))
                 return True
 
-            result = safe_db_call(
-                _write_trade,
-                context="write_trade",
-                on_error=lambda exc: logger.error(f"Error writing trade: {exc}"),
-            )
+            errors = []
+            result = safe_db_call(_write_trades, context="write_trades", on_error=errors.append)
+            self._end_transaction(conn, committed=result is not None)
             if result is None:
-                conn.rollback()
-                return
-            conn.commit()
+                raise DatabaseWriteError(
+                    f"Error writing {len(trades)} trades: {errors[0]}",
+                    transient=isinstance(errors[0], TRANSIENT_DB_ERRORS),
+                )
+            return True
         finally:
-            conn.close()
+            self._connector.return_connection(conn)
     
     def write_bar(self, symbol: str, open_price: float, high: float, 
                   low: float, close: float, volume: int, timestamp: int):
         """Write bar to stock_bars_staging table"""
+        self.write_bars([(symbol, open_price, high, low, close, volume, timestamp)])
+
+    def write_bars(self, bars: Sequence[Tuple[str, float, float, float, float, int, Any]]) -> bool:
+        """
+        Upsert (symbol, open, high, low, close, volume, timestamp) bars into
+        stock_bars_staging in one INSERT statement.
+
+        Raises DatabaseWriteError when the write fails.
+        """
+        bars = [bar for bar in bars if self._has_symbol(bar)]
+        if not bars:
+            return True
         conn = self._get_connection()
         if not conn:
-            return
+            raise DatabaseWriteError("No database connection for bars", transient=True)
         try:
-            def _write_bar() -> bool:
+            def _write_bars() -> bool:
                 with conn.cursor() as cursor:
-                    stock_id = self._get_stock_id(symbol, cursor)
-                    ts = self._normalize_timestamp(timestamp)
-                    cursor.execute(
-                        """
-                        INSERT INTO market_data_oltp.stock_bars_staging 
-                        (stock_id, timeframe, ts, open_price, high_price, low_price, close_price, volume)
-                        VALUES (%s, '1m', %s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (stock_id, ts, timeframe) DO UPDATE SET
-                            open_price = EXCLUDED.open_price,
-                            high_price = EXCLUDED.high_price,
-                            low_price = EXCLUDED.low_price,
-                            close_price = EXCLUDED.close_price,
-                            volume = EXCLUDED.volume
-                        """,
-                        (stock_id, ts, open_price, high, low, close, volume),
+                    # ON CONFLICT DO UPDATE cannot touch a row twice in one
+                    # statement, so a repeated bar keeps only its latest version.
+                    rows = {}
+                    for symbol, open_price, high, low, close, volume, timestamp in bars:
+                        stock_id = self._get_stock_id(symbol, cursor)
+                        ts_raw = _raw_timestamp(timestamp)
+                        rows[(stock_id, ts_raw)] = (stock_id, ts_raw, open_price, high, low, close, volume)
+                    execute_values(
+                        cursor,
+                        BARS_UPSERT_SQL,
+                        list(rows.values()),
+                        template=BARS_TEMPLATE,
+                        page_size=len(rows),
                     )
+                    logger.debug("[DB Writer] Upserted %s bars", len(rows))
                 return True
 
-            result = safe_db_call(
-                _write_bar,
-                context="write_bar",
-                on_error=lambda exc: logger.error(f"Error writing bar: {exc}"),
-            )
+            errors = []
+            result = safe_db_call(_write_bars, context="write_bars", on_error=errors.append)
+            self._end_transaction(conn, committed=result is not None)
             if result is None:
-                conn.rollback()
-                return
-            conn.commit()
+                raise DatabaseWriteError(
+                    f"Error writing {len(bars)} bars: {errors[0]}",
+                    transient=isinstance(errors[0], TRANSIENT_DB_ERRORS),
+                )
+            return True
         finally:
-            conn.close()
-
+            self._connector.return_connection(conn)
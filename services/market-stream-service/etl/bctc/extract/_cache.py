@@ -0,0 +1,70 @@
+"""
+On-disk JSON cache for Alpha Vantage responses.
+
+Quarterly statements only change a few times a year, so responses are kept
+under ~/.cache/bctc_etl/ with an expiry timestamp and replayed on later runs.
+Set BCTC_CACHE_DISABLED=1 to bypass the cache entirely.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "bctc_etl"
+# Financial statements (IS/BS/CF) refresh quarterly.
+DEFAULT_TTL_SECONDS = 90 * 24 * 60 * 60
+
+
+def cache_disabled() -> bool:
+    return os.getenv("BCTC_CACHE_DISABLED", "").lower() in {"1", "true", "yes"}
+
+
+class FileCache:
+    def __init__(
+        self,
+        directory: Path = DEFAULT_CACHE_DIR,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+    ):
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.md5(key.encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            with path.open("r", encoding="utf-8") as fh:
+                entry = json.load(fh)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable cache entry for %s: %s", key, exc)
+            return None
+
+        if entry.get("expires_at", 0) <= time.time():
+            return None
+        return entry.get("value")
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        entry = {"expires_at": time.time() + ttl, "key": key, "value": value}
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file and rename so readers never see a partial entry.
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(entry, fh)
+            os.replace(tmp_path, self._path(key))
+        except OSError as exc:
+            logger.warning("Failed to write cache entry for %s: %s", key, exc)
@@ -4,46 +4,228 @@ Alpha Vantage extraction helpers for BCTC ETL.
 
 from __future__ import annotations
 
+import heapq
 import logging
-from typing import Dict, List
+import os
+from typing import Dict, List, Optional
 
+import httpx
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+
+from etl.bctc.extract._cache import FileCache, cache_disabled
+
+# Import shared retry and circuit breaker helpers
+import sys
+from pathlib import Path
+
+# In Docker this file lives at /app/etl/bctc/extract/alphavantage_extractor.py
+# so ROOT_PATH.parents[3] == /app
+ROOT_PATH = Path(__file__).resolve().parents[3]
+if str(ROOT_PATH) not in sys.path:
+    sys.path.insert(0, str(ROOT_PATH))
+from shared.python.utils.circuit_breaker import CircuitBreaker
+from shared.python.utils.env import load_dotenv_once
+from shared.python.utils.rate_limiter import TokenBucket
+from shared.python.utils.retry import retryable
 
 logger = logging.getLogger(__name__)
 
+# Same .env the pipelines load; read here too so settings below see it
+# whichever module is imported first.
+load_dotenv_once(ROOT_PATH.parent / ".env")
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    # No transport-level retries: _retry_transient retries every failure,
+    # and each of its attempts takes a rate-limiter token.
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=0,
+    )
+    session.mount("https://", adapter)
+    # Report payloads are large, repetitive JSON; ask for them compressed.
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    return session
+
+
+# Shared keep-alive session so repeated calls reuse the TLS connection.
+_SESSION = _build_session()
+
+# Fail fast when Alpha Vantage cannot be reached at all; report bodies can
+# take a while to arrive, so reads get a longer budget. Timeouts are
+# retried like other transport errors and count towards the circuit.
+CONNECT_TIMEOUT = 3.0
+READ_TIMEOUT = 30.0
+_ASYNC_TIMEOUT = httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT)
+
+# Every request (including retries) takes a token, so runs stay under the
+# per-minute quota (5 on the free tier) without fixed sleeps between
+# symbols, and cached symbols cost no wait at all. A capacity of 1 spaces
+# requests evenly; a full-minute burst on top of the refill would let about
+# twice the quota through in the first minute.
+REQUESTS_PER_MINUTE = int(os.getenv("ALPHA_VANTAGE_REQUESTS_PER_MINUTE", "5"))
+_rate_limiter = TokenBucket(rate=REQUESTS_PER_MINUTE / 60, capacity=1)
+_REPORT_CACHE = FileCache()
+
+
+class AlphaVantageThrottled(RuntimeError):
+    """Alpha Vantage answered HTTP 200 with a rate-limit note instead of data."""
+
+
+def _raise_if_throttled(data):
+    if isinstance(data, dict):
+        note = data.get("Note") or data.get("Information") or ""
+        if "Note" in data or "rate limit" in note.lower():
+            raise AlphaVantageThrottled(note)
+    return data
+
+
+def _is_client_error(exc: BaseException) -> bool:
+    """HTTP 4xx other than 429: the same request will fail again."""
+    if isinstance(exc, (requests.HTTPError, httpx.HTTPStatusError)) and exc.response is not None:
+        status = exc.response.status_code
+        return 400 <= status < 500 and status != 429
+    return False
+
+
+# Transient failures (throttle notes, 5xx bodies that are not JSON, dropped
+# connections) back off instead of aborting the whole BCTC run. orjson's
+# JSONDecodeError subclasses ValueError, so bad bodies are still retried.
+# Client errors (bad key, bad request) are raised without retrying.
+_retry_transient = retryable(
+    max_retries=5,
+    backoff_seconds=1,
+    max_backoff_seconds=30,
+    jitter="decorrelated",
+    exceptions=(requests.RequestException, httpx.HTTPError, ValueError, AlphaVantageThrottled),
+    giveup=_is_client_error,
+)
+
+
+# After several calls in a row have exhausted their retries, stop calling
+# Alpha Vantage for a minute so the remaining symbols fail fast.
+_circuit = CircuitBreaker("alphavantage", threshold=5, reset_after=60)
+
+
+@_circuit
+@_retry_transient
+def _get_json(params: Dict[str, str]):
+    _rate_limiter.acquire()
+    response = _SESSION.get(_BASE_URL, params=params, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+    response.raise_for_status()
+    return _raise_if_throttled(orjson.loads(response.content))
+
+
+@_circuit
+@_retry_transient
+async def _get_json_async(client: httpx.AsyncClient, params: Dict[str, str]):
+    await _rate_limiter.acquire_async()
+    response = await client.get(_BASE_URL, params=params, timeout=_ASYNC_TIMEOUT)
+    response.raise_for_status()
+    return _raise_if_throttled(orjson.loads(response.content))
+
+
+_BASE_URL = "https://www.alphavantage.co/query"
+_STATEMENT_FUNCTIONS = {
+    "IS": "INCOME_STATEMENT",
+    "BS": "BALANCE_SHEET",
+    "CF": "CASH_FLOW",
+}
+
+
+def _statement_function(statement_code: str) -> str:
+    try:
+        return _STATEMENT_FUNCTIONS[statement_code]
+    except KeyError:
+        raise ValueError("statement_code must be 'IS', 'BS', or 'CF'") from None
 
-def fetch_quarterly_reports(symbol: str, statement_code: str, api_key: str) -> List[Dict]:
+
+_MAX_QUARTERLY_REPORTS = 20
+
+
+def _fiscal_date_key(report: Dict) -> str:
+    return report.get("fiscalDateEnding") or ""
+
+
+def _latest_quarterly_reports(data: Dict) -> List[Dict]:
+    # nlargest keeps only the newest reports instead of sorting the full history.
+    return heapq.nlargest(
+        _MAX_QUARTERLY_REPORTS,
+        data.get("quarterlyReports", []),
+        key=_fiscal_date_key,
+    )
+
+
+def _cached_reports(symbol: str, statement_code: str, force_refresh: bool) -> Optional[List[Dict]]:
+    if force_refresh or cache_disabled():
+        return None
+    cached = _REPORT_CACHE.get(f"{symbol}:{statement_code}")
+    if cached is not None:
+        logger.info("Using cached %s data for %s", statement_code, symbol)
+    return cached
+
+
+def _store_reports(symbol: str, statement_code: str, reports: List[Dict]) -> None:
+    # Empty payloads are usually throttle notes; never pin them for a quarter.
+    if reports and not cache_disabled():
+        _REPORT_CACHE.set(f"{symbol}:{statement_code}", reports)
+
+
+def fetch_quarterly_reports(
+    symbol: str,
+    statement_code: str,
+    api_key: str,
+    *,
+    force_refresh: bool = False,
+) -> List[Dict]:
     """
     Fetch quarterly financial reports for a symbol/statement_code pair.
 
-    Returns the 20 most recent quarterly reports (if available).
+    Returns the 20 most recent quarterly reports (if available). Responses are
+    served from the on-disk cache unless force_refresh is set.
     """
-    mapping = {
-        "IS": "INCOME_STATEMENT",
-        "BS": "BALANCE_SHEET",
-        "CF": "CASH_FLOW",
-    }
-    if statement_code not in mapping:
-        raise ValueError("statement_code must be 'IS', 'BS', or 'CF'")
-
-    api_function = mapping[statement_code]
-    url = (
-        "https://www.alphavantage.co/query"
-        f"?function={api_function}&symbol={symbol}&apikey={api_key}"
-    )
+    api_function = _statement_function(statement_code)
+    cached = _cached_reports(symbol, statement_code, force_refresh)
+    if cached is not None:
+        return cached
+
+    params = {"function": api_function, "symbol": symbol, "apikey": api_key}
 
     logger.info("Requesting %s data for %s", statement_code, symbol)
-    response = requests.get(url, timeout=30)
-    response.raise_for_status()
-    data = response.json()
+    reports = _latest_quarterly_reports(_get_json(params))
+    _store_reports(symbol, statement_code, reports)
+    return reports
 
-    reports = data.get("quarterlyReports", [])
-    reports = sorted(
-        reports,
-        key=lambda item: item.get("fiscalDateEnding", "") or "",
-        reverse=True,
-    )
-    return reports[:20]
+
+async def fetch_quarterly_reports_async(
+    client: httpx.AsyncClient,
+    symbol: str,
+    statement_code: str,
+    api_key: str,
+    *,
+    force_refresh: bool = False,
+) -> List[Dict]:
+    """
+    Async variant of fetch_quarterly_reports using a shared httpx.AsyncClient.
+
+    Lets callers request several statements concurrently instead of paying one
+    blocking round-trip per statement.
+    """
+    api_function = _statement_function(statement_code)
+    cached = _cached_reports(symbol, statement_code, force_refresh)
+    if cached is not None:
+        return cached
+
+    params = {"function": api_function, "symbol": symbol, "apikey": api_key}
+
+    logger.info("Requesting %s data for %s", statement_code, symbol)
+    reports = _latest_quarterly_reports(await _get_json_async(client, params))
+    _store_reports(symbol, statement_code, reports)
+    return reports
 
 
 def fetch_company_overview(symbol: str, api_key: str) -> Dict:
@@ -54,16 +236,25 @@ def fetch_company_overview(symbol: str, api_key: str) -> Dict:
 
     NOTE: This helper is best-effort; callers should handle missing fields gracefully.
     """
-    url = (
-        "https://www.alphavantage.co/query"
-        f"?function=OVERVIEW&symbol={symbol}&apikey={api_key}"
-    )
+    params = {"function": "OVERVIEW", "symbol": symbol, "apikey": api_key}
 
     logger.info("Requesting OVERVIEW data for %s", symbol)
-    response = requests.get(url, timeout=30)
-    response.raise_for_status()
-    data = response.json()
+    return _overview_or_empty(symbol, _get_json(params))
+
+
+async def fetch_company_overview_async(
+    client: httpx.AsyncClient,
+    symbol: str,
+    api_key: str,
+) -> Dict:
+    """Async variant of fetch_company_overview using a shared httpx.AsyncClient."""
+    params = {"function": "OVERVIEW", "symbol": symbol, "apikey": api_key}
+
+    logger.info("Requesting OVERVIEW data for %s", symbol)
+    return _overview_or_empty(symbol, await _get_json_async(client, params))
+
 
+def _overview_or_empty(symbol: str, data) -> Dict:
     if not isinstance(data, dict) or "Symbol" not in data:
         logger.warning("No OVERVIEW data returned for %s", symbol)
         return {}
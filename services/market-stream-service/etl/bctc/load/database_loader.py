@@ -10,10 +10,20 @@ from typing import Dict, Iterable, List, Tuple
 import psycopg2
 from psycopg2.extras import execute_values
 
-from etl.bctc.transform.financial_transformer import normalize_item_name
+from etl.common.csv_stream import CSVRecordStream
 
 logger = logging.getLogger(__name__)
 
+# Cap a single multi-row INSERT so a pathological batch cannot blow up the
+# statement size; normal batches go out in one round-trip.
+MAX_PAGE_SIZE = 10_000
+
+LINE_ITEM_COPY_SQL = """
+    COPY financial_oltp.financial_line_item
+        (statement_id, item_code, item_name, item_value, unit)
+    FROM STDIN WITH (FORMAT CSV)
+"""
+
 
 class BCTCDatabaseLoader:
     def __init__(self, db_config: Dict[str, str]):
@@ -66,24 +76,47 @@ class BCTCDatabaseLoader:
         statement_code: str,
         reports: Iterable[Dict],
     ):
-        reports = list(reports)
-        if not reports:
-            logger.warning("No reports returned for %s (%s)", symbol, statement_code)
+        self.load_statements(conn, symbol, {statement_code: reports})
+
+    def load_statements(
+        self,
+        conn,
+        symbol: str,
+        statements: Dict[str, Iterable[Dict]],
+    ):
+        """
+        Load several statement types (IS/BS/CF) for one company in one pass.
+
+        Statement headers for every code go out in a single INSERT ... RETURNING
+        and all their line items in a single COPY, followed by one commit
+        (with synchronous_commit off), instead of one round of inserts and a
+        commit per statement type. Only statements that did not exist yet
+        receive line items.
+        """
+        statements = {code: list(reports) for code, reports in statements.items()}
+        for code, reports in statements.items():
+            if not reports:
+                logger.warning("No reports returned for %s (%s)", symbol, code)
+        statements = {code: reports for code, reports in statements.items() if reports}
+        if not statements:
             return
 
         with conn.cursor() as cur:
+            # A lost tail of this commit after a crash is simply re-imported
+            # on the next run, so skip waiting for the WAL flush.
+            cur.execute("SET LOCAL synchronous_commit = OFF")
             cur.execute(
                 """
-                SELECT statement_type_id
+                SELECT statement_code, statement_type_id
                 FROM financial_oltp.statement_type
-                WHERE statement_code = %s
+                WHERE statement_code = ANY(%s)
                 """,
-                (statement_code,),
+                (list(statements),),
             )
-            row = cur.fetchone()
-            if not row:
-                raise ValueError(f"Unknown statement_code={statement_code}")
-            statement_type_id = row[0]
+            statement_type_ids = dict(cur.fetchall())
+            for code in statements:
+                if code not in statement_type_ids:
+                    raise ValueError(f"Unknown statement_code={code}")
 
             # Preload dictionary items so we only insert known items.
             cur.execute(
@@ -94,60 +127,63 @@ class BCTCDatabaseLoader:
             )
             dictionary_items = {row[0]: row[1] for row in cur.fetchall()}
 
-            for report in reports:
-                statement_id = self._ensure_statement(
-                    cur,
-                    symbol,
-                    statement_type_id,
-                    report.get("fiscalDateEnding"),
-                )
-                if not statement_id:
-                    continue
+            # First report wins when two share a fiscal quarter, matching the
+            # ON CONFLICT DO NOTHING behaviour of inserting them one by one.
+            pending: Dict[Tuple[int, int, str], Dict] = {}
+            header_rows = []
+            for code, reports in statements.items():
+                statement_type_id = statement_type_ids[code]
+                for report in reports:
+                    fiscal_date = report.get("fiscalDateEnding")
+                    if not fiscal_date:
+                        continue
+                    fiscal_year, quarter = self._fiscal_period(fiscal_date)
+                    key = (statement_type_id, fiscal_year, quarter)
+                    if key in pending:
+                        continue
+                    pending[key] = report
+                    header_rows.append((symbol, statement_type_id, fiscal_year, quarter, fiscal_date))
+
+            if not header_rows:
+                conn.commit()
+                return
+
+            inserted = execute_values(
+                cur,
+                """
+                INSERT INTO financial_oltp.financial_statement
+                (company_id, statement_type_id, fiscal_year, fiscal_quarter, report_date)
+                VALUES %s
+                ON CONFLICT (company_id, statement_type_id, fiscal_year, fiscal_quarter)
+                DO NOTHING
+                RETURNING statement_id, statement_type_id, fiscal_year, fiscal_quarter
+                """,
+                header_rows,
+                page_size=min(len(header_rows), MAX_PAGE_SIZE),
+                fetch=True,
+            )
 
-                line_items = self._prepare_line_items(
-                    statement_id,
-                    report,
-                    dictionary_items,
-                )
-                if line_items:
-                    execute_values(
-                        cur,
-                        """
-                        INSERT INTO financial_oltp.financial_line_item
-                        (statement_id, item_code, item_name, item_value, unit)
-                        VALUES %s
-                        """,
-                        line_items,
+            if inserted:
+                # Line items are rendered to CSV as COPY reads them rather
+                # than collected into a list and a full text buffer first.
+                line_items = CSVRecordStream(
+                    item
+                    for statement_id, statement_type_id, fiscal_year, quarter in inserted
+                    for item in self._prepare_line_items(
+                        statement_id,
+                        pending[(statement_type_id, fiscal_year, quarter)],
+                        dictionary_items,
                     )
+                )
+                cur.copy_expert(LINE_ITEM_COPY_SQL, line_items)
+                logger.info("Copied %s line items for %s", line_items.count, symbol)
         conn.commit()
 
     @staticmethod
-    def _ensure_statement(
-        cur,
-        symbol: str,
-        statement_type_id: int,
-        fiscal_date: str | None,
-    ) -> int | None:
-        if not fiscal_date:
-            return None
+    def _fiscal_period(fiscal_date: str) -> Tuple[int, str]:
         fiscal_year = int(fiscal_date[:4])
         month = int(fiscal_date[5:7])
-        quarter = f"Q{((month - 1) // 3) + 1}"
-        cur.execute(
-            """
-            INSERT INTO financial_oltp.financial_statement
-            (company_id, statement_type_id, fiscal_year, fiscal_quarter, report_date)
-            VALUES (%s, %s, %s, %s, %s)
-            ON CONFLICT (company_id, statement_type_id, fiscal_year, fiscal_quarter)
-            DO NOTHING
-            RETURNING statement_id
-            """,
-            (symbol, statement_type_id, fiscal_year, quarter, fiscal_date),
-        )
-        row = cur.fetchone()
-        if row:
-            return row[0]
-        return None
+        return fiscal_year, f"Q{((month - 1) // 3) + 1}"
 
     @staticmethod
     def _prepare_line_items(
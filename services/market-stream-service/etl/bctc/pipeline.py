@@ -4,24 +4,25 @@ BCTC pipeline orchestrator.
 
 from __future__ import annotations
 
+import asyncio
 import os
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
-from dotenv import load_dotenv
+import httpx
 
 from etl.bctc.extract.alphavantage_extractor import (
-    fetch_quarterly_reports,
-    fetch_company_overview,
+    fetch_quarterly_reports_async,
+    fetch_company_overview_async,
 )
 from etl.bctc.load.database_loader import BCTCDatabaseLoader
-from etl.eod.pipeline import import_eod_prices_for_symbol
+from etl.eod.pipeline import connector, import_eod_prices_for_symbol
+from shared.python.utils.env import load_dotenv_once
 
 
 CURRENT_FILE_PATH = Path(__file__).resolve()
 ENV_PATH = CURRENT_FILE_PATH.parents[3] / ".env"
-if ENV_PATH.exists():
-    load_dotenv(ENV_PATH)
+load_dotenv_once(ENV_PATH)
 
 API_KEY = os.getenv("ALPHA_VANTAGE_API_KEY")
 DB_CONFIG = {
@@ -44,8 +45,66 @@ if str(SHARED_PATH) not in sys.path:
     sys.path.insert(0, str(SHARED_PATH))
 from constants.tickers import DEFAULT_COMPANIES
 
-
-def run(symbol: Optional[str] = None, limit: Optional[int] = None) -> None:
+STATEMENT_CODES = ("IS", "BS", "CF")
+# Requests in flight at once; the extractor's token bucket paces them to
+# the Alpha Vantage quota.
+CONCURRENCY_LIMIT = 5
+
+# (overview, {statement_code: reports}) for one ticker.
+CompanyData = Tuple[Dict, Dict[str, List[Dict]]]
+
+
+async def _fetch_company_async(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    ticker: str,
+) -> CompanyData:
+    async def _overview() -> Dict:
+        async with semaphore:
+            return await fetch_company_overview_async(client, ticker, API_KEY)
+
+    async def _reports(code: str) -> List[Dict]:
+        async with semaphore:
+            return await fetch_quarterly_reports_async(client, ticker, code, API_KEY)
+
+    overview, *reports = await asyncio.gather(
+        _overview(),
+        *(_reports(code) for code in STATEMENT_CODES),
+    )
+    return overview, dict(zip(STATEMENT_CODES, reports))
+
+
+async def _fetch_companies_async(
+    tickers: Sequence[str],
+) -> List[Union[CompanyData, BaseException]]:
+    """
+    Fetch overview and IS/BS/CF reports for every ticker up front.
+
+    One semaphore covers the whole run, so at most CONCURRENCY_LIMIT
+    Alpha Vantage requests are in flight across all tickers. Failures come
+    back in place of the ticker's result instead of cancelling the rest.
+    """
+    semaphore = asyncio.Semaphore(CONCURRENCY_LIMIT)
+
+    async with httpx.AsyncClient() as client:
+        return await asyncio.gather(
+            *(_fetch_company_async(client, semaphore, ticker) for ticker in tickers),
+            return_exceptions=True,
+        )
+
+
+def run(
+    symbol: Optional[str] = None,
+    limit: Optional[int] = None,
+    *,
+    import_eod: bool = True,
+) -> None:
+    """
+    Load overviews and statements for each company.
+
+    EOD prices are imported per ticker as well unless import_eod is False,
+    which 'runner all' uses because it runs the EOD pipeline alongside.
+    """
     if not API_KEY:
         raise ValueError("ALPHA_VANTAGE_API_KEY environment variable is required")
     if not DB_CONFIG["password"]:
@@ -56,26 +115,35 @@ def run(symbol: Optional[str] = None, limit: Optional[int] = None) -> None:
         companies = companies[:limit]
 
     loader = BCTCDatabaseLoader(DB_CONFIG)
+    results = asyncio.run(_fetch_companies_async(companies))
 
-    for ticker in companies:
-        with loader._get_connection() as conn:
-            overview = fetch_company_overview(ticker, API_KEY)
-            company_name = overview.get("Name") if overview else None
-            sector = overview.get("Sector") if overview else None
-            exchange = overview.get("Exchange") if overview else None
-            currency = overview.get("Currency") if overview else None
+    # Borrow from the EOD pipeline's pool so runner jobs share one set of connections.
+    for ticker, result in zip(companies, results):
+        # Tickers ahead of a failed fetch are still loaded, as in a serial run.
+        if isinstance(result, BaseException):
+            raise result
+        overview, statements = result
 
+        with connector.connection() as conn:
             loader.ensure_company(
                 conn,
                 ticker,
-                company_name=company_name,
-                sector=sector,
-                exchange=exchange,
-                currency=currency,
+                company_name=overview.get("Name"),
+                sector=overview.get("Sector"),
+                exchange=overview.get("Exchange"),
+                currency=overview.get("Currency"),
             )
-            for code in ["IS", "BS", "CF"]:
-                reports = fetch_quarterly_reports(ticker, code, API_KEY)
-                loader.load_statement(conn, ticker, code, reports)
+            loader.load_statements(conn, ticker, statements)
+
+            if import_eod:
+                import_eod_prices_for_symbol(ticker, conn=conn)
 
-            import_eod_prices_for_symbol(ticker, conn=conn)
 
+async def run_async(
+    symbol: Optional[str] = None,
+    limit: Optional[int] = None,
+    *,
+    import_eod: bool = True,
+) -> None:
+    """Run the BCTC pipeline on a worker thread so callers can overlap it with other jobs."""
+    await asyncio.to_thread(run, symbol=symbol, limit=limit, import_eod=import_eod)
@@ -4,13 +4,20 @@ Transformation utilities for BCTC ETL.
 
 from __future__ import annotations
 
+import functools
 import re
 from typing import Dict
 
+# Boundary between a lowercase and an uppercase letter ("totalRevenue").
+_CAMEL_BOUNDARY = re.compile(r"(?<=[a-z])(?=[A-Z])")
 
+
+# Alpha Vantage reuses the same few dozen keys in every quarter and symbol,
+# so each distinct key is only normalized once.
+@functools.lru_cache(maxsize=1024)
 def normalize_item_name(name: str) -> str:
     """Convert raw Alpha Vantage keys into friendly names."""
-    name = re.sub(r"(?<=[a-z])(?=[A-Z])", " ", name)
+    name = _CAMEL_BOUNDARY.sub(" ", name)
     name = name.replace("_", " ")
     return name.title()
 
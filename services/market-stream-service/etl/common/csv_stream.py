@@ -0,0 +1,53 @@
+"""
+Lazy CSV rendering for COPY ... FROM STDIN loads.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+from typing import Iterator, Optional, Sequence
+
+
+class CSVRecordStream(io.TextIOBase):
+    """
+    Read-only text stream that renders records as CSV lines on demand.
+
+    COPY pulls fixed-size chunks through read(), so only the rows needed to
+    fill the current chunk are formatted and held in memory.
+    """
+
+    def __init__(self, records: Iterator[Sequence]):
+        self._records = records
+        self._line = io.StringIO()
+        self._writer = csv.writer(self._line)
+        self._pending = ""
+        self.count = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def _render(self, record: Sequence) -> str:
+        self._line.seek(0)
+        self._line.truncate()
+        self._writer.writerow(record)
+        self.count += 1
+        return self._line.getvalue()
+
+    def read(self, size: Optional[int] = -1) -> str:
+        parts = [self._pending]
+        length = len(self._pending)
+        while size is None or size < 0 or length < size:
+            record = next(self._records, None)
+            if record is None:
+                break
+            line = self._render(record)
+            parts.append(line)
+            length += len(line)
+
+        data = "".join(parts)
+        if size is None or size < 0:
+            self._pending = ""
+            return data
+        self._pending = data[size:]
+        return data[:size]
@@ -4,20 +4,56 @@ Yahoo Finance extraction helpers for EOD ETL.
 
 from __future__ import annotations
 
+import asyncio
+from datetime import date
 from typing import Optional
 
 import pandas as pd
 import yfinance as yf
 
+# Import shared retry and circuit breaker helpers
+import sys
+from pathlib import Path
 
-def download_price_history(ticker: str, years: int) -> pd.DataFrame:
-    df = yf.download(
-        ticker,
+# In Docker this file lives at /app/etl/eod/extract/yahoo_extractor.py
+# so ROOT_PATH.parents[3] == /app
+ROOT_PATH = Path(__file__).resolve().parents[3]
+if str(ROOT_PATH) not in sys.path:
+    sys.path.insert(0, str(ROOT_PATH))
+from shared.python.utils.circuit_breaker import CircuitBreaker
+from shared.python.utils.retry import retryable
+
+# Trips once several tickers in a row have exhausted their retries, so an
+# unreachable Yahoo fails the rest of the run fast instead of per ticker.
+_circuit = CircuitBreaker("yahoo", threshold=5, reset_after=60)
+
+
+@_circuit
+@retryable(max_retries=5, backoff_seconds=1, max_backoff_seconds=30, jitter="decorrelated")
+def _fetch_history(ticker: str, years: int, start: Optional[date]) -> pd.DataFrame:
+    # yf.download keeps results in module-level state and is not safe to call
+    # from several threads at once; Ticker.history is per-instance.
+    if start is not None:
+        return yf.Ticker(ticker).history(start=start.isoformat(), auto_adjust=False)
+    return yf.Ticker(ticker).history(
         period=f"{years}y",
         auto_adjust=False,
-        progress=False,
-        threads=False,
     )
+
+
+def download_price_history(
+    ticker: str,
+    years: int,
+    start: Optional[date] = None,
+) -> pd.DataFrame:
+    """
+    Download daily bars for a ticker.
+
+    With start set only rows from that date onward are requested; callers
+    pass the last stored trading_date so its close seeds pct_change for the
+    first new row.
+    """
+    df = _fetch_history(ticker, years, start)
     if df.empty:
         raise ValueError(f"No historical price data returned for {ticker}")
 
@@ -35,3 +71,12 @@ def download_price_history(ticker: str, years: int) -> pd.DataFrame:
     df["pct_change"] = df["pct_change"].round(2)
     return df
 
+
+async def download_price_history_async(
+    ticker: str,
+    years: int,
+    start: Optional[date] = None,
+) -> pd.DataFrame:
+    # yfinance only exposes a blocking client, so the download runs on the
+    # default executor and callers bound concurrency with a semaphore.
+    return await asyncio.to_thread(download_price_history, ticker, years, start)
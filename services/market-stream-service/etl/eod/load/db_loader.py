@@ -4,11 +4,15 @@ Database loaders for EOD ETL.
 
 from __future__ import annotations
 
+import itertools
 import logging
-from typing import Iterable, List, Sequence, Tuple
+from datetime import date
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
 
 from psycopg2.extras import execute_values
 
+from etl.common.csv_stream import CSVRecordStream
+
 # Import shared Postgres connector
 import sys
 from pathlib import Path
@@ -29,11 +33,22 @@ EODRecord = Tuple[int, object, object, object, object, object, object, object]
 class EODLoader:
     def __init__(self, connector: PostgresConnector):
         self.connector = connector
+        # company_id/stock_id are keyed by ticker and never change once
+        # created, so resolved values are memoized for the process lifetime.
+        self._stock_id_cache: Dict[str, int] = {}
+        self._company_seen: Set[str] = set()
 
     def _get_connection(self):
         return self.connector.get_connection()
 
+    def forget(self, ticker: str) -> None:
+        """Drop memoized ids for a ticker, e.g. after its transaction rolled back."""
+        self._stock_id_cache.pop(ticker, None)
+        self._company_seen.discard(ticker)
+
     def ensure_company(self, cursor, ticker: str) -> None:
+        if ticker in self._company_seen:
+            return
         cursor.execute(
             """
             INSERT INTO financial_oltp.company (company_id, company_name, exchange)
@@ -42,8 +57,13 @@ class EODLoader:
             """,
             (ticker, f"{ticker} Corporation", "NYSE"),
         )
+        self._company_seen.add(ticker)
 
     def ensure_stock(self, cursor, ticker: str) -> int:
+        cached = self._stock_id_cache.get(ticker)
+        if cached is not None:
+            return cached
+
         cursor.execute(
             """
             SELECT stock_id
@@ -54,6 +74,7 @@ class EODLoader:
         )
         result = cursor.fetchone()
         if result:
+            self._stock_id_cache[ticker] = result[0]
             return result[0]
 
         cursor.execute(
@@ -88,14 +109,157 @@ class EODLoader:
         )
         stock_id = cursor.fetchone()[0]
         logger.info("Created/updated stock entry for %s (stock_id=%s)", ticker, stock_id)
+        self._stock_id_cache[ticker] = stock_id
         return stock_id
 
-    def upsert_eod_prices(self, cursor, records: Iterable[EODRecord]) -> int:
-        record_list = list(records)
-        if not record_list:
-            return 0
+    def ensure_companies_bulk(self, cursor, tickers: Sequence[str]) -> None:
+        """Insert placeholder company rows for every unseen ticker in one statement."""
+        missing = [ticker for ticker in dict.fromkeys(tickers) if ticker not in self._company_seen]
+        if not missing:
+            return
         execute_values(
             cursor,
+            """
+            INSERT INTO financial_oltp.company (company_id, company_name, exchange)
+            VALUES %s
+            ON CONFLICT (company_id) DO NOTHING
+            """,
+            [(ticker, f"{ticker} Corporation", "NYSE") for ticker in missing],
+            page_size=len(missing),
+        )
+        self._company_seen.update(missing)
+
+    def ensure_stocks_bulk(self, cursor, tickers: Sequence[str]) -> Dict[str, int]:
+        """
+        Resolve stock_ids for many tickers, creating missing stocks in bulk.
+
+        One SELECT for existing rows plus one INSERT ... RETURNING for the rest,
+        instead of two or three round-trips per ticker.
+        """
+        unique = list(dict.fromkeys(tickers))
+        resolved = {
+            ticker: self._stock_id_cache[ticker]
+            for ticker in unique
+            if ticker in self._stock_id_cache
+        }
+        pending = [ticker for ticker in unique if ticker not in resolved]
+        if pending:
+            cursor.execute(
+                """
+                SELECT stock_ticker, stock_id
+                FROM market_data_oltp.stocks
+                WHERE stock_ticker = ANY(%s)
+                """,
+                (pending,),
+            )
+            resolved.update(dict(cursor.fetchall()))
+
+        missing = [ticker for ticker in pending if ticker not in resolved]
+        if missing:
+            rows = execute_values(
+                cursor,
+                """
+                INSERT INTO market_data_oltp.stocks (
+                    company_id,
+                    stock_ticker,
+                    stock_name,
+                    exchange,
+                    delisted
+                )
+                SELECT
+                    v.ticker,
+                    v.ticker,
+                    COALESCE(c.company_name, v.ticker || ' Corporation'),
+                    COALESCE(c.exchange, 'NYSE'),
+                    FALSE
+                FROM (VALUES %s) AS v(ticker)
+                LEFT JOIN financial_oltp.company c ON c.company_id = v.ticker
+                ON CONFLICT (stock_ticker) DO UPDATE
+                SET stock_name = EXCLUDED.stock_name,
+                    exchange = EXCLUDED.exchange,
+                    delisted = EXCLUDED.delisted
+                RETURNING stock_ticker, stock_id
+                """,
+                [(ticker,) for ticker in missing],
+                page_size=len(missing),
+                fetch=True,
+            )
+            resolved.update(dict(rows))
+            logger.info("Created stock entries for %s", ", ".join(missing))
+
+        self._stock_id_cache.update(resolved)
+        return resolved
+
+    def fetch_latest_trading_dates(self, cursor, stock_ids: Sequence[int]) -> Dict[int, date]:
+        """
+        Return the latest stored trading_date for each stock that has prices.
+
+        The correlated MAX is answered from idx_eod_stock_date_covering with
+        one index probe per stock rather than aggregating every price row.
+        """
+        if not stock_ids:
+            return {}
+        cursor.execute(
+            """
+            SELECT s.stock_id, latest.trading_date
+            FROM unnest(%s::int[]) AS s(stock_id)
+            CROSS JOIN LATERAL (
+                SELECT MAX(p.trading_date) AS trading_date
+                FROM market_data_oltp.stock_eod_prices p
+                WHERE p.stock_id = s.stock_id
+            ) AS latest
+            WHERE latest.trading_date IS NOT NULL
+            """,
+            (list(stock_ids),),
+        )
+        return dict(cursor.fetchall())
+
+    def upsert_eod_prices(self, cursor, records: Iterable[EODRecord]) -> int:
+        """
+        Bulk upsert EOD rows via COPY into a temp staging table.
+
+        COPY cannot express ON CONFLICT, so rows are streamed into _eod_stage
+        and merged with a single INSERT ... SELECT ... ON CONFLICT DO UPDATE
+        that skips rows whose values are unchanged. Records may be a generator;
+        they are consumed once, as COPY reads. Returns the number of rows sent,
+        not the number actually written.
+        """
+        iterator = iter(records)
+        first = next(iterator, None)
+        if first is None:
+            return 0
+        stream = CSVRecordStream(itertools.chain((first,), iterator))
+
+        cursor.execute(
+            """
+            CREATE TEMP TABLE IF NOT EXISTS _eod_stage (
+                stock_id INT,
+                trading_date DATE,
+                open_price NUMERIC(12,6),
+                high_price NUMERIC(12,6),
+                low_price NUMERIC(12,6),
+                close_price NUMERIC(12,6),
+                volume BIGINT,
+                pct_change NUMERIC(6,2)
+            ) ON COMMIT DROP
+            """
+        )
+        cursor.copy_expert(
+            """
+            COPY _eod_stage (
+                stock_id,
+                trading_date,
+                open_price,
+                high_price,
+                low_price,
+                close_price,
+                volume,
+                pct_change
+            ) FROM STDIN WITH (FORMAT CSV)
+            """,
+            stream,
+        )
+        cursor.execute(
             """
             INSERT INTO market_data_oltp.stock_eod_prices (
                 stock_id,
@@ -107,7 +271,21 @@ class EODLoader:
                 volume,
                 pct_change
             )
-            VALUES %s
+            -- ON CONFLICT DO UPDATE cannot touch the same row twice, so a
+            -- source repeating a trading_date keeps only its last copy.
+            SELECT DISTINCT ON (stock_id, trading_date)
+                stock_id,
+                trading_date,
+                open_price,
+                high_price,
+                low_price,
+                close_price,
+                volume,
+                pct_change
+            FROM _eod_stage
+            -- A fixed lock order keeps concurrent upserts of the same
+            -- tickers (e.g. BCTC and EOD in 'runner all') from deadlocking.
+            ORDER BY stock_id, trading_date, ctid DESC
             ON CONFLICT (stock_id, trading_date) DO UPDATE
             SET open_price = EXCLUDED.open_price,
                 high_price = EXCLUDED.high_price,
@@ -116,20 +294,39 @@ class EODLoader:
                 volume = EXCLUDED.volume,
                 pct_change = EXCLUDED.pct_change,
                 inserted_at = CURRENT_TIMESTAMP
-            """,
-            record_list,
-            page_size=500,
+            -- Leave identical rows alone: no new tuple version, no WAL, and
+            -- inserted_at keeps pointing at the last real change.
+            WHERE (
+                stock_eod_prices.open_price,
+                stock_eod_prices.high_price,
+                stock_eod_prices.low_price,
+                stock_eod_prices.close_price,
+                stock_eod_prices.volume,
+                stock_eod_prices.pct_change
+            ) IS DISTINCT FROM (
+                EXCLUDED.open_price,
+                EXCLUDED.high_price,
+                EXCLUDED.low_price,
+                EXCLUDED.close_price,
+                EXCLUDED.volume,
+                EXCLUDED.pct_change
+            )
+            """
         )
-        return len(record_list)
+        # The stage survives until commit; clear it so a later upsert in the
+        # same transaction does not re-merge these rows.
+        cursor.execute("TRUNCATE _eod_stage")
+        return stream.count
 
     def fetch_all_company_tickers(self, cursor) -> List[str]:
         cursor.execute(
             """
-            SELECT company_id
+            SELECT upper(company_id)
             FROM financial_oltp.company
-            ORDER BY company_id
+            -- <> '' also drops NULLs, matching the old truthiness filter.
+            WHERE company_id <> ''
+            ORDER BY 1
             """
         )
-        rows = cursor.fetchall()
-        return [row[0].upper() for row in rows if row[0]]
+        return [row[0] for row in cursor.fetchall()]
 
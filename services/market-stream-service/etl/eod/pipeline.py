@@ -5,20 +5,33 @@ End-of-day price pipeline.
 from __future__ import annotations
 
 import argparse
+import asyncio
+import functools
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
 from pathlib import Path
-from typing import Iterable, List, Optional, Sequence, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
-from dotenv import load_dotenv
+import pandas as pd
 
-from etl.eod.extract.yahoo_extractor import download_price_history
+from etl.eod.extract.yahoo_extractor import (
+    download_price_history,
+    download_price_history_async,
+)
 from etl.eod.load.db_loader import EODLoader
-from etl.eod.transform.price_transformer import filter_by_start_date, prepare_records
+from etl.eod.transform.price_transformer import (
+    filter_after_date,
+    filter_by_start_date,
+    prepare_records,
+)
+# Importable once the extract/load modules above have put /app on sys.path.
+from shared.python.utils.env import load_dotenv_once
 
 CURRENT_FILE_PATH = Path(__file__).resolve()
 ENV_PATH = CURRENT_FILE_PATH.parents[3] / ".env"
-if ENV_PATH.exists():
-    load_dotenv(ENV_PATH)
+load_dotenv_once(ENV_PATH)
 
 DB_CONFIG = {
     "host": os.getenv("DB_HOST", "localhost"),
@@ -50,6 +63,24 @@ logger = get_logger(__name__)
 connector = PostgresConnector(DB_CONFIG)
 loader = EODLoader(connector)
 
+# Yahoo downloads are network-bound, so tickers are fetched concurrently.
+DEFAULT_MAX_WORKERS = 8
+# Tickers downloaded and written per batch, so only one batch of price
+# frames is held in memory at a time.
+DEFAULT_CHUNK_SIZE = 100
+# Normalized once at import instead of on every all-companies run.
+FALLBACK_TICKERS: Tuple[str, ...] = tuple(ticker.upper() for ticker in DEFAULT_TICKERS)
+
+
+def _is_up_to_date(watermark: Optional[date]) -> bool:
+    """True when the latest stored row already covers the most recent weekday."""
+    if watermark is None:
+        return False
+    today = date.today()
+    # Saturday/Sunday fall back to Friday; exchange holidays just cost a small re-fetch.
+    latest_weekday = today - timedelta(days=max(0, today.weekday() - 4))
+    return watermark >= latest_weekday
+
 
 def import_eod_prices_for_symbol(
     ticker: str,
@@ -57,19 +88,43 @@ def import_eod_prices_for_symbol(
     years: int = 5,
     start_date: Optional[str] = None,
     conn=None,
+    stock_id: Optional[int] = None,
 ) -> int:
+    """
+    Download and upsert EOD prices for one ticker.
+
+    Callers that already resolved the stock via ensure_stocks_bulk pass
+    stock_id to skip the per-ticker company/stock bootstrap. Without an
+    explicit start_date only rows after the stock's latest stored
+    trading_date are downloaded.
+    """
     ticker = ticker.upper()
-    managed_connection = False
     if conn is None:
-        conn = connector.get_connection()
-        managed_connection = True
+        with connector.connection() as conn:
+            return import_eod_prices_for_symbol(
+                ticker,
+                years=years,
+                start_date=start_date,
+                conn=conn,
+                stock_id=stock_id,
+            )
 
     try:
         with conn.cursor() as cursor:
-            loader.ensure_company(cursor, ticker)
-            stock_id = loader.ensure_stock(cursor, ticker)
-            df = download_price_history(ticker, years)
+            if stock_id is None:
+                loader.ensure_company(cursor, ticker)
+                stock_id = loader.ensure_stock(cursor, ticker)
+            watermark = None
+            if not start_date:
+                watermark = loader.fetch_latest_trading_dates(cursor, [stock_id]).get(stock_id)
+            if _is_up_to_date(watermark):
+                conn.commit()
+                logger.info("EOD prices for %s are up to date (%s)", ticker, watermark)
+                return 0
+
+            df = download_price_history(ticker, years, start=watermark)
             df = filter_by_start_date(df, start_date)
+            df = filter_after_date(df, watermark)
             records = prepare_records(stock_id, df)
             inserted = loader.upsert_eod_prices(cursor, records)
             conn.commit()
@@ -82,11 +137,239 @@ def import_eod_prices_for_symbol(
             return inserted
     except Exception:
         conn.rollback()
+        # Ids created inside the rolled-back transaction no longer exist.
+        loader.forget(ticker)
         logger.exception("Failed to import EOD prices for %s", ticker)
         raise
-    finally:
-        if managed_connection:
-            conn.close()
+
+
+def _resolve_stocks(
+    tickers: Sequence[str],
+    *,
+    start_date: Optional[str],
+) -> Tuple[Dict[str, int], Dict[str, date]]:
+    """
+    Bootstrap company/stock rows in bulk and look up each stock's watermark.
+
+    Watermarks (latest stored trading_date) are skipped when an explicit
+    start_date asks for a re-import.
+    """
+    with connector.connection() as conn:
+        try:
+            with conn.cursor() as cursor:
+                loader.ensure_companies_bulk(cursor, tickers)
+                stock_ids = loader.ensure_stocks_bulk(cursor, tickers)
+                latest = {}
+                if not start_date:
+                    latest = loader.fetch_latest_trading_dates(cursor, list(stock_ids.values()))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            for ticker in tickers:
+                loader.forget(ticker)
+            raise
+
+    watermarks = {
+        ticker: latest[stock_id]
+        for ticker, stock_id in stock_ids.items()
+        if stock_id in latest
+    }
+    return stock_ids, watermarks
+
+
+async def _fetch_all(
+    tickers: Sequence[str],
+    *,
+    years: int,
+    watermarks: Dict[str, date],
+    max_concurrency: int,
+    skip_errors: bool,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Download price history for every ticker before touching the database.
+
+    Downloads overlap up to max_concurrency at a time. Failed tickers are
+    logged and dropped when skip_errors is set; otherwise the first failure
+    (in ticker order) is raised.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def fetch(ticker: str) -> pd.DataFrame:
+        async with semaphore:
+            return await download_price_history_async(
+                ticker, years, start=watermarks.get(ticker)
+            )
+
+    results = await asyncio.gather(
+        *(fetch(ticker) for ticker in tickers),
+        return_exceptions=True,
+    )
+
+    frames: Dict[str, pd.DataFrame] = {}
+    for ticker, result in zip(tickers, results):
+        if isinstance(result, BaseException):
+            if not skip_errors:
+                raise result
+            logger.error("Skipping %s due to error: %s", ticker, result)
+            continue
+        frames[ticker] = result
+    return frames
+
+
+def _write_all(
+    frames: Dict[str, pd.DataFrame],
+    *,
+    stock_ids: Dict[str, int],
+    watermarks: Dict[str, date],
+    start_date: Optional[str],
+    skip_errors: bool,
+) -> Tuple[List[str], int]:
+    """
+    Upsert all downloaded frames in a single transaction.
+
+    Each ticker is merged under its own savepoint, so with skip_errors one
+    bad ticker is rolled back and skipped without losing the rest of the
+    chunk. Returns the tickers written and the number of rows upserted.
+    """
+    if not frames:
+        return [], 0
+
+    written: List[str] = []
+    inserted = 0
+    with connector.connection() as conn:
+        try:
+            with conn.cursor() as cursor:
+                for ticker, df in frames.items():
+                    # Rows are generated lazily while COPY reads them, so
+                    # no record list is ever materialized.
+                    records = prepare_records(
+                        stock_ids[ticker],
+                        filter_after_date(
+                            filter_by_start_date(df, start_date),
+                            watermarks.get(ticker),
+                        ),
+                    )
+                    cursor.execute("SAVEPOINT eod_ticker")
+                    try:
+                        count = loader.upsert_eod_prices(cursor, records)
+                    except Exception as exc:
+                        if not skip_errors:
+                            raise
+                        cursor.execute("ROLLBACK TO SAVEPOINT eod_ticker")
+                        logger.error("Skipping %s due to error: %s", ticker, exc)
+                        continue
+                    cursor.execute("RELEASE SAVEPOINT eod_ticker")
+                    written.append(ticker)
+                    inserted += count
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            logger.exception("Failed to write EOD prices for %s tickers", len(frames))
+            raise
+
+    logger.info("Imported %s EOD records for %s tickers", inserted, len(written))
+    return written, inserted
+
+
+def _import_symbol_in_worker(
+    ticker: str,
+    *,
+    years: int,
+    start_date: Optional[str],
+) -> Tuple[str, Optional[int], Optional[str]]:
+    """ProcessPoolExecutor entry point; errors come back as text so they always pickle."""
+    try:
+        return ticker, import_eod_prices_for_symbol(ticker, years=years, start_date=start_date), None
+    except Exception as exc:
+        return ticker, None, str(exc)
+
+
+def _import_tickers_in_processes(
+    tickers: Sequence[str],
+    *,
+    years: int,
+    start_date: Optional[str],
+    jobs: int,
+    skip_errors: bool,
+) -> Tuple[List[str], int]:
+    """
+    Import tickers one by one across worker processes.
+
+    Each worker downloads, transforms and writes its own tickers, so the
+    pandas work runs on separate cores. Workers are spawned rather than
+    forked so the module-level connector (and its pool) is rebuilt per
+    process instead of sharing the parent's sockets.
+    """
+    processed: List[str] = []
+    total_inserted = 0
+    worker = functools.partial(_import_symbol_in_worker, years=years, start_date=start_date)
+    chunksize = max(1, len(tickers) // (4 * jobs))
+
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        for ticker, inserted, error in executor.map(worker, tickers, chunksize=chunksize):
+            if error is not None:
+                if not skip_errors:
+                    executor.shutdown(cancel_futures=True)
+                    raise RuntimeError(f"Failed to import EOD prices for {ticker}: {error}")
+                logger.error("Skipping %s due to error: %s", ticker, error)
+                continue
+            processed.append(ticker)
+            total_inserted += inserted
+
+    return processed, total_inserted
+
+
+def _import_tickers(
+    tickers: Sequence[str],
+    *,
+    years: int,
+    start_date: Optional[str],
+    max_workers: int,
+    skip_errors: bool,
+    jobs: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Tuple[List[str], int]:
+    if jobs > 1:
+        return _import_tickers_in_processes(
+            tickers,
+            years=years,
+            start_date=start_date,
+            jobs=jobs,
+            skip_errors=skip_errors,
+        )
+
+    stock_ids, watermarks = _resolve_stocks(tickers, start_date=start_date)
+    stale = [ticker for ticker in tickers if not _is_up_to_date(watermarks.get(ticker))]
+    if len(stale) < len(tickers):
+        logger.info("Skipping %s up-to-date tickers", len(tickers) - len(stale))
+
+    fetched = set()
+    total_inserted = 0
+    chunk_size = max(1, chunk_size)
+    for offset in range(0, len(stale), chunk_size):
+        frames = asyncio.run(
+            _fetch_all(
+                stale[offset:offset + chunk_size],
+                years=years,
+                watermarks=watermarks,
+                max_concurrency=max_workers,
+                skip_errors=skip_errors,
+            )
+        )
+        written, inserted = _write_all(
+            frames,
+            stock_ids=stock_ids,
+            watermarks=watermarks,
+            start_date=start_date,
+            skip_errors=skip_errors,
+        )
+        total_inserted += inserted
+        fetched.update(written)
+    processed = [ticker for ticker in tickers if ticker in fetched or ticker not in stale]
+    return processed, total_inserted
 
 
 def import_eod_prices_for_companies(
@@ -94,26 +377,23 @@ def import_eod_prices_for_companies(
     *,
     years: int = 5,
     start_date: Optional[str] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    jobs: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
 ) -> int:
     tickers = [ticker.upper() for ticker in tickers]
     if not tickers:
         return 0
 
-    total_inserted = 0
-    conn = connector.get_connection()
-
-    try:
-        for ticker in tickers:
-            inserted = import_eod_prices_for_symbol(
-                ticker,
-                years=years,
-                start_date=start_date,
-                conn=conn,
-            )
-            total_inserted += inserted
-    finally:
-        conn.close()
-
+    _, total_inserted = _import_tickers(
+        tickers,
+        years=years,
+        start_date=start_date,
+        max_workers=max_workers,
+        skip_errors=False,
+        jobs=jobs,
+        chunk_size=chunk_size,
+    )
     return total_inserted
 
 
@@ -123,50 +403,78 @@ def import_prices_for_all_companies(
     fallback_tickers: Optional[Sequence[str]] = None,
     limit: Optional[int] = None,
     start_date: Optional[str] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    jobs: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
 ) -> Tuple[List[str], int]:
-    fallback_list = [ticker.upper() for ticker in (fallback_tickers or DEFAULT_TICKERS)]
-
-    conn = connector.get_connection()
-
-    try:
+    with connector.connection() as conn:
         with conn.cursor() as cursor:
             tickers = loader.fetch_all_company_tickers(cursor)
-            if not tickers:
-                tickers = list(fallback_list)
-                logger.info(
-                    "No tickers found in financial_oltp.company; using fallback list: %s",
-                    ", ".join(tickers),
-                )
-
-        if limit:
-            tickers = tickers[:limit]
-
-        processed: List[str] = []
-        total_inserted = 0
-        for ticker in tickers:
-            try:
-                inserted = import_eod_prices_for_symbol(
-                    ticker,
-                    years=years,
-                    start_date=start_date,
-                    conn=conn,
-                )
-                total_inserted += inserted
-                processed.append(ticker)
-            except Exception as exc:
-                logger.error("Skipping %s due to error: %s", ticker, exc)
-
-        return processed, total_inserted
-    finally:
-        conn.close()
-
-
-def run(symbol: Optional[str] = None, date: Optional[str] = None, limit: Optional[int] = None) -> None:
+        if not tickers:
+            if fallback_tickers:
+                tickers = [ticker.upper() for ticker in fallback_tickers]
+            else:
+                tickers = list(FALLBACK_TICKERS)
+            logger.info(
+                "No tickers found in financial_oltp.company; using fallback list: %s",
+                ", ".join(tickers),
+            )
+
+    if limit:
+        tickers = tickers[:limit]
+    if not tickers:
+        return [], 0
+
+    return _import_tickers(
+        tickers,
+        years=years,
+        start_date=start_date,
+        max_workers=max_workers,
+        skip_errors=True,
+        jobs=jobs,
+        chunk_size=chunk_size,
+    )
+
+
+def run(
+    symbol: Optional[str] = None,
+    date: Optional[str] = None,
+    limit: Optional[int] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    jobs: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> None:
     """Entry point used by the unified runner."""
     if symbol:
-        import_eod_prices_for_symbol(symbol.upper(), start_date=date)
+        import_eod_prices_for_symbol(symbol, start_date=date)
     else:
-        import_prices_for_all_companies(start_date=date, limit=limit)
+        import_prices_for_all_companies(
+            start_date=date,
+            limit=limit,
+            max_workers=max_workers,
+            jobs=jobs,
+            chunk_size=chunk_size,
+        )
+
+
+async def run_async(
+    symbol: Optional[str] = None,
+    date: Optional[str] = None,
+    limit: Optional[int] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    jobs: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> None:
+    """Run the EOD pipeline on a worker thread so callers can overlap it with other jobs."""
+    await asyncio.to_thread(
+        run,
+        symbol=symbol,
+        date=date,
+        limit=limit,
+        max_workers=max_workers,
+        jobs=jobs,
+        chunk_size=chunk_size,
+    )
 
 
 def main(argv: Optional[List[str]] = None) -> None:
@@ -192,27 +500,49 @@ def main(argv: Optional[List[str]] = None) -> None:
         type=int,
         help="Limit number of tickers when importing all companies.",
     )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help=f"Number of tickers downloaded concurrently (default: {DEFAULT_MAX_WORKERS})",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Import tickers across N worker processes instead of one batched COPY (default: 1)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Tickers downloaded and written per batch (default: {DEFAULT_CHUNK_SIZE})",
+    )
 
     args = parser.parse_args(argv)
 
     if args.tickers:
-        tickers = [ticker.upper() for ticker in args.tickers]
         total = import_eod_prices_for_companies(
-            tickers,
+            args.tickers,
             years=args.years,
             start_date=args.start_date,
+            max_workers=args.max_workers,
+            jobs=args.jobs,
+            chunk_size=args.chunk_size,
         )
         logger.info(
             "Completed EOD import for provided tickers (%s). Total records processed: %s",
-            ", ".join(tickers),
+            ", ".join(args.tickers),
             total,
         )
     else:
         processed, total = import_prices_for_all_companies(
             years=args.years,
-            fallback_tickers=DEFAULT_TICKERS,
-             limit=args.limit,
-             start_date=args.start_date,
+            limit=args.limit,
+            start_date=args.start_date,
+            max_workers=args.max_workers,
+            jobs=args.jobs,
+            chunk_size=args.chunk_size,
         )
         logger.info(
             "Completed EOD import for %s tickers. Total records processed: %s",
@@ -4,9 +4,11 @@ Normalize raw Yahoo Finance data for EOD loading.
 
 from __future__ import annotations
 
+import itertools
 from datetime import date
-from typing import Iterable, List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 EODRecord = Tuple[int, date, Optional[float], Optional[float], Optional[float], Optional[float], Optional[int], Optional[float]]
@@ -19,31 +21,47 @@ def filter_by_start_date(df: pd.DataFrame, start_date: Optional[str]) -> pd.Data
     return df.loc[mask]
 
 
-def prepare_records(stock_id: int, df: pd.DataFrame) -> List[EODRecord]:
-    records: List[EODRecord] = []
-
-    def to_float(value):
-        if value is None or pd.isna(value):
-            return None
-        return float(value)
-
-    def to_int(value):
-        if value is None or pd.isna(value):
-            return None
-        return int(value)
-
-    for row in df.itertuples():
-        records.append(
-            (
-                stock_id,
-                row.Date,
-                to_float(getattr(row, "Open", None)),
-                to_float(getattr(row, "High", None)),
-                to_float(getattr(row, "Low", None)),
-                to_float(getattr(row, "Close", None)),
-                to_int(getattr(row, "Volume", None)),
-                to_float(getattr(row, "pct_change", None)),
-            )
-        )
-    return records
+def filter_after_date(df: pd.DataFrame, last_date: Optional[date]) -> pd.DataFrame:
+    """Drop rows on or before last_date (the latest trading_date already stored)."""
+    if last_date is None:
+        return df
+    return df.loc[df["Date"] > last_date]
+
+
+def _float_column(df: pd.DataFrame, name: str) -> List[Optional[float]]:
+    if name not in df.columns:
+        return [None] * len(df)
+    values = df[name].to_numpy(dtype="float64", na_value=np.nan)
+    column = values.astype(object)
+    column[np.isnan(values)] = None
+    return column.tolist()
+
+
+def _int_column(df: pd.DataFrame, name: str) -> List[Optional[int]]:
+    if name not in df.columns:
+        return [None] * len(df)
+    values = df[name].to_numpy(dtype="float64", na_value=np.nan)
+    missing = np.isnan(values)
+    column = np.where(missing, 0, values).astype(np.int64).astype(object)
+    column[missing] = None
+    return column.tolist()
+
+
+def prepare_records(stock_id: int, df: pd.DataFrame) -> Iterator[EODRecord]:
+    """
+    Yield one EOD row tuple per DataFrame row, for streaming into COPY.
 
+    Each column is converted (NaN -> None, numpy -> Python scalars) in one
+    vectorized pass and the columns are zipped into tuples, instead of
+    reading and checking every cell of every row.
+    """
+    return zip(
+        itertools.repeat(stock_id),
+        df["Date"].tolist(),
+        _float_column(df, "Open"),
+        _float_column(df, "High"),
+        _float_column(df, "Low"),
+        _float_column(df, "Close"),
+        _int_column(df, "Volume"),
+        _float_column(df, "pct_change"),
+    )
@@ -7,6 +7,7 @@ pull all relevant data for a given symbol.
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List
 
 from etl.bctc.extract.alphavantage_extractor import (
@@ -32,12 +33,20 @@ def extract_all_financial_data(symbol: str, api_key: str) -> Dict:
     """
     symbol = symbol.upper()
 
-    overview: Dict = fetch_company_overview(symbol, api_key)
-
-    statements: Dict[str, List[Dict]] = {}
-    for code in ["IS", "BS", "CF"]:
-        reports = fetch_quarterly_reports(symbol, code, api_key)
-        statements[code] = reports
+    # The overview and the three statement downloads are independent, so
+    # they overlap on the shared keep-alive session instead of running back
+    # to back.
+    codes = ["IS", "BS", "CF"]
+    with ThreadPoolExecutor(max_workers=len(codes) + 1) as pool:
+        overview_future = pool.submit(fetch_company_overview, symbol, api_key)
+        statement_futures = {
+            code: pool.submit(fetch_quarterly_reports, symbol, code, api_key)
+            for code in codes
+        }
+        overview: Dict = overview_future.result()
+        statements: Dict[str, List[Dict]] = {
+            code: future.result() for code, future in statement_futures.items()
+        }
 
     # EOD prices from Yahoo-based extractor.
     # This does NOT write to the database; it only returns raw price history.
@@ -41,12 +41,12 @@ def load_company_and_statements(
         currency=currency,
     )
 
-    for code in ["IS", "BS", "CF"]:
-        reports = statements.get(code, [])
-        # Gracefully skip when Alpha Vantage returns empty or error
-        if not reports:
-            continue
-        bctc_loader.load_statement(conn, symbol, code, reports)
+    # Gracefully skip statements where Alpha Vantage returned empty or error
+    bctc_loader.load_statements(
+        conn,
+        symbol,
+        {code: reports for code, reports in statements.items() if reports},
+    )
 
 
 def load_eod_prices(
@@ -60,7 +60,7 @@ def load_eod_prices(
     - market_data_oltp.stocks
     - market_data_oltp.stock_eod_prices
     """
-    with eod_loader._get_connection() as conn:
+    with eod_loader.connector.connection() as conn:
         with conn.cursor() as cursor:
             inserted = eod_loader.upsert_eod_prices(cursor, records)
             conn.commit()
@@ -11,12 +11,12 @@ Usage examples:
 from __future__ import annotations
 
 import argparse
+import asyncio
 import sys
-import time
 from typing import Callable, Dict, List, Optional
 
-from etl.bctc.pipeline import run as run_bctc
-from etl.eod.pipeline import run as run_eod
+from etl.bctc.pipeline import run as run_bctc, run_async as run_bctc_async
+from etl.eod.pipeline import run as run_eod, run_async as run_eod_async
 from shared.constants.tickers import DEFAULT_TICKERS
 
 
@@ -32,7 +32,7 @@ def parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
     parser.add_argument(
         "job",
         choices=["bctc", "financial", "eod", "all"],
-        help="Pipeline to execute (use 'all' to run every pipeline sequentially).",
+        help="Pipeline to execute (use 'all' to run the BCTC and EOD pipelines concurrently).",
     )
     parser.add_argument("--symbol", type=str, help="Ticker symbol to process.")
     parser.add_argument("--date", type=str, help="ISO date (YYYY-MM-DD).")
@@ -50,6 +50,25 @@ def execute_eod(symbol: Optional[str], date: Optional[str], limit: Optional[int]
     run_eod(symbol=symbol, date=date, limit=limit)
 
 
+async def execute_all_async(
+    symbol: Optional[str],
+    date: Optional[str],
+    limit: Optional[int],
+) -> None:
+    print(f"[runner] Running BCTC and EOD pipelines concurrently (symbol={symbol}, date={date}, limit={limit})")
+    # The pipelines are independent, so Yahoo downloads proceed while BCTC
+    # waits on Alpha Vantage. Each borrows its own pooled connections. BCTC
+    # skips its per-ticker EOD import since the EOD pipeline covers it.
+    await asyncio.gather(
+        run_bctc_async(symbol=symbol, limit=limit, import_eod=False),
+        run_eod_async(symbol=symbol, date=date, limit=limit),
+    )
+
+
+def execute_all(symbol: Optional[str], date: Optional[str], limit: Optional[int]) -> None:
+    asyncio.run(execute_all_async(symbol, date, limit))
+
+
 def main(argv: Optional[List[str]] = None) -> int:
     args = parse_args(argv or sys.argv[1:])
 
@@ -61,10 +80,8 @@ def main(argv: Optional[List[str]] = None) -> int:
             total = len(SYMBOL_LIST)
             for idx, symbol in enumerate(SYMBOL_LIST, start=1):
                 print(f"[runner] Running BCTC pipeline for {symbol} {idx}/{total}")
+                # Alpha Vantage requests are paced by the extractor's rate limiter.
                 execute_bctc(symbol, args.limit)
-                # Avoid hitting Alpha Vantage free-tier rate limits
-                if idx < total:
-                    time.sleep(18)
     elif args.job == "eod":
         execute_eod(args.symbol, args.date, args.limit)
     elif args.job == "financial":
@@ -105,7 +122,7 @@ def main(argv: Optional[List[str]] = None) -> int:
             extracted = extract_all_financial_data(symbol, api_key)
 
             # Load company + statements
-            with bctc_loader._get_connection() as conn:
+            with connector.connection() as conn:
                 load_company_and_statements(
                     bctc_loader,
                     conn,
@@ -121,14 +138,8 @@ def main(argv: Optional[List[str]] = None) -> int:
             # EOD prices: delegate to existing EOD pipeline logic to keep behavior identical
             logger.info("[runner] Importing EOD prices via existing EOD pipeline for %s", symbol)
             import_eod_prices_for_symbol(symbol, conn=None)
-
-            # Avoid hitting Alpha Vantage free-tier rate limits (5 req/min)
-            # Each symbol takes ~4 requests (Overview, IS, BS, CF).
-            # Sleeping 18s ensures we stay safe.
-            time.sleep(18)
     elif args.job == "all":
-        execute_bctc(args.symbol, args.limit)
-        execute_eod(args.symbol, args.date, args.limit)
+        execute_all(args.symbol, args.date, args.limit)
     else:
         print(f"[runner] Unknown job '{args.job}'")
         return 1
@@ -1,7 +1,10 @@
-import requests
+from concurrent.futures import ThreadPoolExecutor
+
 import psycopg2
 from psycopg2.extras import execute_values
-import re
+
+from etl.bctc.extract.alphavantage_extractor import fetch_quarterly_reports
+from etl.bctc.transform.financial_transformer import normalize_item_name
 
 # Use user's quarterlyReports-based logic to build dictionary,
 # but connect to Postgres inside Docker.
@@ -22,23 +25,12 @@ DB_CONFIG = {
 }
 
 
-def normalize_item_name(name: str) -> str:
-    """Normalize raw Alpha Vantage keys into human-friendly names."""
-    name = re.sub(r"(?<=[a-z])(?=[A-Z])", " ", name)
-    name = name.replace("_", " ")
-    return name.title()
-
-
 def collect_numeric_keys(symbol: str, api_key: str):
     """
     Reuse user's BCTC logic to scan quarterly reports and collect
     (item_code, item_name) pairs for all numeric fields.
     """
-    mapping = {
-        "IS": "INCOME_STATEMENT",
-        "BS": "BALANCE_SHEET",
-        "CF": "CASH_FLOW",
-    }
+    codes = ["IS", "BS", "CF"]
 
     meta_keys = {
         "fiscalDateEnding",
@@ -50,26 +42,18 @@ def collect_numeric_keys(symbol: str, api_key: str):
 
     dictionary_items = {}
 
-    for statement_code, api_function in mapping.items():
-        url = (
-            f"https://www.alphavantage.co/query"
-            f"?function={api_function}&symbol={symbol}&apikey={api_key}"
-        )
-        resp = requests.get(url)
-        data = resp.json()
-
-        if "quarterlyReports" not in data:
-            continue
-
-        quarterly_reports = sorted(
-            data["quarterlyReports"],
-            key=lambda x: x.get("fiscalDateEnding", ""),
-            reverse=True,
-        )[:20]
+    # The three statements are independent, so their requests overlap on
+    # the extractor's shared keep-alive session instead of running back to
+    # back. Each returns the 20 most recent quarterly reports.
+    with ThreadPoolExecutor(max_workers=len(codes)) as pool:
+        statements = list(pool.map(lambda code: fetch_quarterly_reports(symbol, code, api_key), codes))
 
+    for quarterly_reports in statements:
         for q in quarterly_reports:
             for key, value in q.items():
-                if key in meta_keys:
+                # Every quarter repeats the same keys; only the first
+                # numeric occurrence of each needs to be looked at.
+                if key in meta_keys or key in dictionary_items:
                     continue
                 if value in (None, "", "None"):
                     continue
@@ -99,6 +83,7 @@ def insert_dict():
         ON CONFLICT (item_code) DO NOTHING
         """,
         keys,
+        page_size=max(len(keys), 1),
     )
 
     conn.commit()
@@ -4,12 +4,18 @@ Kafka consumer implementation for market-stream-service.
 
 from __future__ import annotations
 
-import json
+import logging
+import queue
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Dict, List
 
-from kafka import KafkaConsumer
+import orjson
+from kafka import KafkaConsumer, TopicPartition
+from kafka.consumer.fetcher import ConsumerRecord
+from kafka.structs import OffsetAndMetadata
 
 ROOT_PATH = Path(__file__).resolve().parents[2]
 if str(ROOT_PATH) not in sys.path:
@@ -21,6 +27,36 @@ from shared.python.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Polled records waiting for the writer thread. Bounded so a stalled
+# database pauses fetching instead of growing memory.
+QUEUE_MAXSIZE = 10_000
+
+# Progress is logged once per this many written messages, not per message.
+LOG_EVERY_MESSAGES = 10_000
+
+# A batch whose write fails with a transient error (the callback's exception
+# has a true `transient` attribute, e.g. the database is unreachable) is
+# retried with capped exponential backoff; later batches wait behind it, so
+# no higher offset is committed past it. Any other failure is permanent: the
+# batch is rewritten one message at a time and the messages that still fail
+# are logged and skipped.
+RETRY_BACKOFF_SECONDS = 1.0
+MAX_RETRY_BACKOFF_SECONDS = 30.0
+
+_STOP = object()
+
+# Outcomes of _write inside consume_batches.
+_WRITTEN = "written"
+_FAILED = "failed"
+_STOPPED = "stopped"
+
+
+def _commit_offsets(offsets: Dict[TopicPartition, int]) -> Dict[TopicPartition, OffsetAndMetadata]:
+    """Wrap next-offset-to-read values for KafkaConsumer.commit()."""
+    # kafka-python 2.1 added a leader_epoch field to OffsetAndMetadata.
+    extra = (-1,) if len(OffsetAndMetadata._fields) > 2 else ()
+    return {tp: OffsetAndMetadata(offset, "", *extra) for tp, offset in offsets.items()}
+
 
 class KafkaMessageConsumer:
     def __init__(self, topics: list, group_id: str = "market-stream-service"):
@@ -36,11 +72,22 @@ class KafkaMessageConsumer:
                 *self.topics,
                 bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
                 group_id=self.group_id,
-                value_deserializer=lambda m: json.loads(m.decode("utf-8")),
+                value_deserializer=orjson.loads,
                 key_deserializer=lambda k: k.decode("utf-8") if k else None,
                 auto_offset_reset="earliest",
-                enable_auto_commit=settings.KAFKA_ENABLE_AUTO_COMMIT,
+                # Offsets are committed explicitly once their messages are in
+                # Postgres; a timer-driven auto-commit could acknowledge
+                # messages still waiting to be written.
+                enable_auto_commit=False,
                 consumer_timeout_ms=1000,
+                # Fewer, larger fetches: wait briefly for 64 KB to build up
+                # and hand out up to 1000 records per poll.
+                fetch_min_bytes=64 * 1024,
+                fetch_max_wait_ms=100,
+                max_poll_records=1000,
+                max_partition_fetch_bytes=2 * 1024 * 1024,
+                receive_buffer_bytes=2 * 1024 * 1024,
+                max_poll_interval_ms=300_000,
             )
 
         consumer = safe_kafka_call(
@@ -71,15 +118,13 @@ class KafkaMessageConsumer:
         def _consume_loop() -> None:
             for message in self.consumer:
                 try:
-                    logger.info(
-                        "[Kafka] Received message on %s: %s",
-                        message.topic,
-                        json.dumps(message.value, ensure_ascii=False),
-                    )
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("[Kafka] Received message on %s: %s", message.topic, message.value)
                     callback(message.topic, message.key, message.value)
-                    if not settings.KAFKA_ENABLE_AUTO_COMMIT:
-                        # Commit offsets only after successful processing
-                        self.consumer.commit()
+                    # Commit offsets only after successful processing
+                    self.consumer.commit(
+                        _commit_offsets({TopicPartition(message.topic, message.partition): message.offset + 1})
+                    )
                 except Exception as exc:  # noqa: BLE001
                     logger.error("Error processing message: %s", exc)
 
@@ -89,6 +134,175 @@ class KafkaMessageConsumer:
             on_error=lambda exc: logger.error(f"Kafka error: {exc}"),
         )
 
+    def consume_batches(
+        self,
+        callback: Callable[[List[ConsumerRecord]], None],
+        is_running: Callable[[], bool],
+        batch_size: int | None = None,
+        flush_interval: float | None = None,
+    ) -> None:
+        """
+        Poll messages on this thread and write them in batches on another.
+
+        The calling thread only polls, queues records and commits offsets,
+        so it keeps calling poll() while a slow database write runs and the
+        group does not evict it. A writer thread drains the queue and calls
+        callback(records) once batch_size records are pending or the oldest
+        has waited flush_interval seconds. A batch's offsets are committed
+        only after callback returns. A transient failure retries the same
+        batch until it succeeds or the consumer stops, in which case it and
+        everything after it stay uncommitted and are redelivered. A permanent
+        failure is retried one message at a time, skipping the messages that
+        still fail. Runs until is_running() is false.
+        """
+        batch_size = batch_size or settings.DB_INSERT_BATCH_SIZE
+        flush_interval = flush_interval if flush_interval is not None else settings.DB_FLUSH_INTERVAL_SECONDS
+
+        if not self.consumer:
+            self.connect()
+
+        if not self.consumer:
+            logger.error("Kafka consumer not available; cannot consume messages")
+            return
+
+        records: queue.Queue = queue.Queue(maxsize=QUEUE_MAXSIZE)
+        # Offsets of written batches, handed back to this thread because
+        # KafkaConsumer must not be used from two threads.
+        written: queue.SimpleQueue = queue.SimpleQueue()
+        stopping = threading.Event()
+
+        written_count = 0
+
+        def _write(batch: List[ConsumerRecord]) -> str:
+            delay = RETRY_BACKOFF_SECONDS
+            while True:
+                try:
+                    callback(batch)
+                    return _WRITTEN
+                except Exception as exc:  # noqa: BLE001
+                    if not getattr(exc, "transient", False):
+                        logger.error("Error processing batch of %s messages: %s", len(batch), exc)
+                        return _FAILED
+                    logger.error("Error processing batch of %s messages, retrying in %ss: %s", len(batch), delay, exc)
+                if stopping.wait(delay):
+                    return _STOPPED
+                delay = min(delay * 2, MAX_RETRY_BACKOFF_SECONDS)
+
+        def _skip(record: ConsumerRecord) -> None:
+            logger.error(
+                "Skipping message %s[%s]@%s: %r",
+                record.topic, record.partition, record.offset, record.value,
+            )
+
+        def _flush(pending: List[ConsumerRecord]) -> bool:
+            nonlocal written_count
+            logger.debug("[Kafka] Flushing batch of %s messages", len(pending))
+            outcome = _write(pending)
+            if outcome == _FAILED and len(pending) > 1:
+                logger.warning("Writing the failed batch of %s messages one at a time", len(pending))
+                for record in pending:
+                    outcome = _write([record])
+                    if outcome == _STOPPED:
+                        break
+                    if outcome == _FAILED:
+                        _skip(record)
+            elif outcome == _FAILED:
+                _skip(pending[0])
+            if outcome == _STOPPED:
+                logger.warning("Stopping with %s unwritten messages; they will be redelivered", len(pending))
+                return False
+            if (written_count + len(pending)) // LOG_EVERY_MESSAGES > written_count // LOG_EVERY_MESSAGES:
+                logger.info("[Kafka] Written %s messages", written_count + len(pending))
+            written_count += len(pending)
+            offsets: Dict[TopicPartition, int] = {}
+            for record in pending:
+                offsets[TopicPartition(record.topic, record.partition)] = record.offset + 1
+            written.put(offsets)
+            return True
+
+        def _write_loop() -> None:
+            pending: List[ConsumerRecord] = []
+            deadline = 0.0
+            abandoned = False
+            while True:
+                timeout = max(0.0, deadline - time.monotonic()) if pending else 0.5
+                try:
+                    record = records.get(timeout=timeout)
+                except queue.Empty:
+                    record = None
+                if record is _STOP:
+                    if pending and not abandoned:
+                        _flush(pending)
+                    return
+                if abandoned:
+                    # Nothing after an unwritten batch may be acknowledged;
+                    # keep draining so the poll thread can hand over _STOP.
+                    continue
+                if record is not None:
+                    if not pending:
+                        deadline = time.monotonic() + flush_interval
+                    pending.append(record)
+                if pending and (len(pending) >= batch_size or time.monotonic() >= deadline):
+                    abandoned = not _flush(pending)
+                    pending = []
+
+        def _on_commit(offsets, response) -> None:
+            if isinstance(response, Exception):
+                # e.g. partitions revoked by a rebalance; they are re-read
+                # from the last committed offset by their new owner.
+                logger.warning("Failed to commit offsets: %s", response)
+
+        def _commit_written(final: bool = False) -> None:
+            offsets: Dict[TopicPartition, int] = {}
+            while True:
+                try:
+                    offsets.update(written.get_nowait())
+                except queue.Empty:
+                    break
+            if not offsets:
+                return
+            if not final:
+                # The next poll() sends it; this thread does not wait on the broker.
+                self.consumer.commit_async(_commit_offsets(offsets), callback=_on_commit)
+                return
+            try:
+                self.consumer.commit(_commit_offsets(offsets))
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Failed to commit offsets: %s", exc)
+
+        def _consume_loop() -> None:
+            writer = threading.Thread(target=_write_loop, name="kafka-batch-writer", daemon=True)
+            writer.start()
+            paused = False
+            try:
+                while is_running():
+                    _commit_written()
+                    # Only this thread adds to the queue, so records that fit
+                    # now still fit when they are put. When the queue is full,
+                    # pause fetching but keep polling to stay in the group.
+                    free = QUEUE_MAXSIZE - records.qsize()
+                    if free <= 0 and not paused:
+                        self.consumer.pause(*self.consumer.assignment())
+                        paused = True
+                    elif free > 0 and paused:
+                        self.consumer.resume(*self.consumer.paused())
+                        paused = False
+                    polled = self.consumer.poll(timeout_ms=500, max_records=max(free, 1))
+                    for batch in polled.values():
+                        for record in batch:
+                            records.put(record)
+            finally:
+                stopping.set()
+                records.put(_STOP)
+                writer.join()
+                _commit_written(final=True)
+
+        safe_kafka_call(
+            _consume_loop,
+            context="consume_batches",
+            on_error=lambda exc: logger.error(f"Kafka error: {exc}"),
+        )
+
     def close(self) -> None:
         """Close Kafka consumer."""
         if not self.consumer:
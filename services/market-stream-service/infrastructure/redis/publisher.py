@@ -4,10 +4,10 @@ Redis Streams publisher for market-stream-service.
 
 from __future__ import annotations
 
-import json
 import sys
 from pathlib import Path
 
+import orjson
 import redis
 
 from config.settings import settings
@@ -74,7 +74,7 @@ class RedisStreamsPublisher:
 
         payload = {
             b"symbol": symbol.encode("utf-8"),
-            b"data": json.dumps(message).encode("utf-8"),
+            b"data": orjson.dumps(message),
         }
 
         safe_redis_call(
@@ -95,7 +95,7 @@ class RedisStreamsPublisher:
 
         payload = {
             b"symbol": symbol.encode("utf-8"),
-            b"data": json.dumps(message).encode("utf-8"),
+            b"data": orjson.dumps(message),
         }
 
         safe_redis_call(
@@ -27,12 +27,16 @@ validate_env(["KAFKA_BOOTSTRAP_SERVERS", "DB_PASSWORD"])
 
 logger = get_logger(__name__)
 
+# Long enough for an in-flight batch write to finish on shutdown.
+CONSUMER_STOP_TIMEOUT_SECONDS = 30
+
 class MarketStreamService:
     def __init__(self):
         self.consumer = None
         self.processor = None
         self.publisher = None
         self.scheduler = None
+        self.consumer_thread = None
         self.running = False
     
     def start(self):
@@ -52,8 +56,8 @@ class MarketStreamService:
         
         # Start consumer thread
         self.running = True
-        consumer_thread = threading.Thread(target=self._consume_loop, daemon=True)
-        consumer_thread.start()
+        self.consumer_thread = threading.Thread(target=self._consume_loop, daemon=True)
+        self.consumer_thread.start()
         
         # Start ETL scheduler
         self.scheduler = ETLJobScheduler()
@@ -63,22 +67,21 @@ class MarketStreamService:
     
     def _consume_loop(self):
         """Consume messages from Kafka"""
-        def process_and_publish(topic, key, value):
-            # Process message (write to DB)
-            self.processor.process_message(topic, key, value)
+        def process_and_publish(records):
+            # Write the whole batch to DB in one statement per table
+            self.processor.process_batch((record.topic, record.value) for record in records)
             
             # Publish to Redis Streams
-            symbol = value.get('symbol')
-            if topic == STOCK_TRADES_TOPIC:
-                logger.info(f"[Redis] Publishing trade for {symbol}")
-                self.publisher.publish_trade(symbol, value)
-            elif topic == STOCK_BARS_TOPIC:
-                logger.info(f"[Redis] Publishing bar for {symbol}")
-                self.publisher.publish_bar(symbol, value)
+            for record in records:
+                symbol = record.value.get('symbol')
+                if record.topic == STOCK_TRADES_TOPIC:
+                    self.publisher.publish_trade(symbol, record.value)
+                elif record.topic == STOCK_BARS_TOPIC:
+                    self.publisher.publish_bar(symbol, record.value)
         
         while self.running:
             try:
-                self.consumer.consume(process_and_publish)
+                self.consumer.consume_batches(process_and_publish, is_running=lambda: self.running)
             except Exception as e:
                 logger.error(f"Error in consume loop: {e}")
                 import time
@@ -89,8 +92,18 @@ class MarketStreamService:
         logger.info("Stopping Market Stream Service...")
         self.running = False
         
+        # KafkaConsumer is not thread-safe: let the consumer thread leave its
+        # poll loop (flushing the writer and committing final offsets) before
+        # closing the consumer from here.
+        if self.consumer_thread and self.consumer_thread is not threading.current_thread():
+            self.consumer_thread.join(timeout=CONSUMER_STOP_TIMEOUT_SECONDS)
+            if self.consumer_thread.is_alive():
+                logger.warning("Consumer thread did not stop within %ss", CONSUMER_STOP_TIMEOUT_SECONDS)
+            self.consumer_thread = None
+        
         if self.consumer:
             self.consumer.close()
+            self.consumer = None
         
         if self.publisher:
             self.publisher.close()
@@ -7,12 +7,13 @@ Unified PostgreSQL connector for all Python services
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional
 
-import psycopg2
 from psycopg2.extensions import connection as PGConnection
-from psycopg2.pool import SimpleConnectionPool
+from psycopg2.pool import PoolError, ThreadedConnectionPool
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,29 +24,63 @@ class PostgresConnector:
     """
     Unified PostgreSQL connector
     Used by market-api-service and market-stream-service
+
+    Connections come from a thread-safe pool that is created on first use,
+    so every caller must hand them back via return_connection() (or use
+    connection()) instead of closing them. When all max_conn connections
+    are checked out, get_connection() waits up to checkout_timeout seconds
+    for one to come back rather than failing at once.
     """
     config: Dict[str, Any]
-    pool: Optional[SimpleConnectionPool] = None
+    pool: Optional[ThreadedConnectionPool] = None
     min_conn: int = 1
-    max_conn: int = 10
+    max_conn: int = 16
+    checkout_timeout: float = 30.0
+    _pool_lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    # ThreadedConnectionPool.getconn() raises PoolError when exhausted, so
+    # checkouts are gated by one permit per connection.
+    _slots: threading.BoundedSemaphore = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._slots = threading.BoundedSemaphore(self.max_conn)
 
     def get_connection(self) -> PGConnection:
         """Get a database connection"""
-        if self.pool:
+        if self.pool is None:
+            with self._pool_lock:
+                if self.pool is None:
+                    self.create_pool()
+        if not self._slots.acquire(timeout=self.checkout_timeout):
+            raise PoolError(f"No connection available within {self.checkout_timeout}s")
+        try:
             return self.pool.getconn()
-        return psycopg2.connect(**self.config)
+        except BaseException:
+            self._slots.release()
+            raise
 
     def return_connection(self, conn: PGConnection):
         """Return connection to pool"""
         if self.pool:
-            self.pool.putconn(conn)
+            try:
+                self.pool.putconn(conn)
+            finally:
+                self._slots.release()
         else:
             conn.close()
 
+    @contextmanager
+    def connection(self) -> Iterator[PGConnection]:
+        """Borrow a pooled connection for the duration of a with-block"""
+        conn = self.get_connection()
+        try:
+            yield conn
+        finally:
+            self.return_connection(conn)
+
     def create_pool(self):
         """Create connection pool"""
         try:
-            self.pool = SimpleConnectionPool(
+            self.pool = ThreadedConnectionPool(
                 self.min_conn,
                 self.max_conn,
                 **self.config
@@ -59,5 +94,8 @@ class PostgresConnector:
         """Close connection pool"""
         if self.pool:
             self.pool.closeall()
+            self.pool = None
+            # Connections still out are closed on return, not handed back.
+            self._slots = threading.BoundedSemaphore(self.max_conn)
             logger.info("Connection pool closed")
 
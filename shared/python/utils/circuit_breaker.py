@@ -0,0 +1,133 @@
+"""
+Circuit breaker for calls to external upstreams.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+import time
+from typing import Any, Callable, Optional, Tuple, Type, TypeVar
+
+from shared.python.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one upstream.
+
+    After `threshold` consecutive failures the circuit opens and calls fail
+    fast with CircuitOpenError for `reset_after` seconds. The first call
+    after that window is let through as a probe (half-open): success closes
+    the circuit, failure opens it for another window. Used as a decorator,
+    it wraps plain and coroutine functions alike; put it outside any
+    retryable so one exhausted retry sequence counts as one failure.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        threshold: int = 5,
+        reset_after: float = 60,
+        *,
+        exceptions: Tuple[Type[BaseException], ...] = (Exception,),
+    ) -> None:
+        self.name = name
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.exceptions = exceptions
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._probing or time.monotonic() - self._opened_at < self.reset_after:
+                return "open"
+            return "half-open"
+
+    def _before_call(self) -> None:
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if self._probing or time.monotonic() - self._opened_at < self.reset_after:
+                raise CircuitOpenError(f"Circuit '{self.name}' is open; skipping call")
+            self._probing = True
+
+    def _record(self, succeeded: bool) -> None:
+        with self._lock:
+            self._probing = False
+            if succeeded:
+                if self._opened_at is not None:
+                    logger.info("Circuit '%s' closed", self.name)
+                self._failures = 0
+                self._opened_at = None
+                return
+
+            self._failures += 1
+            if self._opened_at is None and self._failures < self.threshold:
+                return
+            if self._opened_at is None:
+                logger.warning(
+                    "Circuit '%s' opened after %s consecutive failures; failing fast for %ss",
+                    self.name,
+                    self._failures,
+                    self.reset_after,
+                )
+            self._opened_at = time.monotonic()
+
+    def _release_probe(self) -> None:
+        # Exceptions outside `exceptions` say nothing about the upstream.
+        with self._lock:
+            self._probing = False
+
+    def call(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        self._before_call()
+        try:
+            result = func(*args, **kwargs)
+        except self.exceptions:
+            self._record(False)
+            raise
+        except BaseException:
+            self._release_probe()
+            raise
+        self._record(True)
+        return result
+
+    def __call__(self, func: Callable[..., T]) -> Callable[..., T]:
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                self._before_call()
+                try:
+                    result = await func(*args, **kwargs)
+                except self.exceptions:
+                    self._record(False)
+                    raise
+                except BaseException:
+                    self._release_probe()
+                    raise
+                self._record(True)
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            return self.call(func, *args, **kwargs)
+
+        return wrapper
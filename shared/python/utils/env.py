@@ -4,8 +4,10 @@ Environment variable helpers.
 
 from __future__ import annotations
 
+import functools
 import os
-from typing import Iterable, Optional
+from pathlib import Path
+from typing import Iterable, Optional, Union
 
 from shared.python.utils.logging_config import get_logger
 
@@ -31,3 +33,20 @@ def validate_env(keys: Iterable[str]) -> None:
         raise ValueError(f"Missing required environment variables: {', '.join(missing)}")
 
 
+def load_dotenv_once(path: Union[str, os.PathLike]) -> bool:
+    """
+    Load a .env file into the environment, reading each file at most once.
+
+    Several ETL modules share one .env and each loads it at import; only the
+    first call stats and parses the file. Returns False if it does not exist.
+    """
+    return _load_dotenv_file(Path(path).resolve())
+
+
+@functools.lru_cache(maxsize=None)
+def _load_dotenv_file(path: Path) -> bool:
+    if not path.exists():
+        return False
+    from dotenv import load_dotenv
+
+    return load_dotenv(path)
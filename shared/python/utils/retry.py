@@ -4,9 +4,11 @@ Retry utilities with exponential backoff.
 
 from __future__ import annotations
 
+import asyncio
 import functools
+import random
 import time
-from typing import Any, Callable, TypeVar
+from typing import Any, Callable, Optional, Tuple, Type, TypeVar, Union
 
 from shared.python.utils.logging_config import get_logger
 
@@ -15,12 +17,87 @@ logger = get_logger(__name__)
 T = TypeVar("T")
 
 
-def retryable(max_retries: int = 3, backoff_seconds: int = 1) -> Callable[[Callable[..., T]], Callable[..., T]]:
+def retryable(
+    max_retries: int = 3,
+    backoff_seconds: float = 1,
+    *,
+    max_backoff_seconds: Optional[float] = None,
+    jitter: Union[bool, str] = False,
+    exceptions: Tuple[Type[BaseException], ...] = (Exception,),
+    giveup: Optional[Callable[[BaseException], bool]] = None,
+) -> Callable[[Callable[..., T]], Callable[..., T]]:
     """
     Decorator providing simple exponential backoff retry behavior.
+
+    Only exceptions listed in `exceptions` are retried; those for which
+    `giveup(exc)` is true (errors a later attempt cannot fix, such as most
+    HTTP 4xx) are raised at once. Delays double after each attempt, are
+    capped at max_backoff_seconds, and are randomized between 0 and the
+    current delay when jitter is set. With
+    jitter="decorrelated" each wait is instead drawn from
+    [backoff_seconds, 3 * previous wait], so callers that were throttled
+    together drift apart rather than retrying in lockstep. Coroutine
+    functions are awaited and back off with asyncio.sleep.
     """
 
+    def next_delay(delay: float) -> Tuple[float, float]:
+        if jitter == "decorrelated":
+            wait = random.uniform(backoff_seconds, delay * 3)
+            if max_backoff_seconds is not None:
+                wait = min(wait, max_backoff_seconds)
+            return wait, wait
+        wait = random.uniform(0, delay) if jitter else delay
+        delay *= 2
+        if max_backoff_seconds is not None:
+            delay = min(delay, max_backoff_seconds)
+        return wait, delay
+
+    def should_retry(func: Callable[..., Any], attempt: int, exc: BaseException, wait: float) -> bool:
+        if giveup is not None and giveup(exc):
+            logger.error(
+                "Retryable operation '%s' failed with a non-retryable error: %s",
+                func.__name__,
+                exc,
+            )
+            return False
+        if attempt >= max_retries:
+            logger.error(
+                "Retryable operation '%s' failed after %s attempts: %s",
+                func.__name__,
+                attempt,
+                exc,
+            )
+            return False
+        logger.warning(
+            "Retryable operation '%s' failed (attempt %s/%s): %s. Retrying in %.1fs",
+            func.__name__,
+            attempt,
+            max_retries,
+            exc,
+            wait,
+        )
+        return True
+
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                attempt = 0
+                delay = backoff_seconds
+
+                while True:
+                    try:
+                        return await func(*args, **kwargs)
+                    except exceptions as exc:
+                        attempt += 1
+                        wait, delay = next_delay(delay)
+                        if not should_retry(func, attempt, exc, wait):
+                            raise
+                        await asyncio.sleep(wait)
+
+            return async_wrapper
+
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> T:
             attempt = 0
@@ -29,29 +106,13 @@ def retryable(max_retries: int = 3, backoff_seconds: int = 1) -> Callable[[Calla
             while True:
                 try:
                     return func(*args, **kwargs)
-                except Exception as exc:  # noqa: BLE001
+                except exceptions as exc:
                     attempt += 1
-                    if attempt >= max_retries:
-                        logger.error(
-                            "Retryable operation '%s' failed after %s attempts: %s",
-                            func.__name__,
-                            attempt,
-                            exc,
-                        )
+                    wait, delay = next_delay(delay)
+                    if not should_retry(func, attempt, exc, wait):
                         raise
-                    logger.warning(
-                        "Retryable operation '%s' failed (attempt %s/%s): %s. Retrying in %ss",
-                        func.__name__,
-                        attempt,
-                        max_retries,
-                        exc,
-                        delay,
-                    )
-                    time.sleep(delay)
-                    delay *= 2
+                    time.sleep(wait)
 
         return wrapper
 
     return decorator
-
-